@@ -0,0 +1,183 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+# IMPORT-TIME AND START-UP BENCHMARK
+# Measures, with "python -X importtime", how long "import main" takes and how long the tool takes
+# to show its first prompt, and checks both against benchmarks/import_budget.json. Start-up also
+# fails the budget if a module that should be deferred (azure.identity, requests, ...) is imported
+# before the first prompt.
+# ///////////////////////////////////////////////////////////////
+
+BENCHMARKS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+REPOSITORY_DIR: str = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BUDGET_FILE: str = os.path.join(BENCHMARKS_DIR, "import_budget.json")
+FIRST_PROMPT: str = "Enter the number of your choice"
+
+# PARSE IMPORTTIME OUTPUT
+# Returns (module, self microseconds, cumulative microseconds) for every imported module
+# ///////////////////////////////////////////////////////////////
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    modules: List[Tuple[str, int, int]] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+# MEASURE IMPORT
+# Runs "import main" in a fresh interpreter and returns its cumulative import time in ms
+# ///////////////////////////////////////////////////////////////
+def measure_import() -> Tuple[float, List[Tuple[str, int, int]]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPOSITORY_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    modules = parse_importtime(completed.stderr)
+    main_us: int = next(cumulative for name, _, cumulative in modules if name == "main")
+    return main_us / 1000, modules
+
+# MEASURE START-UP
+# Runs the tool in a scratch directory holding the repository's config.json and a saved account,
+# and returns the time until the first prompt appears in ms. The tool is stopped at the prompt,
+# so no sign-in or Azure request is ever made.
+# ///////////////////////////////////////////////////////////////
+def measure_startup(timeout: float) -> Tuple[float, List[Tuple[str, int, int]]]:
+    with tempfile.TemporaryDirectory(prefix="azure-tool-startup-") as work_dir:
+        shutil.copy(os.path.join(REPOSITORY_DIR, "config.json"), work_dir)
+        with open(os.path.join(REPOSITORY_DIR, "config.json"), "r") as file:
+            record_path: str = json.load(file).get("auth_options", {}).get("authentication_record_path", ".cache/authentication_record.json")
+        os.makedirs(os.path.dirname(os.path.join(work_dir, record_path)), exist_ok=True)
+        with open(os.path.join(work_dir, record_path), "w") as file:
+            json.dump({"username": "benchmark@example.com", "authority": "login.microsoftonline.com", "homeAccountId": "0", "tenantId": "0", "clientId": "0", "version": "1.0"}, file)
+
+        with tempfile.TemporaryFile(mode="w+") as stderr:
+            started_at: float = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, "-u", "-X", "importtime", os.path.join(REPOSITORY_DIR, "main.py")],
+                cwd=work_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr
+            )
+            output: bytes = b""
+            elapsed: Optional[float] = None
+            try:
+                while time.perf_counter() - started_at < timeout:
+                    chunk: bytes = os.read(process.stdout.fileno(), 4096)
+                    if not chunk:
+                        break
+                    output += chunk
+                    if FIRST_PROMPT.encode() in output:
+                        elapsed = time.perf_counter() - started_at
+                        break
+            finally:
+                process.kill()
+                process.wait()
+
+            stderr.seek(0)
+            modules = parse_importtime(stderr.read())
+
+    if elapsed is None:
+        raise RuntimeError(f"The first prompt did not appear. Output: {output.decode(errors='replace')[-500:]}")
+    return elapsed * 1000, modules
+
+# RUN BENCHMARK
+# Reports the median of several runs
+# ///////////////////////////////////////////////////////////////
+def run(repeats: int, budget: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    import_times: List[float] = []
+    startup_times: List[float] = []
+    import_modules: List[Tuple[str, int, int]] = []
+    startup_modules: List[Tuple[str, int, int]] = []
+
+    for _ in range(repeats):
+        import_ms, import_modules = measure_import()
+        startup_ms, startup_modules = measure_startup(timeout)
+        import_times.append(import_ms)
+        startup_times.append(startup_ms)
+
+    deferred: List[str] = budget.get("deferred_modules", [])
+    loaded: List[str] = sorted({
+        name for name, _, _ in startup_modules
+        for prefix in deferred if name == prefix or name.startswith(prefix + ".")
+    })
+    slowest: List[Dict[str, Any]] = [
+        {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)}
+        for name, self_us, cumulative_us in sorted(import_modules, key=lambda module: module[1], reverse=True)[:15]
+    ]
+
+    result: Dict[str, Any] = {
+        "benchmark": "import_time",
+        "repeats": repeats,
+        "import_ms": round(statistics.median(import_times), 2),
+        "startup_ms": round(statistics.median(startup_times), 2),
+        "startup_modules": len(startup_modules),
+        "deferred_modules_loaded": loaded,
+        "slowest_imports": slowest,
+        "budget": budget
+    }
+
+    violations: List[str] = []
+    if "import_ms" in budget and result["import_ms"] > budget["import_ms"]:
+        violations.append(f"import main took {result['import_ms']:.1f} ms (budget {budget['import_ms']} ms)")
+    if "startup_ms" in budget and result["startup_ms"] > budget["startup_ms"]:
+        violations.append(f"first prompt took {result['startup_ms']:.1f} ms (budget {budget['startup_ms']} ms)")
+    if loaded:
+        violations.append(f"imported before the first prompt: {', '.join(loaded)}")
+    result["violations"] = violations
+    return result
+
+# PRINT RESULTS
+# ///////////////////////////////////////////////////////////////
+def print_results(result: Dict[str, Any]) -> None:
+    print(f"import main:  {result['import_ms']:.1f} ms (median of {result['repeats']})")
+    print(f"first prompt: {result['startup_ms']:.1f} ms, {result['startup_modules']} modules imported")
+    print("\nSlowest imports (self time):")
+    for module in result["slowest_imports"]:
+        print(f" {module['self_ms']:>7.2f} ms  {module['module']}")
+
+    if result["violations"]:
+        print("\nOver budget:")
+        for violation in result["violations"]:
+            print(f" - {violation}")
+    else:
+        print("\nWithin budget.")
+
+# MAIN FUNCTION
+# ///////////////////////////////////////////////////////////////
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure import time and time to the first prompt against a budget.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs to take the median of.")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_FILE, help="Budget JSON file.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the first prompt.")
+    parser.add_argument("--output", help="Optional path for the JSON results.")
+    args = parser.parse_args()
+
+    with open(args.budget, "r") as file:
+        budget: Dict[str, Any] = json.load(file)
+
+    result = run(args.repeats, budget, args.timeout)
+    print_results(result)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=4)
+
+    return 1 if result["violations"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable
+
+# Allow running the benchmark from the repository root or the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils.pagination import project_page
+from modules.utils.resources import ResourceRecord
+from modules.utils.utils import extract_segment
+
+# MEMORY MICRO-BENCHMARK
+# Compares keeping every listed web app as its full ARM payload (with a resourceGroup key added)
+# against projecting each page to ResourceRecords as it is parsed. The pages are built up front
+# as JSON bodies of the size Azure returns for App Service sites, and only the loading is traced.
+# ///////////////////////////////////////////////////////////////
+
+# GENERATE PAYLOAD
+# A web app as the list endpoint returns it, trimmed to the commonly present properties
+# ///////////////////////////////////////////////////////////////
+def generate_payload(index: int, resource_groups: int) -> Dict[str, Any]:
+    name: str = f"app-{index:05d}"
+    resource_group: str = f"RG-Web-{index % resource_groups}"
+    resource_id: str = f"/subscriptions/00000000-0000-0000-0000-000000000001/resourceGroups/{resource_group}/providers/Microsoft.Web/sites/{name}"
+    host_name: str = f"{name}.azurewebsites.net"
+    return {
+        "id": resource_id,
+        "name": name,
+        "type": "Microsoft.Web/sites",
+        "kind": "app,linux",
+        "location": "UK South",
+        "tags": {"environment": "production", "owner": "platform-team", "costCentre": f"cc-{index % 40:03d}", "service": name.split("-")[0]},
+        "properties": {
+            "name": name,
+            "state": "Running",
+            "hostNames": [host_name],
+            "enabledHostNames": [host_name, f"{name}.scm.azurewebsites.net"],
+            "hostNameSslStates": [
+                {"name": host_name, "sslState": "Disabled", "hostType": "Standard"},
+                {"name": f"{name}.scm.azurewebsites.net", "sslState": "Disabled", "hostType": "Repository"}
+            ],
+            "serverFarmId": f"/subscriptions/00000000-0000-0000-0000-000000000001/resourceGroups/{resource_group}/providers/Microsoft.Web/serverfarms/plan-{index % 20}",
+            "reserved": True,
+            "lastModifiedTimeUtc": "2024-05-01T10:15:30.1234567",
+            "siteConfig": {
+                "numberOfWorkers": 1,
+                "linuxFxVersion": "DOTNETCORE|8.0",
+                "alwaysOn": True,
+                "http20Enabled": True,
+                "minTlsVersion": "1.2",
+                "ftpsState": "Disabled",
+                "functionAppScaleLimit": 0,
+                "minimumElasticInstanceCount": 0,
+                "acrUseManagedIdentityCreds": False,
+                "healthCheckPath": "/health"
+            },
+            "clientAffinityEnabled": False,
+            "httpsOnly": True,
+            "outboundIpAddresses": ",".join(f"20.108.{index % 250}.{octet}" for octet in range(1, 7)),
+            "possibleOutboundIpAddresses": ",".join(f"20.108.{index % 250}.{octet}" for octet in range(1, 21)),
+            "defaultHostName": host_name,
+            "resourceGroup": resource_group,
+            "publicNetworkAccess": "Enabled",
+            "keyVaultReferenceIdentity": "SystemAssigned"
+        },
+        "identity": {"type": "SystemAssigned", "principalId": f"{index:08d}-1111-2222-3333-444444444444", "tenantId": "99999999-8888-7777-6666-555555555555"}
+    }
+
+# BUILD PAGES
+# ///////////////////////////////////////////////////////////////
+def build_pages(count: int, page_size: int, resource_groups: int = 50) -> List[bytes]:
+    return [
+        json.dumps({"value": [generate_payload(index, resource_groups) for index in range(start, min(start + page_size, count))]}).encode("utf-8")
+        for start in range(0, count, page_size)
+    ]
+
+# LOAD FULL PAYLOADS
+# What list_web_apps kept before: every payload, tagged with its lowercased resource group
+# ///////////////////////////////////////////////////////////////
+def load_full(pages: List[bytes]) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for page in pages:
+        items.extend(json.loads(page)["value"])
+    for item in items:
+        item["resourceGroup"] = extract_segment(item["id"], 4).lower()
+    return items
+
+# LOAD PROJECTED RECORDS
+# What list_web_apps keeps now: each page projected to ResourceRecords as it is parsed
+# ///////////////////////////////////////////////////////////////
+def load_projected(pages: List[bytes]) -> List[ResourceRecord]:
+    items: List[ResourceRecord] = []
+    for page in pages:
+        items.extend(project_page(json.loads(page)["value"], ResourceRecord.from_item))
+    return items
+
+# MEASURE LOADER
+# Traces the memory still held by the loaded list and the peak while loading, and times the
+# loading separately (tracing slows it down)
+# ///////////////////////////////////////////////////////////////
+def measure(load: Callable[[List[bytes]], List[Any]], pages: List[bytes], repeats: int) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    items = load(pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count: int = len(items)
+    del items
+
+    best: float = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        started_at = time.perf_counter()
+        load(pages)
+        best = min(best, time.perf_counter() - started_at)
+
+    return {
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "bytes_per_resource": round(retained / count, 1) if count else None,
+        "load_ms": round(best * 1000, 3)
+    }
+
+# RUN BENCHMARK
+# ///////////////////////////////////////////////////////////////
+def run(count: int, page_size: int, repeats: int) -> Dict[str, Any]:
+    pages: List[bytes] = build_pages(count, page_size)
+    return {
+        "benchmark": "memory",
+        "resources": count,
+        "page_size": page_size,
+        "payload_bytes": sum(len(page) for page in pages),
+        "full": measure(load_full, pages, repeats),
+        "projected": measure(load_projected, pages, repeats)
+    }
+
+# PRINT RESULTS
+# ///////////////////////////////////////////////////////////////
+def print_results(result: Dict[str, Any]) -> None:
+    print(f"Resources: {result['resources']} in pages of {result['page_size']} | JSON: {result['payload_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"{'':<10} {'retained MiB':>13} {'peak MiB':>9} {'bytes/resource':>15} {'load ms':>9}")
+    for name in ("full", "projected"):
+        row = result[name]
+        print(
+            f"{name:<10} {row['retained_bytes'] / 1024 / 1024:>13.2f} {row['peak_bytes'] / 1024 / 1024:>9.2f} "
+            f"{row['bytes_per_resource']:>15.0f} {row['load_ms']:>9.1f}"
+        )
+
+# MAIN FUNCTION
+# ///////////////////////////////////////////////////////////////
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the memory used by listed resources.")
+    parser.add_argument("--resources", type=int, default=10000, help="Number of synthetic web apps to list.")
+    parser.add_argument("--page-size", type=int, default=100, help="Resources per list page.")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats of the timed load; the best time is reported.")
+    parser.add_argument("--output", help="Optional path for the JSON results.")
+    args = parser.parse_args()
+
+    result = run(args.resources, args.page_size, args.repeats)
+    print_results(result)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=4)
+
+if __name__ == "__main__":
+    main()
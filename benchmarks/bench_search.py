@@ -0,0 +1,108 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, Any, List, Callable
+
+# Allow running the benchmark from the repository root or the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils.search import SearchIndex
+
+# SEARCH MICRO-BENCHMARK
+# Compares the prebuilt SearchIndex with the original linear substring scan
+# ///////////////////////////////////////////////////////////////
+
+WORDS: List[str] = [
+    "api", "app", "web", "func", "portal", "billing", "orders", "payments", "identity", "search",
+    "reports", "gateway", "admin", "worker", "queue", "notify", "catalog", "inventory", "auth", "cms"
+]
+ENVIRONMENTS: List[str] = ["dev", "test", "uat", "staging", "prod"]
+REGIONS: List[str] = ["uks", "ukw", "weu", "neu", "eus", "wus"]
+QUERIES: List[str] = ["a", "ap", "api", "api-p", "api-prod", "pay", "paym", "ordprd", "inv-uat", "zzz"]
+
+# GENERATE ITEMS
+# ///////////////////////////////////////////////////////////////
+def generate_items(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    generator = random.Random(seed)
+    items: List[Dict[str, Any]] = []
+    for index in range(count):
+        name = "-".join([
+            generator.choice(WORDS),
+            generator.choice(WORDS),
+            generator.choice(ENVIRONMENTS),
+            generator.choice(REGIONS),
+            str(index)
+        ])
+        items.append({"name": name, "id": f"/subscriptions/0000/resourceGroups/rg-{index % 50}/providers/Microsoft.Web/sites/{name}"})
+    return items
+
+# TIME FUNCTION
+# Returns the best wall time in milliseconds over the given number of repeats
+# ///////////////////////////////////////////////////////////////
+def time_function(function: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started_at)
+    return best * 1000
+
+# RUN BENCHMARK
+# ///////////////////////////////////////////////////////////////
+def run(count: int, repeats: int) -> Dict[str, Any]:
+    items = generate_items(count)
+
+    started_at = time.perf_counter()
+    index = SearchIndex(items, "name")
+    build_ms = (time.perf_counter() - started_at) * 1000
+
+    results: List[Dict[str, Any]] = []
+    for query in QUERIES:
+        linear_ms = time_function(lambda: [item for item in items if query.lower() in item["name"].lower()], repeats)
+        indexed_ms = time_function(lambda: index.search(query), repeats)
+        previous = index.search(query[:-1]) if len(query) > 1 else None
+        refine_ms = time_function(lambda: index.search(query, previous), repeats) if previous is not None else None
+        results.append({
+            "query": query,
+            "matches": len(index.search(query)),
+            "linear_ms": round(linear_ms, 3),
+            "indexed_ms": round(indexed_ms, 3),
+            "refine_ms": round(refine_ms, 3) if refine_ms is not None else None
+        })
+
+    return {"benchmark": "search", "items": count, "build_ms": round(build_ms, 3), "queries": results}
+
+# PRINT RESULTS
+# ///////////////////////////////////////////////////////////////
+def print_results(result: Dict[str, Any]) -> None:
+    print(f"Items: {result['items']} | index build: {result['build_ms']:.1f} ms")
+    print(f"{'query':<10} {'matches':>8} {'linear ms':>10} {'indexed ms':>11} {'refine ms':>10}")
+    for row in result["queries"]:
+        refine = f"{row['refine_ms']:.2f}" if row["refine_ms"] is not None else "-"
+        print(f"{row['query']:<10} {row['matches']:>8} {row['linear_ms']:>10.2f} {row['indexed_ms']:>11.2f} {refine:>10}")
+
+# MAIN FUNCTION
+# ///////////////////////////////////////////////////////////////
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search_and_select_from_list searching.")
+    parser.add_argument("--items", type=int, default=50000, help="Number of synthetic resources to index.")
+    parser.add_argument("--repeats", type=int, default=5, help="Repeats per query; the best time is reported.")
+    parser.add_argument("--output", help="Optional path for the JSON results.")
+    args = parser.parse_args()
+
+    result = run(args.items, args.repeats)
+    print_results(result)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=4)
+
+if __name__ == "__main__":
+    main()
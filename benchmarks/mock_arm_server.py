@@ -0,0 +1,736 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from urllib.request import Request, urlopen
+
+# DEFAULT MOCK OPTIONS
+# Resource counts are per subscription. Latency, throttling and authorisation failures can be
+# changed while the server is running with MockARMServer.configure.
+# Each entry of "failures" answers the requests to a route whose path (with its query string)
+# contains "match" with "status" (500 by default), for the first "count" of them or all of them
+# when there is no count. For example {"route": "list_web_apps", "match": "$skiptoken=100"}
+# fails the second page of the web app list.
+# ///////////////////////////////////////////////////////////////
+DEFAULT_MOCK_OPTIONS: Dict[str, Any] = {
+    "subscriptions": 1,
+    "web_apps": 5000,
+    "sql_servers": 500,
+    "resource_groups": 50,
+    "settings_per_app": 20,
+    "rules_per_server": 2,
+    "page_size": 100,
+    "latency_ms": 20.0,
+    "jitter_ms": 10.0,
+    "throttle_rate": 0.0,
+    "retry_after": 1,
+    "forbidden_rate": 0.0,
+    "require_activation": False,
+    "batch_item_latency_ms": 1.0,
+    "batch_async": False,
+    "failures": [],
+    "public_ip": "203.0.113.10",
+    "seed": 42
+}
+
+ROLE_DEFINITION_ID: str = "/providers/Microsoft.Authorization/roleDefinitions/b24988ac-6180-42a0-ab88-20f7382dd24c"
+PRINCIPAL_ID: str = "11111111-1111-1111-1111-111111111111"
+
+# MOCK ARM STATE CLASS
+# Holds the generated resources, the firewall rules written by clients, the activated roles and
+# the request counters. Every method is safe to call from the request threads.
+# ///////////////////////////////////////////////////////////////
+class MockARMState:
+
+    # INITIALISE MOCK ARM STATE
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_MOCK_OPTIONS, **(options or {})}
+        # Failures count down as they are used, so keep copies rather than the caller's dictionaries
+        self.options["failures"] = [dict(failure) for failure in self.options["failures"]]
+        self.lock = threading.Lock()
+        self.random = random.Random(self.options["seed"])
+        self.subscription_ids: List[str] = [f"00000000-0000-0000-0000-{index:012d}" for index in range(1, int(self.options["subscriptions"]) + 1)]
+        self.web_apps: Dict[str, List[Dict[str, Any]]] = {}
+        self.sql_servers: Dict[str, List[Dict[str, Any]]] = {}
+        self.firewall_rules: Dict[Tuple[str, str, str], Dict[str, Dict[str, Any]]] = {}
+        self.activated: Dict[str, float] = {}
+        self.counters: Counter = Counter()
+        self.batch_results: Dict[str, Dict[str, Any]] = {}
+        self.in_flight: int = 0
+        self.generation: int = 0
+        self.generate()
+
+    # GENERATE RESOURCES
+    # ///////////////////////////////////////////////////////////////
+    def generate(self) -> None:
+        resource_groups: int = int(self.options["resource_groups"])
+        for subscription_id in self.subscription_ids:
+            self.web_apps[subscription_id] = [
+                self.make_resource(subscription_id, f"rg-web-{index % resource_groups}", "Microsoft.Web/sites", f"app-{index:05d}")
+                for index in range(int(self.options["web_apps"]))
+            ]
+            self.sql_servers[subscription_id] = [
+                self.make_resource(subscription_id, f"rg-sql-{index % resource_groups}", "Microsoft.Sql/servers", f"sql-{index:04d}")
+                for index in range(int(self.options["sql_servers"]))
+            ]
+            for server in self.sql_servers[subscription_id]:
+                rules: Dict[str, Dict[str, Any]] = {}
+                for rule_index in range(int(self.options["rules_per_server"])):
+                    name = f"existing-{rule_index}"
+                    address = f"198.51.100.{rule_index + 1}"
+                    rules[name.lower()] = self.make_firewall_rule(server["id"], name, address, address)
+                self.firewall_rules[self.server_key(subscription_id, server["resourceGroup"], server["name"])] = rules
+
+    # CONFIGURE
+    # Changes options (latency, throttling, authorisation and injected failures) on the running server.
+    # Turning require_activation on also drops the roles activated so far.
+    # ///////////////////////////////////////////////////////////////
+    def configure(self, **options: Any) -> None:
+        with self.lock:
+            if options.get("require_activation"):
+                self.activated.clear()
+            if "failures" in options:
+                options["failures"] = [dict(failure) for failure in options["failures"]]
+            self.options.update(options)
+
+    # RESET
+    # Clears the counters, activated roles and firewall rules, and changes every ETag
+    # ///////////////////////////////////////////////////////////////
+    def reset(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.batch_results.clear()
+            self.activated.clear()
+            self.firewall_rules.clear()
+            self.generation += 1
+            self.generate()
+
+    # COUNT REQUEST
+    # Requests inside a /batch call are counted under "batched" rather than "requests", since
+    # they did not cost a round trip of their own
+    # ///////////////////////////////////////////////////////////////
+    def count(self, route: str, status: int, batched: bool = False) -> None:
+        with self.lock:
+            self.counters["batched" if batched else "requests"] += 1
+            self.counters[f"{'batched:' if batched else ''}{route}:{status}"] += 1
+            if status == 429:
+                self.counters["throttled"] += 1
+            elif status == 403:
+                self.counters["forbidden"] += 1
+
+    # TRACK REQUESTS IN FLIGHT
+    # Records the highest number of requests being answered at the same time as "peak_in_flight"
+    # ///////////////////////////////////////////////////////////////
+    def enter(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.in_flight)
+
+    def leave(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    # GET STATS
+    # ///////////////////////////////////////////////////////////////
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counters)
+
+    # INJECT FAILURE
+    # Decides whether a subscription-scoped request is throttled or refused. Requests are refused
+    # when the role has not been activated (with require_activation) or at random (forbidden_rate).
+    # ///////////////////////////////////////////////////////////////
+    def inject_failure(self, subscription_id: Optional[str]) -> Optional[int]:
+        with self.lock:
+            roll: float = self.random.random()
+            if roll < float(self.options["throttle_rate"]):
+                return 429
+            if subscription_id is None:
+                return None
+            if self.options["require_activation"] and self.activated.get(subscription_id, 0) < time.time():
+                return 403
+            if self.random.random() < float(self.options["forbidden_rate"]):
+                return 403
+        return None
+
+    # TAKE INJECTED FAILURE
+    # Returns the status of the first configured failure matching the request, using one of its
+    # remaining count
+    # ///////////////////////////////////////////////////////////////
+    def take_failure(self, route: str, path: str) -> Optional[int]:
+        with self.lock:
+            for failure in self.options["failures"]:
+                if failure.get("route", route) != route or failure.get("match", "") not in path:
+                    continue
+                if failure.get("count") is not None:
+                    if failure["count"] <= 0:
+                        continue
+                    failure["count"] -= 1
+                return int(failure.get("status", 500))
+        return None
+
+    # GET LATENCY
+    # ///////////////////////////////////////////////////////////////
+    def latency(self) -> float:
+        with self.lock:
+            jitter: float = self.random.uniform(0, float(self.options["jitter_ms"]))
+        return (float(self.options["latency_ms"]) + jitter) / 1000
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # MAKE RESOURCE
+    # ///////////////////////////////////////////////////////////////
+    def make_resource(self, subscription_id: str, resource_group: str, resource_type: str, name: str) -> Dict[str, Any]:
+        return {
+            "id": f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}/providers/{resource_type}/{name}",
+            "name": name,
+            "type": resource_type,
+            "location": "uksouth",
+            "resourceGroup": resource_group,
+            "tags": {"environment": "benchmark"},
+            "properties": {"state": "Running"}
+        }
+
+    # MAKE FIREWALL RULE
+    # ///////////////////////////////////////////////////////////////
+    def make_firewall_rule(self, server_id: str, name: str, start_ip: str, end_ip: str) -> Dict[str, Any]:
+        return {
+            "id": f"{server_id}/firewallRules/{name}",
+            "name": name,
+            "type": "Microsoft.Sql/servers/firewallRules",
+            "properties": {"startIpAddress": start_ip, "endIpAddress": end_ip}
+        }
+
+    # SERVER KEY
+    # ///////////////////////////////////////////////////////////////
+    def server_key(self, subscription_id: str, resource_group: str, server: str) -> Tuple[str, str, str]:
+        return subscription_id.lower(), resource_group.lower(), server.lower()
+
+    # APP SETTINGS
+    # Deterministic settings for a web app, including nested keys and a Key Vault reference
+    # ///////////////////////////////////////////////////////////////
+    def app_settings(self, app_name: str) -> Dict[str, str]:
+        settings: Dict[str, str] = {
+            "WEBSITE_RUN_FROM_PACKAGE": "1",
+            "Logging__LogLevel__Default": "Information",
+            "ApiKey": f"@Microsoft.KeyVault(VaultName=kv-bench;SecretName={app_name}-api-key)"
+        }
+        for index in range(max(0, int(self.options["settings_per_app"]) - len(settings))):
+            settings[f"Feature__Setting{index:02d}"] = f"{app_name}-value-{index}"
+        return settings
+
+# MOCK ARM REQUEST HANDLER CLASS
+# Routes each request by method and path pattern to a handler method on this class
+# ///////////////////////////////////////////////////////////////
+class MockARMRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+    state: MockARMState
+
+    ROUTES: List[Tuple[str, str, "re.Pattern[str]"]] = [
+        ("GET", "list_web_apps", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/providers/Microsoft\.Web/sites$", re.I)),
+        ("GET", "get_web_app", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Web/sites/(?P<app>[^/]+)$", re.I)),
+        ("POST", "list_config", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Web/sites/(?P<app>[^/]+)/config/(?P<section>appsettings|connectionstrings)/list$", re.I)),
+        ("GET", "list_sql_servers", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/providers/Microsoft\.Sql/servers$", re.I)),
+        ("GET", "get_sql_server", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Sql/servers/(?P<server>[^/]+)$", re.I)),
+        ("GET", "list_firewall_rules", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Sql/servers/(?P<server>[^/]+)/firewallRules$", re.I)),
+        ("PUT", "put_firewall_rule", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Sql/servers/(?P<server>[^/]+)/firewallRules/(?P<rule>[^/]+)$", re.I)),
+        ("DELETE", "delete_firewall_rule", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/resourceGroups/(?P<rg>[^/]+)/providers/Microsoft\.Sql/servers/(?P<server>[^/]+)/firewallRules/(?P<rule>[^/]+)$", re.I)),
+        ("GET", "list_role_eligibilities", re.compile(r"^/providers/Microsoft\.Authorization/roleEligibilityScheduleInstances$", re.I)),
+        ("PUT", "request_role_assignment", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/providers/Microsoft\.Authorization/roleAssignmentScheduleRequests/(?P<request>[^/]+)$", re.I)),
+        ("GET", "list_role_assignments", re.compile(r"^/subscriptions/(?P<sub>[^/]+)/providers/Microsoft\.Authorization/roleAssignmentScheduleInstances$", re.I)),
+        ("GET", "get_secret", re.compile(r"^/kv/(?P<vault>[^/]+)/secrets/(?P<secret>[^/]+)(?:/(?P<version>[^/]+))?$", re.I)),
+        ("POST", "batch", re.compile(r"^/batch$")),
+        ("GET", "get_batch_results", re.compile(r"^/batch/results/(?P<batch_id>[^/]+)$")),
+        ("GET", "get_public_ip", re.compile(r"^/ip$")),
+        ("GET", "get_stats", re.compile(r"^/_mock/stats$")),
+        ("POST", "configure", re.compile(r"^/_mock/configure$")),
+        ("POST", "reset", re.compile(r"^/_mock/reset$"))
+    ]
+
+    # Routes that are never throttled or refused
+    UNRESTRICTED_ROUTES: Tuple[str, ...] = ("get_public_ip", "get_batch_results", "get_stats", "configure", "reset", "request_role_assignment", "list_role_assignments", "list_role_eligibilities")
+
+    # HTTP METHODS
+    # ///////////////////////////////////////////////////////////////
+    def do_GET(self) -> None:
+        self.dispatch("GET")
+
+    def do_POST(self) -> None:
+        self.dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self.dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self.dispatch("DELETE")
+
+    # DISPATCH REQUEST
+    # ///////////////////////////////////////////////////////////////
+    def dispatch(self, method: str) -> None:
+        length: int = int(self.headers.get("Content-Length") or 0)
+        self.captured: Optional[List[Tuple[int, Optional[Any], Dict[str, str]]]] = None
+        self.in_flight: bool = False
+        body: Dict[str, Any] = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        if self.path.startswith("/_mock/"):
+            self.route_request(method, self.path, body)
+            return
+        self.state.enter()
+        self.in_flight = True
+        try:
+            self.route_request(method, self.path, body)
+        finally:
+            if self.in_flight:
+                self.state.leave()
+
+    # ROUTE REQUEST
+    # Applies the simulated latency and failures, then calls the matching route handler. Requests
+    # inside a batch share the latency of the batch call.
+    # ///////////////////////////////////////////////////////////////
+    def route_request(self, method: str, path: str, body: Dict[str, Any]) -> None:
+        parsed = urlparse(path)
+        self.request_path: str = parsed.path
+        self.query: Dict[str, List[str]] = parse_qs(parsed.query)
+        self.body: Dict[str, Any] = body
+
+        for route_method, route, pattern in self.ROUTES:
+            match = pattern.match(parsed.path)
+            if route_method == method and match:
+                break
+        else:
+            self.send_json(404, {"error": {"code": "NotFound", "message": f"No mock route for {method} {parsed.path}"}}, "unknown")
+            return
+
+        if self.captured is None and not route.startswith(("get_stats", "configure", "reset")):
+            time.sleep(self.state.latency())
+
+        injected: Optional[int] = self.state.take_failure(route, path)
+        if injected is not None:
+            self.send_json(injected, {"error": {"code": "InjectedFailure", "message": f"Injected failure for {method} {path}"}}, route)
+            return
+
+        if route not in self.UNRESTRICTED_ROUTES:
+            failure: Optional[int] = self.state.inject_failure(match.groupdict().get("sub"))
+            if failure == 429:
+                self.send_json(429, {"error": {"code": "TooManyRequests", "message": "Rate limit exceeded."}}, route, {"Retry-After": str(self.state.options["retry_after"])})
+                return
+            if failure == 403:
+                self.send_json(403, {"error": {"code": "AuthorizationFailed", "message": "The client does not have authorization to perform this action."}}, route)
+                return
+
+        getattr(self, route)(**match.groupdict())
+
+    # LIST WEB APPS
+    # ///////////////////////////////////////////////////////////////
+    def list_web_apps(self, sub: str) -> None:
+        self.send_page(self.state.web_apps.get(sub, []), "list_web_apps")
+
+    # GET WEB APP
+    # ///////////////////////////////////////////////////////////////
+    def get_web_app(self, sub: str, rg: str, app: str) -> None:
+        self.send_resource(self.state.web_apps.get(sub, []), rg, app, "get_web_app")
+
+    # LIST APP SETTINGS OR CONNECTION STRINGS
+    # ///////////////////////////////////////////////////////////////
+    def list_config(self, sub: str, rg: str, app: str, section: str) -> None:
+        if section.lower() == "appsettings":
+            properties: Dict[str, Any] = self.state.app_settings(app)
+        else:
+            properties = {
+                "Database": {"value": f"Server=tcp:sql-bench.database.windows.net;Database={app};", "type": "SQLAzure"},
+                "Cache": {"value": f"{app}.redis.cache.windows.net:6380,ssl=True", "type": "Custom"}
+            }
+        self.send_json(200, {"id": f"/subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Web/sites/{app}/config/{section}", "name": section, "properties": properties}, "list_config")
+
+    # LIST SQL SERVERS
+    # ///////////////////////////////////////////////////////////////
+    def list_sql_servers(self, sub: str) -> None:
+        self.send_page(self.state.sql_servers.get(sub, []), "list_sql_servers")
+
+    # GET SQL SERVER
+    # ///////////////////////////////////////////////////////////////
+    def get_sql_server(self, sub: str, rg: str, server: str) -> None:
+        self.send_resource(self.state.sql_servers.get(sub, []), rg, server, "get_sql_server")
+
+    # LIST FIREWALL RULES
+    # ///////////////////////////////////////////////////////////////
+    def list_firewall_rules(self, sub: str, rg: str, server: str) -> None:
+        with self.state.lock:
+            rules: List[Dict[str, Any]] = list(self.state.firewall_rules.get(self.state.server_key(sub, rg, server), {}).values())
+        self.send_json(200, {"value": rules}, "list_firewall_rules")
+
+    # PUT FIREWALL RULE
+    # ///////////////////////////////////////////////////////////////
+    def put_firewall_rule(self, sub: str, rg: str, server: str, rule: str) -> None:
+        properties: Dict[str, Any] = self.body.get("properties", {})
+        server_id: str = f"/subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Sql/servers/{server}"
+        firewall_rule: Dict[str, Any] = self.state.make_firewall_rule(server_id, rule, properties.get("startIpAddress"), properties.get("endIpAddress"))
+        with self.state.lock:
+            rules = self.state.firewall_rules.setdefault(self.state.server_key(sub, rg, server), {})
+            created: bool = rule.lower() not in rules
+            rules[rule.lower()] = firewall_rule
+        self.send_json(201 if created else 200, firewall_rule, "put_firewall_rule")
+
+    # DELETE FIREWALL RULE
+    # ///////////////////////////////////////////////////////////////
+    def delete_firewall_rule(self, sub: str, rg: str, server: str, rule: str) -> None:
+        with self.state.lock:
+            removed = self.state.firewall_rules.get(self.state.server_key(sub, rg, server), {}).pop(rule.lower(), None)
+        self.send_json(200 if removed else 204, None, "delete_firewall_rule")
+
+    # LIST ROLE ELIGIBILITIES
+    # ///////////////////////////////////////////////////////////////
+    def list_role_eligibilities(self) -> None:
+        eligibilities: List[Dict[str, Any]] = [
+            {
+                "id": f"/subscriptions/{subscription_id}/providers/Microsoft.Authorization/roleEligibilityScheduleInstances/{index}",
+                "properties": {
+                    "roleDefinitionId": ROLE_DEFINITION_ID,
+                    "principalId": PRINCIPAL_ID,
+                    "expandedProperties": {
+                        "scope": {"id": f"/subscriptions/{subscription_id}", "displayName": f"Benchmark {index}", "type": "subscription"},
+                        "principal": {"id": PRINCIPAL_ID, "type": "User"},
+                        "roleDefinition": {"id": ROLE_DEFINITION_ID, "displayName": "Contributor"}
+                    }
+                }
+            }
+            for index, subscription_id in enumerate(self.state.subscription_ids, start=1)
+        ]
+        self.send_json(200, {"value": eligibilities}, "list_role_eligibilities")
+
+    # REQUEST ROLE ASSIGNMENT
+    # The role is active as soon as it is requested and stays active for an hour
+    # ///////////////////////////////////////////////////////////////
+    def request_role_assignment(self, sub: str, request: str) -> None:
+        with self.state.lock:
+            self.state.activated[sub] = time.time() + 3600
+        self.send_json(201, {"id": f"/subscriptions/{sub}/providers/Microsoft.Authorization/roleAssignmentScheduleRequests/{request}", "properties": {**self.body.get("properties", {}), "status": "Provisioned"}}, "request_role_assignment")
+
+    # LIST ROLE ASSIGNMENTS
+    # ///////////////////////////////////////////////////////////////
+    def list_role_assignments(self, sub: str) -> None:
+        with self.state.lock:
+            expires_on: float = self.state.activated.get(sub, 0)
+        instances: List[Dict[str, Any]] = []
+        if expires_on > time.time():
+            instances.append({
+                "properties": {
+                    "roleDefinitionId": ROLE_DEFINITION_ID,
+                    "principalId": PRINCIPAL_ID,
+                    "status": "Provisioned",
+                    "endDateTime": datetime.fromtimestamp(expires_on, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                }
+            })
+        self.send_json(200, {"value": instances}, "list_role_assignments")
+
+    # GET KEY VAULT SECRET
+    # ///////////////////////////////////////////////////////////////
+    def get_secret(self, vault: str, secret: str, version: Optional[str]) -> None:
+        self.send_json(200, {"value": f"{vault}:{secret}", "id": f"https://{vault}.vault.azure.net/secrets/{secret}/{version or 'latest'}"}, "get_secret")
+
+    # BATCH
+    # Runs every request of the batch through the normal routes and returns their responses by name.
+    # With batch_async the responses are kept and a 202 points at the address to read them from.
+    # ///////////////////////////////////////////////////////////////
+    def batch(self) -> None:
+        requests: List[Dict[str, Any]] = self.body.get("requests", [])
+        if len(requests) > 20:
+            self.send_json(400, {"error": {"code": "BatchTooLarge", "message": "A batch can hold at most 20 requests."}}, "batch")
+            return
+
+        time.sleep(len(requests) * float(self.state.options["batch_item_latency_ms"]) / 1000)
+        responses: List[Dict[str, Any]] = []
+        for index, request in enumerate(requests):
+            self.captured = []
+            self.route_request(request.get("httpMethod", "GET").upper(), request.get("url", ""), request.get("content") or {})
+            status, content, headers = self.captured[0]
+            responses.append({"name": request.get("name", str(index)), "httpStatusCode": status, "headers": headers, "content": content})
+        self.captured = None
+
+        if self.state.options["batch_async"]:
+            batch_id: str = os.urandom(8).hex()
+            with self.state.lock:
+                self.state.batch_results[batch_id] = {"responses": responses}
+            host: str = self.headers.get("Host", f"127.0.0.1:{self.server.server_address[1]}")
+            self.send_json(202, None, "batch", {"Location": f"http://{host}/batch/results/{batch_id}", "Retry-After": "0"})
+            return
+        self.send_json(200, {"responses": responses}, "batch")
+
+    # GET BATCH RESULTS
+    # ///////////////////////////////////////////////////////////////
+    def get_batch_results(self, batch_id: str) -> None:
+        with self.state.lock:
+            results: Optional[Dict[str, Any]] = self.state.batch_results.pop(batch_id, None)
+        if results is None:
+            self.send_json(404, {"error": {"code": "NotFound", "message": f"No batch {batch_id}"}}, "get_batch_results")
+            return
+        self.send_json(200, results, "get_batch_results")
+
+    # GET PUBLIC IP
+    # ///////////////////////////////////////////////////////////////
+    def get_public_ip(self) -> None:
+        self.send_json(200, {"ip": self.state.options["public_ip"]}, "get_public_ip")
+
+    # GET STATS
+    # ///////////////////////////////////////////////////////////////
+    def get_stats(self) -> None:
+        self.send_json(200, self.state.stats(), "get_stats")
+
+    # CONFIGURE
+    # ///////////////////////////////////////////////////////////////
+    def configure(self) -> None:
+        self.state.configure(**self.body)
+        self.send_json(204, None, "configure")
+
+    # RESET STATE
+    # ///////////////////////////////////////////////////////////////
+    def reset(self) -> None:
+        self.state.reset()
+        self.send_json(204, None, "reset")
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # SEND PAGE
+    # Returns one page of a list with a nextLink to the following page. The list ETag changes only
+    # when the state is reset, so a conditional request for an unchanged list gets a 304.
+    # ///////////////////////////////////////////////////////////////
+    def send_page(self, items: List[Dict[str, Any]], route: str) -> None:
+        etag: str = f'"{route}-{self.state.generation}"'
+        skip: int = int(self.query.get("$skiptoken", ["0"])[0])
+        if skip == 0 and self.headers.get("If-None-Match") == etag:
+            self.send_json(304, None, route, {"ETag": etag})
+            return
+
+        page_size: int = int(self.state.options["page_size"])
+        body: Dict[str, Any] = {"value": items[skip:skip + page_size]}
+        if skip + page_size < len(items):
+            host: str = self.headers.get("Host", f"127.0.0.1:{self.server.server_address[1]}")
+            api_version: str = self.query.get("api-version", [""])[0]
+            body["nextLink"] = f"http://{host}{self.request_path}?api-version={api_version}&$skiptoken={skip + page_size}"
+        self.send_json(200, body, route, {"ETag": etag})
+
+    # SEND RESOURCE
+    # Answers with the named resource of the resource group, or 404 when there is none
+    # ///////////////////////////////////////////////////////////////
+    def send_resource(self, items: List[Dict[str, Any]], resource_group: str, name: str, route: str) -> None:
+        resource: Optional[Dict[str, Any]] = next(
+            (item for item in items if item["name"].lower() == name.lower() and item["resourceGroup"].lower() == resource_group.lower()),
+            None
+        )
+        if resource is None:
+            self.send_json(404, {"error": {"code": "ResourceNotFound", "message": f"Resource {name} was not found."}}, route)
+            return
+        self.send_json(200, resource, route)
+
+    # SEND JSON
+    # The request is counted, and no longer in flight, before the response is written, so a
+    # client that reads the stats straight after its response always sees it
+    # ///////////////////////////////////////////////////////////////
+    def send_json(self, status: int, body: Optional[Any], route: str, headers: Optional[Dict[str, str]] = None) -> None:
+        if self.captured is not None:
+            self.captured.append((status, body if status not in (204, 304) else None, headers or {}))
+            self.state.count(route, status, batched=True)
+            return
+
+        content: bytes = json.dumps(body).encode("utf-8") if body is not None and status not in (204, 304) else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if route not in ("get_stats", "configure", "reset"):
+            self.state.count(route, status)
+        if self.in_flight:
+            self.state.leave()
+            self.in_flight = False
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+# MOCK HTTP SERVER CLASS
+# A larger listen backlog keeps bursts of concurrent connections from being refused
+# ///////////////////////////////////////////////////////////////
+class MockHTTPServer(ThreadingHTTPServer):
+
+    request_queue_size = 256
+    daemon_threads = True
+
+# MOCK ARM SERVER CLASS
+# Runs the mock on a background thread. Point endpoints.resource_manager at server.url, and
+# public_ip_options.endpoints at server.url + "/ip".
+# ///////////////////////////////////////////////////////////////
+class MockARMServer:
+
+    # INITIALISE MOCK ARM SERVER
+    # Port 0 picks a free port
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, options: Optional[Dict[str, Any]] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.state: MockARMState = MockARMState(options)
+        handler = type("BoundMockARMRequestHandler", (MockARMRequestHandler,), {"state": self.state})
+        self.httpd = MockHTTPServer((host, port), handler)
+        self.thread: Optional[threading.Thread] = None
+
+    # URL
+    # ///////////////////////////////////////////////////////////////
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # START AND STOP
+    # ///////////////////////////////////////////////////////////////
+    def start(self) -> "MockARMServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # CONFIGURE, RESET AND STATS
+    # ///////////////////////////////////////////////////////////////
+    def configure(self, **options: Any) -> None:
+        self.state.configure(**options)
+
+    def reset(self) -> None:
+        self.state.reset()
+
+    def stats(self) -> Dict[str, int]:
+        return self.state.stats()
+
+    # CONTEXT MANAGER SUPPORT
+    # ///////////////////////////////////////////////////////////////
+    def __enter__(self) -> "MockARMServer":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.stop()
+
+# MOCK ARM PROCESS CLASS
+# Runs the mock in a child process so its request threads do not compete with the code being
+# measured for the GIL. Offers the same interface as MockARMServer through the /_mock endpoints.
+# ///////////////////////////////////////////////////////////////
+class MockARMProcess:
+
+    # INITIALISE MOCK ARM PROCESS
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_MOCK_OPTIONS, **(options or {})}
+        self.process: Optional[subprocess.Popen] = None
+        self.url: str = ""
+
+    # START AND STOP
+    # The child prints its address on the first line once it is listening
+    # ///////////////////////////////////////////////////////////////
+    def start(self) -> "MockARMProcess":
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--port", "0", "--options", json.dumps(self.options)],
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        first_line: str = self.process.stdout.readline()
+        match = re.search(r"(http://\S+)", first_line)
+        if not match:
+            self.stop()
+            raise RuntimeError(f"Mock ARM server failed to start: {first_line!r}")
+        self.url = match.group(1)
+        return self
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+    # CONFIGURE, RESET AND STATS
+    # ///////////////////////////////////////////////////////////////
+    def configure(self, **options: Any) -> None:
+        self.control("configure", options)
+
+    def reset(self) -> None:
+        self.control("reset", {})
+
+    def stats(self) -> Dict[str, int]:
+        with urlopen(f"{self.url}/_mock/stats") as response:
+            return json.loads(response.read())
+
+    def control(self, command: str, body: Dict[str, Any]) -> None:
+        request = Request(f"{self.url}/_mock/{command}", data=json.dumps(body).encode("utf-8"), method="POST", headers={"Content-Type": "application/json"})
+        with urlopen(request):
+            pass
+
+    # CONTEXT MANAGER SUPPORT
+    # ///////////////////////////////////////////////////////////////
+    def __enter__(self) -> "MockARMProcess":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.stop()
+
+# MAIN FUNCTION
+# Runs the mock in the foreground so the tool itself can be pointed at it
+# ///////////////////////////////////////////////////////////////
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local mock of the Azure Resource Manager endpoints used by the tool.")
+    parser.add_argument("--port", type=int, default=8400, help="Port to listen on.")
+    parser.add_argument("--subscriptions", type=int, default=DEFAULT_MOCK_OPTIONS["subscriptions"], help="Number of subscriptions.")
+    parser.add_argument("--web-apps", type=int, default=DEFAULT_MOCK_OPTIONS["web_apps"], help="Web apps per subscription.")
+    parser.add_argument("--sql-servers", type=int, default=DEFAULT_MOCK_OPTIONS["sql_servers"], help="SQL servers per subscription.")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_MOCK_OPTIONS["page_size"], help="Items per list page.")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_MOCK_OPTIONS["latency_ms"], help="Base latency added to every request.")
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_MOCK_OPTIONS["jitter_ms"], help="Random extra latency, up to this value.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_MOCK_OPTIONS["retry_after"], help="Retry-After seconds sent with 429s.")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="Fraction of requests answered with 403 AuthorizationFailed.")
+    parser.add_argument("--require-activation", action="store_true", help="Refuse subscription requests until a role is activated.")
+    parser.add_argument("--batch-async", action="store_true", help="Answer /batch with 202 and a Location to read the responses from.")
+    parser.add_argument("--options", help="JSON object of options; overrides the other arguments.")
+    args = parser.parse_args()
+
+    options: Dict[str, Any] = {
+        "subscriptions": args.subscriptions,
+        "web_apps": args.web_apps,
+        "sql_servers": args.sql_servers,
+        "page_size": args.page_size,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "throttle_rate": args.throttle_rate,
+        "retry_after": args.retry_after,
+        "forbidden_rate": args.forbidden_rate,
+        "require_activation": args.require_activation,
+        "batch_async": args.batch_async
+    }
+    if args.options:
+        options.update(json.loads(args.options))
+
+    server = MockARMServer(options, port=args.port)
+    print(f"Mock ARM server listening on {server.url}", flush=True)
+    print(f'Set "endpoints": {{"resource_manager": "{server.url}"}} and "public_ip_options": {{"endpoints": ["{server.url}/ip"]}} in config.json.')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Callable
+
+# Allow running the benchmark from the repository root or the benchmarks directory
+BENCHMARKS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+import bench_search
+from mock_arm_server import MockARMServer, MockARMProcess
+from modules.services.appsettings import AppSettingsManager
+from modules.services.firewall import SQLFirewallRuleManager
+from modules.services.subscription import SubscriptionManager
+from modules.utils import ResourceRecord, make_api_request, get_http_client
+
+# END-TO-END BENCHMARK SUITE
+# Starts the mock ARM server in a child process and drives make_api_request, the managers and the search
+# against it. Every scenario reports its wall time, throughput, latency percentiles and the
+# requests the mock saw, so two runs (or a run and a saved baseline) can be compared.
+# ///////////////////////////////////////////////////////////////
+
+SCENARIOS: List[str] = [
+    "api_sequential",
+    "api_concurrent",
+    "api_throttled",
+    "list_web_apps",
+    "export_all",
+    "export_all_unbatched",
+    "list_sql_servers",
+    "firewall_apply",
+    "firewall_apply_noop",
+    "role_activation",
+    "search"
+]
+
+BENCHMARK_TOKEN: str = "benchmark-token"
+
+# MAKE CONFIGURATIONS
+# The tool configuration used by every scenario: caches off so each run hits the mock, short
+# retry backoff, and a connection pool large enough for the worker count
+# ///////////////////////////////////////////////////////////////
+def make_configurations(server_url: str, workers: int, work_dir: str) -> Dict[str, Any]:
+    return {
+        "app_name": "Benchmark",
+        "endpoints": {"resource_manager": server_url},
+        "display_options": {"display_items_in_columns": False, "number_of_columns": 2, "page_size": None},
+        "role_options": {"role_assignment_duration": "PT30M", "activation_timeout": 10, "activation_poll_interval": 0.05},
+        "http_options": {"pool_maxsize": max(32, workers * 2)},
+        "list_options": {"max_items": None, "prefetch_next_page": True},
+        "bulk_options": {"max_workers": workers},
+        "public_ip_options": {"endpoints": [f"{server_url}/ip"], "cache_path": None},
+        "output_options": {"format": "compact", "skip_unchanged": False},
+        "snapshot_options": {"enabled": True, "database_path": os.path.join(work_dir, "history.sqlite3")},
+        "cache_options": {"enabled": False},
+        "retry_options": {"backoff_base": 0.05, "backoff_cap": 1.0}
+    }
+
+# PERCENTILE
+# ///////////////////////////////////////////////////////////////
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered: List[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+# BENCHMARK SUITE CLASS
+# ///////////////////////////////////////////////////////////////
+class BenchmarkSuite:
+
+    # INITIALISE BENCHMARK SUITE
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, server: Any, args: argparse.Namespace, work_dir: str) -> None:
+        self.server: Any = server
+        self.args: argparse.Namespace = args
+        self.config_manager = SimpleNamespace(configurations=make_configurations(server.url, args.workers, work_dir))
+        self.http_client = get_http_client(self.config_manager.configurations)
+        self.subscription_manager = SubscriptionManager(BENCHMARK_TOKEN, self.config_manager)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.subscription: Dict[str, str] = self.subscription_manager.list_subscriptions()[0]
+        self.headers: Dict[str, str] = {"Authorization": f"Bearer {BENCHMARK_TOKEN}"}
+
+    # MEASURE SCENARIO
+    # Runs a scenario with its output silenced. The scenario returns the number of operations it
+    # completed, optionally with per-operation latencies and extra details.
+    # ///////////////////////////////////////////////////////////////
+    def measure(self, name: str, scenario: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        requests_before: Dict[str, int] = self.server.stats()
+        started_at: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            outcome: Dict[str, Any] = scenario()
+        seconds: float = time.perf_counter() - started_at
+        requests_after: Dict[str, int] = self.server.stats()
+
+        latencies: List[float] = [latency * 1000 for latency in outcome.pop("latencies", [])]
+        operations: int = outcome.pop("operations")
+        result: Dict[str, Any] = {
+            "name": name,
+            "operations": operations,
+            "seconds": round(seconds, 4),
+            "operations_per_second": round(operations / seconds, 2) if seconds else None,
+            "requests": requests_after.get("requests", 0) - requests_before.get("requests", 0),
+            "batched": requests_after.get("batched", 0) - requests_before.get("batched", 0),
+            "throttled": requests_after.get("throttled", 0) - requests_before.get("throttled", 0),
+            "forbidden": requests_after.get("forbidden", 0) - requests_before.get("forbidden", 0)
+        }
+        if latencies:
+            result.update({
+                "p50_ms": round(percentile(latencies, 0.50), 3),
+                "p95_ms": round(percentile(latencies, 0.95), 3),
+                "p99_ms": round(percentile(latencies, 0.99), 3),
+                "max_ms": round(max(latencies), 3)
+            })
+        result.update(outcome)
+        return result
+
+    # SCENARIOS
+    # ///////////////////////////////////////////////////////////////
+
+    # TIMED API REQUEST
+    # One firewall rule listing, the smallest realistic ARM read
+    # ///////////////////////////////////////////////////////////////
+    def timed_request(self, index: int) -> float:
+        server_index: int = index % self.args.sql_servers
+        url: str = (
+            f"{self.server.url}/subscriptions/{self.subscription['subscriptionId']}/"
+            f"resourceGroups/rg-sql-{server_index % 50}/providers/Microsoft.Sql/servers/sql-{server_index:04d}/"
+            f"firewallRules?api-version=2021-11-01"
+        )
+        started_at: float = time.perf_counter()
+        response = make_api_request(url=url, method="GET", headers=self.headers, client=self.http_client)
+        if response is None:
+            raise RuntimeError(f"Request failed: {url}")
+        return time.perf_counter() - started_at
+
+    def api_sequential(self) -> Dict[str, Any]:
+        latencies: List[float] = [self.timed_request(index) for index in range(self.args.requests)]
+        return {"operations": len(latencies), "latencies": latencies}
+
+    def api_concurrent(self) -> Dict[str, Any]:
+        with ThreadPoolExecutor(max_workers=self.args.workers) as executor:
+            latencies: List[float] = list(executor.map(self.timed_request, range(self.args.requests)))
+        return {"operations": len(latencies), "latencies": latencies}
+
+    # THROTTLED API REQUESTS
+    # A fifth of the requests get a 429 with Retry-After: 0, so the retry loop is measured
+    # without sleeping for a full second each time
+    # ///////////////////////////////////////////////////////////////
+    def api_throttled(self) -> Dict[str, Any]:
+        self.server.configure(throttle_rate=0.2, retry_after=0)
+        try:
+            return self.api_concurrent()
+        finally:
+            self.server.configure(throttle_rate=0.0, retry_after=1)
+
+    def list_web_apps(self) -> Dict[str, Any]:
+        manager = AppSettingsManager(self.subscription, BENCHMARK_TOKEN, self.subscription_manager, self.config_manager)
+        return {"operations": len(manager.web_apps or [])}
+
+    def export_all(self) -> Dict[str, Any]:
+        manager = AppSettingsManager(self.subscription, BENCHMARK_TOKEN, self.subscription_manager, self.config_manager)
+        summary: Dict[str, Any] = manager.export_all()
+        timings: List[float] = list(summary["timings"].values())
+        return {"operations": len(summary["succeeded"]), "latencies": timings, "failed": len(summary["failed"])}
+
+    # EXPORT WITHOUT ARM BATCHING
+    # The same export with every config list POST sent on its own, for comparison with export_all
+    # ///////////////////////////////////////////////////////////////
+    def export_all_unbatched(self) -> Dict[str, Any]:
+        self.config_manager.configurations["arm_batch_options"] = {"enabled": False}
+        try:
+            return self.export_all()
+        finally:
+            self.config_manager.configurations.pop("arm_batch_options")
+
+    def list_sql_servers(self) -> Dict[str, Any]:
+        manager = SQLFirewallRuleManager(self.subscription, BENCHMARK_TOKEN, "benchmark", self.subscription_manager, self.config_manager)
+        return {"operations": len(manager.sql_servers or [])}
+
+    # APPLY FIREWALL RULE
+    # The first run writes the rule to every server; the no-op run finds it in place and only reads
+    # ///////////////////////////////////////////////////////////////
+    def firewall_apply(self) -> Dict[str, Any]:
+        manager = SQLFirewallRuleManager(self.subscription, BENCHMARK_TOKEN, "benchmark", self.subscription_manager, self.config_manager)
+        summary: Dict[str, Any] = manager.apply_to_servers(firewall_rule_name="benchmark", ip_address="203.0.113.10")
+        timings: List[float] = list(summary["timings"].values())
+        return {"operations": len(summary["succeeded"]), "latencies": timings, "failed": len(summary["failed"])}
+
+    def firewall_apply_noop(self) -> Dict[str, Any]:
+        return self.firewall_apply()
+
+    # ROLE ACTIVATION
+    # Every request is refused until the role is activated, so the first export requests hit the
+    # 403 path, one activation is made and the rest of the export proceeds
+    # ///////////////////////////////////////////////////////////////
+    def role_activation(self) -> Dict[str, Any]:
+        self.server.configure(require_activation=True)
+        try:
+            subscription_manager = SubscriptionManager(BENCHMARK_TOKEN, self.config_manager)
+            manager = AppSettingsManager(self.subscription, BENCHMARK_TOKEN, subscription_manager, self.config_manager)
+            manager.cached_web_apps = [
+                ResourceRecord.from_item({
+                    "name": f"app-{index:05d}",
+                    "id": f"/subscriptions/{self.subscription['subscriptionId']}/resourceGroups/rg-web-{index % 50}/providers/Microsoft.Web/sites/app-{index:05d}"
+                })
+                for index in range(min(self.args.web_apps, 100))
+            ]
+            summary: Dict[str, Any] = manager.export_all()
+        finally:
+            self.server.configure(require_activation=False)
+        return {"operations": len(summary["succeeded"]), "failed": len(summary["failed"])}
+
+    def search(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = bench_search.run(self.args.search_items, repeats=3)
+        return {
+            "operations": len(result["queries"]),
+            "latencies": [query["indexed_ms"] / 1000 for query in result["queries"]],
+            "items": result["items"],
+            "build_ms": result["build_ms"]
+        }
+
+    # RUN SUITE
+    # ///////////////////////////////////////////////////////////////
+    def run(self, names: List[str]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for name in names:
+            result = self.measure(name, getattr(self, name))
+            print_result(result)
+            results.append(result)
+        return results
+
+# COMPARE WITH BASELINE
+# A scenario regresses when it takes more than (1 + tolerance) times its baseline wall time
+# ///////////////////////////////////////////////////////////////
+def compare_results(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    baseline_results: Dict[str, Dict[str, Any]] = {result["name"]: result for result in baseline.get("results", [])}
+    regressions: List[str] = []
+
+    print(f"\nComparison with baseline ({baseline.get('created_at', 'unknown date')}):")
+    for result in results:
+        previous = baseline_results.get(result["name"])
+        if not previous or not previous.get("seconds"):
+            print(f" - {result['name']}: no baseline")
+            continue
+        ratio: float = result["seconds"] / previous["seconds"]
+        regressed: bool = ratio > 1 + tolerance
+        print(f" - {result['name']}: {previous['seconds']:.3f}s -> {result['seconds']:.3f}s ({ratio:.2f}x){' REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(result["name"])
+
+    return regressions
+
+# PRINT RESULT
+# ///////////////////////////////////////////////////////////////
+def print_result(result: Dict[str, Any]) -> None:
+    latency: str = f" | p50 {result['p50_ms']:.1f} ms | p95 {result['p95_ms']:.1f} ms" if "p50_ms" in result else ""
+    failed: str = f" | failed {result['failed']}" if result.get("failed") else ""
+    batched: str = f" ({result['batched']} batched)" if result.get("batched") else ""
+    print(
+        f"{result['name']:<22} {result['operations']:>6} ops in {result['seconds']:>7.3f}s "
+        f"({result['operations_per_second'] or 0:>8.1f}/s) | {result['requests']:>6} requests{batched}{latency}{failed}"
+    )
+
+# MAIN FUNCTION
+# ///////////////////////////////////////////////////////////////
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the end-to-end benchmarks against a local mock ARM server.")
+    parser.add_argument("--web-apps", type=int, default=5000, help="Web apps in the mock subscription.")
+    parser.add_argument("--sql-servers", type=int, default=500, help="SQL servers in the mock subscription.")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests for the make_api_request scenarios.")
+    parser.add_argument("--workers", type=int, default=16, help="bulk_options.max_workers and the concurrent request pool size.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Base latency of every mock response.")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Random extra latency of every mock response, up to this value.")
+    parser.add_argument("--search-items", type=int, default=50000, help="Items for the search scenario.")
+    parser.add_argument("--in-process", action="store_true", help="Run the mock server in this process (its threads then share the GIL with the client).")
+    parser.add_argument("--scenarios", help=f"Comma-separated scenarios to run (default: all). Available: {', '.join(SCENARIOS)}.")
+    parser.add_argument("--output", help="Path for the JSON results.")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline before a scenario counts as a regression.")
+    args = parser.parse_args()
+
+    names: List[str] = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else SCENARIOS
+    unknown: List[str] = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    mock_options: Dict[str, Any] = {
+        "web_apps": args.web_apps,
+        "sql_servers": args.sql_servers,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms
+    }
+
+    output_path: Optional[str] = os.path.abspath(args.output) if args.output else None
+    baseline_path: Optional[str] = os.path.abspath(args.baseline) if args.baseline else None
+    original_dir: str = os.getcwd()
+
+    server_class = MockARMServer if args.in_process else MockARMProcess
+    with tempfile.TemporaryDirectory(prefix="azure-tool-bench-") as work_dir, server_class(mock_options) as server:
+        # Exports are written under results/ relative to the working directory
+        os.chdir(work_dir)
+        try:
+            print(f"Mock ARM server on {server.url}: {args.web_apps} web apps, {args.sql_servers} SQL servers, {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms latency\n")
+            results: List[Dict[str, Any]] = BenchmarkSuite(server, args, work_dir).run(names)
+        finally:
+            os.chdir(original_dir)
+
+    report: Dict[str, Any] = {
+        "benchmark": "end_to_end",
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "results": results
+    }
+
+    if output_path:
+        with open(output_path, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"\nResults saved to {output_path}")
+
+    if baseline_path:
+        with open(baseline_path, "r") as file:
+            regressions = compare_results(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} scenarios regressed: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
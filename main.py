@@ -1,34 +1,107 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import argparse
+import atexit
+import sys
+
 # IMPORT MODULES
 # ///////////////////////////////////////////////////////////////
 from modules import *
+from modules.utils import get_inventory_cache, get_instrumentation
+
+# PARSE COMMAND LINE ARGUMENTS
+# ///////////////////////////////////////////////////////////////
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Manage Azure app settings and SQL firewall rules.")
+    parser.add_argument("--manifest", help="Run the jobs in a JSON or YAML manifest without prompting.")
+    parser.add_argument("--max-concurrency", type=int, help="Maximum number of requests in flight across every batch task.")
+    parser.add_argument("--report", help="Where to write the batch results report.")
+    return parser.parse_args()
+
+# RUN BATCH
+# Runs a manifest non-interactively and returns the process exit code:
+# 0 when every task succeeded, 1 when any task failed and 2 when the manifest could not be loaded
+# ///////////////////////////////////////////////////////////////
+def run_batch(arguments: argparse.Namespace, config_manager: ConfigManager, session_manager: SessionManager) -> int:
+    batch_runner = BatchRunner(session_manager, config_manager)
+    manifest = batch_runner.load_manifest(arguments.manifest)
+    if manifest is None:
+        return 2
+
+    report = batch_runner.run(manifest, arguments.max_concurrency, arguments.report)
+    return 1 if report["failed"] else 0
 
 # MAIN FUNCTION
 # ///////////////////////////////////////////////////////////////
 def main():
 
-    auth_manager = AuthenticationManager()
-    token, user_name = auth_manager.get_token()
-
+    arguments = parse_arguments()
     config_manager = ConfigManager()
 
+    # Prints the request summary and flushes the trace file however the tool exits
+    instrumentation = get_instrumentation(config_manager.configurations)
+    atexit.register(instrumentation.close)
+
+    auth_manager = AuthenticationManager(config_manager)
+    session_manager = SessionManager(auth_manager, config_manager)
+
+    if arguments.manifest:
+        sys.exit(run_batch(arguments, config_manager, session_manager))
+
+    # The saved account lets the banner and menu appear before azure.identity is loaded; the
+    # token is then acquired when the first action needs it
+    user_name = auth_manager.get_saved_user_name() or session_manager.get_token()[1]
     print(f"\nWelcome {user_name} to {config_manager.configurations['app_name']} {config_manager.configurations['version']}")
 
     while True:
-        subscription_manager = SubscriptionManager(token, config_manager)
-        selected_subscription = subscription_manager.select_subscription()
-
         print("\nWhat would you like to do?")
-        options = ["Create appsettings", "Add/Update IPv4 to firewall"]
+        options = [
+            "Create appsettings",
+            "Add/Update IPv4 to firewall",
+            "Export appsettings for all web apps",
+            "Search resources across subscriptions",
+            "Clear resource cache",
+            "Apply firewall rule to many SQL servers",
+            "Show app settings history"
+        ]
         for i, option in enumerate(options, 1):
             print(f"{i}. {option}")
         action = input("Enter the number of your choice: ").strip()
+        subscription_manager = session_manager.get_subscription_manager()
 
         if action == "1":
-            settings_manager = AppSettingsManager(selected_subscription, token, subscription_manager, config_manager)
+            selected_subscription = subscription_manager.select_subscription()
+            settings_manager = session_manager.get_settings_manager(selected_subscription)
             settings_manager.fetch_and_save()
         elif action == "2":
-            sql_manager = SQLFirewallRuleManager(selected_subscription, token, user_name, subscription_manager, config_manager)
+            selected_subscription = subscription_manager.select_subscription()
+            sql_manager = session_manager.get_sql_manager(selected_subscription)
             sql_manager.create_or_update_firewall_rule()
+        elif action == "3":
+            selected_subscription = subscription_manager.select_subscription()
+            pattern = input("Enter a name pattern (e.g. api-*) or press Enter to export every web app: ").strip()
+            settings_manager = session_manager.get_settings_manager(selected_subscription)
+            settings_manager.export_all(pattern or None)
+        elif action == "4":
+            selected_subscriptions = subscription_manager.select_subscriptions()
+            inventory_manager = InventoryManager(selected_subscriptions, session_manager)
+            inventory_manager.collect()
+            selected_resource = inventory_manager.select_resource()
+            if selected_resource:
+                inventory_manager.perform_action(selected_resource)
+        elif action == "5":
+            removed = get_inventory_cache(config_manager.configurations).invalidate()
+            session_manager.refresh_resources()
+            print(f"Cleared {removed} cached resource lists.")
+        elif action == "6":
+            selected_subscription = subscription_manager.select_subscription()
+            pattern = input("Enter a server name pattern (e.g. sql-*) or press Enter for every server: ").strip()
+            resource_group = input("Enter a resource group (or pattern) or press Enter for every resource group: ").strip()
+            sql_manager = session_manager.get_sql_manager(selected_subscription)
+            sql_manager.apply_to_servers(pattern or None, resource_group or None)
+        elif action == "7":
+            history_manager = HistoryManager(subscription_manager, config_manager)
+            history_manager.show_history()
         else:
             print("Invalid option. Please enter a valid number.")
         
@@ -6,5 +6,10 @@ __all__ = [
     "AuthenticationManager",
     "AppSettingsManager",
     "SQLFirewallRuleManager",
-    "SubscriptionManager"
+    "SubscriptionManager",
+    "InventoryManager",
+    "SessionManager",
+    "BatchRunner",
+    "HistoryManager",
+    "KeyVaultResolver"
 ]
\ No newline at end of file
@@ -1,45 +1,167 @@
 # IMPORT STANDARD LIBRARY MODULES
 # ///////////////////////////////////////////////////////////////
+import json
+import os
+import threading
 import time
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, List, Callable
 
-# IMPORT THIRD-PARTY PACKAGES
+# IMPORT THIRD-PARTY AND AZURE PACKAGES
+# jwt and azure.identity are imported on first use (see get_credential and decode_token); they
+# account for most of the start-up time and are not needed until a token is
 # ///////////////////////////////////////////////////////////////
-import jwt
 
-# IMPORT AZURE PACKAGES
+# DEFAULT AUTHENTICATION OPTIONS
+# Used when config.json does not provide an "auth_options" section
 # ///////////////////////////////////////////////////////////////
-from azure.identity import InteractiveBrowserCredential
+DEFAULT_AUTH_OPTIONS: Dict[str, Any] = {
+    "persistent_cache": True,
+    "cache_name": "azure-management-tool",
+    "allow_unencrypted_storage": False,
+    "authentication_record_path": ".cache/authentication_record.json",
+    "refresh_margin_seconds": 300,
+    "refresh_retry_seconds": 30
+}
+
+MANAGEMENT_SCOPE: str = "https://management.azure.com/.default"
 
 # AUTHENTICATION CLASS
 # ///////////////////////////////////////////////////////////////
 class AuthenticationManager:
 
-    def __init__(self) -> None:
+    def __init__(self, config_manager: Any = None) -> None:
+        configurations: Dict[str, Any] = config_manager.configurations if config_manager else {}
+        self.options: Dict[str, Any] = {**DEFAULT_AUTH_OPTIONS, **configurations.get("auth_options", {})}
         self.token: Optional[str] = None
         self.expires_on: float = 0.0
         self.payload: Optional[Dict[str, Any]] = None
+        self.payload_token: Optional[str] = None
+        self.credential: Optional[Any] = None
+        self.lock = threading.RLock()
+        self.refresh_timer: Optional[threading.Timer] = None
+        self.scoped_tokens: Dict[str, Tuple[str, float]] = {}
+        self.token_listeners: List[Callable[[str], None]] = []
+
+    # ADD TOKEN LISTENER
+    # The listener is called with every new token, including those from the background refresh,
+    # so long-running operations never keep sending an expired one
+    # ///////////////////////////////////////////////////////////////
+    def add_token_listener(self, listener: Callable[[str], None]) -> None:
+        with self.lock:
+            self.token_listeners.append(listener)
 
     # GET TOKEN
+    # Returns the cached token while it is valid, otherwise acquires a new one. With the
+    # persistent cache a new token is normally acquired silently, without opening a browser.
     # ///////////////////////////////////////////////////////////////
     def get_token(self) -> Tuple[str, Optional[str]]:
-        if self.token and time.time() < self.expires_on:
+        with self.lock:
+            if not (self.token and time.time() < self.expires_on):
+                self.refresh_token()
             return self.token, self.get_user_name_from_token()
-        else:
-            credential = InteractiveBrowserCredential()
-            token = credential.get_token("https://management.azure.com/.default")
+
+    # GET SCOPED TOKEN
+    # Returns a token for another resource (e.g. Key Vault) from the same signed-in credential,
+    # cached per scope until shortly before it expires
+    # ///////////////////////////////////////////////////////////////
+    def get_scoped_token(self, scope: str) -> str:
+        with self.lock:
+            token, expires_on = self.scoped_tokens.get(scope, ("", 0.0))
+            if not token or time.time() > expires_on - float(self.options["refresh_margin_seconds"]):
+                access_token = self.get_credential().get_token(scope)
+                token, expires_on = access_token.token, float(access_token.expires_on)
+                self.scoped_tokens[scope] = (token, expires_on)
+            return token
+
+    # REFRESH TOKEN
+    # Acquires a token from the credential, passes it to the listeners and schedules the next
+    # refresh ahead of expiry
+    # ///////////////////////////////////////////////////////////////
+    def refresh_token(self) -> None:
+        with self.lock:
+            credential = self.get_credential()
+            token = credential.get_token(MANAGEMENT_SCOPE)
             self.token = token.token
             self.expires_on = time.time() + (token.expires_on - time.time())
-            return self.token, self.get_user_name_from_token()
+            self.schedule_refresh()
+            for listener in self.token_listeners:
+                listener(self.token)
+
+    # SCHEDULE BACKGROUND REFRESH
+    # Refreshes the token silently a few minutes before it expires so long sessions never stall.
+    # A token already inside the refresh margin (e.g. a cached one close to expiry) and a failed
+    # refresh are retried after a short back-off, so the refresh never stops.
+    # ///////////////////////////////////////////////////////////////
+    def schedule_refresh(self) -> None:
+        if self.refresh_timer:
+            self.refresh_timer.cancel()
+
+        retry_delay: float = float(self.options["refresh_retry_seconds"])
+        delay: float = self.expires_on - time.time() - float(self.options["refresh_margin_seconds"])
+        delay = max(delay, retry_delay)
+
+        def refresh_in_background() -> None:
+            try:
+                self.refresh_token()
+            except Exception as e:
+                print(f"Background token refresh failed, retrying in {retry_delay:g} seconds: {e}")
+                with self.lock:
+                    self.schedule_refresh()
+
+        self.refresh_timer = threading.Timer(delay, refresh_in_background)
+        self.refresh_timer.daemon = True
+        self.refresh_timer.start()
+
+    # GET CREDENTIAL
+    # Creates the browser credential once, backed by the encrypted persistent token cache and
+    # the saved authentication record so later runs can sign in silently
+    # ///////////////////////////////////////////////////////////////
+    def get_credential(self) -> Any:
+        if self.credential:
+            return self.credential
+
+        from azure.identity import InteractiveBrowserCredential, TokenCachePersistenceOptions
+
+        if not self.options["persistent_cache"]:
+            self.credential = InteractiveBrowserCredential()
+            return self.credential
+
+        record_path: str = self.options["authentication_record_path"]
+        record: Optional[Any] = self.load_authentication_record(record_path)
+
+        try:
+            cache_options = TokenCachePersistenceOptions(
+                name=self.options["cache_name"],
+                allow_unencrypted_storage=bool(self.options["allow_unencrypted_storage"])
+            )
+            self.credential = InteractiveBrowserCredential(
+                cache_persistence_options=cache_options,
+                authentication_record=record
+            )
+            if record is None:
+                record = self.credential.authenticate(scopes=[MANAGEMENT_SCOPE])
+                self.save_authentication_record(record, record_path)
+        except Exception as e:
+            print(f"Persistent token cache unavailable, falling back to an in-memory cache: {e}")
+            self.credential = InteractiveBrowserCredential()
+
+        return self.credential
 
     # DECODE TOKEN
+    # Decoded claims are memoised for the current token
     # ///////////////////////////////////////////////////////////////
     def decode_token(self) -> Optional[Dict[str, Any]]:
+        if self.payload is not None and self.payload_token == self.token:
+            return self.payload
+
+        import jwt
         try:
             self.payload = jwt.decode(self.token, options={"verify_signature": False}, algorithms=["RS256"])
+            self.payload_token = self.token
             return self.payload
         except jwt.DecodeError as e:
             print(f"Failed to decode token: {e}")
+            self.payload = None
             return None
 
     # GET USER NAME FROM TOKEN
@@ -50,4 +172,47 @@ class AuthenticationManager:
             return self.payload.get('name') or self.payload.get('upn')
         else:
             print("Could not extract user information from token.")
-            return None
\ No newline at end of file
+            return None
+
+    # GET SAVED USER NAME
+    # Reads the account name from the saved authentication record without loading azure.identity
+    # or acquiring a token, so the welcome banner can be shown straight away. Returns None when
+    # there is no saved account.
+    # ///////////////////////////////////////////////////////////////
+    def get_saved_user_name(self) -> Optional[str]:
+        record_path: str = self.options["authentication_record_path"]
+        if not self.options["persistent_cache"] or not os.path.exists(record_path):
+            return None
+        try:
+            with open(record_path, "r") as file:
+                return json.load(file).get("username")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # LOAD AUTHENTICATION RECORD
+    # ///////////////////////////////////////////////////////////////
+    def load_authentication_record(self, record_path: str) -> Optional[Any]:
+        if not os.path.exists(record_path):
+            return None
+
+        from azure.identity import AuthenticationRecord
+        try:
+            with open(record_path, "r") as file:
+                return AuthenticationRecord.deserialize(file.read())
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable authentication record: {e}")
+            return None
+
+    # SAVE AUTHENTICATION RECORD
+    # The record only identifies the account; it contains no secrets or tokens
+    # ///////////////////////////////////////////////////////////////
+    def save_authentication_record(self, record: Any, record_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(record_path) or ".", exist_ok=True)
+            with open(record_path, "w") as file:
+                file.write(record.serialize())
+        except OSError as e:
+            print(f"Failed to save authentication record: {e}")
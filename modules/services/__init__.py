@@ -1,9 +1,19 @@
 from .appsettings import AppSettingsManager
 from .firewall import SQLFirewallRuleManager
 from .subscription import SubscriptionManager
+from .inventory import InventoryManager
+from .session import SessionManager
+from .batch import BatchRunner
+from .history import HistoryManager
+from .keyvault import KeyVaultResolver
 
 __all__ = [
     "AppSettingsManager",
     "SQLFirewallRuleManager",
-    "SubscriptionManager"
+    "SubscriptionManager",
+    "InventoryManager",
+    "SessionManager",
+    "BatchRunner",
+    "HistoryManager",
+    "KeyVaultResolver"
 ]
\ No newline at end of file
@@ -1,7 +1,9 @@
 # IMPORT STANDARD LIBRARY MODULES
 # ///////////////////////////////////////////////////////////////
+import fnmatch
+import time
 from collections import defaultdict
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # IMPORT UTILITY FUNCTIONS
 # ///////////////////////////////////////////////////////////////
@@ -13,116 +15,428 @@ class AppSettingsManager:
     
     # INITIALISE APP SETTINGS MANAGER
     # ///////////////////////////////////////////////////////////////
-    def __init__(self, subscription: Dict[str, str], token: str, subscription_manager: Any, config_manager: Any) -> None:
+    def __init__(self, subscription: Dict[str, str], token: str, subscription_manager: Any, config_manager: Any, key_vault_resolver: Optional[Any] = None) -> None:
         self.subscription_manager: Any = subscription_manager
         self.config_manager: Any = config_manager
         self.subscription: Dict[str, str] = subscription
-        self.base_url: str = "https://management.azure.com"
+        self.base_url: str = self.config_manager.configurations.get("endpoints", {}).get("resource_manager", "https://management.azure.com")
         self.api_version: str = "2023-12-01"
         self.headers: Dict[str, str] = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
-        self.list_web_apps: Optional[List[Dict[str, Any]]] = self.list_web_apps()
+        self.http_client: HttpClient = get_http_client(self.config_manager.configurations)
+        self.batch_client: ARMBatchClient = ARMBatchClient(self.base_url, self.config_manager.configurations, self.http_client)
+        self.output_writer: OutputWriter = get_output_writer(self.config_manager.configurations)
+        self.snapshot_store: SnapshotStore = get_snapshot_store(self.config_manager.configurations)
+        self.key_vault_resolver: Optional[Any] = key_vault_resolver
+        self.cached_web_apps: Optional[List[ResourceRecord]] = None
+        get_inventory_cache(self.config_manager.configurations).add_refresh_listener(self.forget_web_apps)
+
+    # WEB APPS
+    # Lists the web apps on first use and keeps them for the lifetime of the manager. A listing
+    # that failed (None) is not kept, so the next access tries again.
+    # ///////////////////////////////////////////////////////////////
+    @property
+    def web_apps(self) -> Optional[List[ResourceRecord]]:
+        return run_async(self.get_web_apps_async())
+
+    # GET WEB APPS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def get_web_apps_async(self) -> Optional[List[ResourceRecord]]:
+        if self.cached_web_apps is None:
+            self.cached_web_apps = await self.list_web_apps_async()
+        return self.cached_web_apps
+
+    # REFRESH WEB APPS
+    # Drops the memoised and cached lists so the next access fetches them from Azure
+    # ///////////////////////////////////////////////////////////////
+    def refresh_web_apps(self) -> Optional[List[ResourceRecord]]:
+        get_inventory_cache(self.config_manager.configurations).invalidate(self.subscription['subscriptionId'], "Microsoft.Web/sites")
+        self.cached_web_apps = None
+        return self.web_apps
+
+    # FORGET WEB APPS
+    # Called by the inventory cache when it stores a new list of web apps for this subscription
+    # (e.g. from a background refresh), so the next access uses it
+    # ///////////////////////////////////////////////////////////////
+    def forget_web_apps(self, key: str) -> None:
+        if key == get_inventory_cache().make_key(self.subscription['subscriptionId'], "Microsoft.Web/sites"):
+            self.cached_web_apps = None
+
+    # SET TOKEN
+    # Updates the bearer token used by this manager after the token has been refreshed
+    # ///////////////////////////////////////////////////////////////
+    def set_token(self, token: str) -> None:
+        self.headers["Authorization"] = f"Bearer {token}"
 
     # LIST ALL WEB APPS
     # Lists all web apps for the current subscription
     # API Reference: https://learn.microsoft.com/en-us/rest/api/appservice/web-apps/list?view=rest-appservice-2023-12-01
     # ///////////////////////////////////////////////////////////////
-    def list_web_apps(self) -> Optional[List[Dict[str, Any]]]:
+    def list_web_apps(self) -> Optional[List[ResourceRecord]]:
+        return run_async(self.list_web_apps_async())
+
+    # LIST ALL WEB APPS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def list_web_apps_async(self) -> Optional[List[ResourceRecord]]:
+        inventory_cache: InventoryCache = get_inventory_cache(self.config_manager.configurations)
+        web_apps: Optional[List[ResourceRecord]] = await inventory_cache.get_or_fetch_async(
+            self.subscription['subscriptionId'], "Microsoft.Web/sites", self.fetch_web_apps_async,
+            self.config_manager.configurations.get("list_options", {}).get("max_items")
+        )
+
+        if web_apps is None:
+            print("Failed to list the web apps in the subscription.")
+            return None
+        if not web_apps:
+            print("No web apps found in the subscription.")
+
+        return web_apps
+
+    # FETCH WEB APPS FROM AZURE
+    # Reads every page of the list endpoint, sending the cached ETag when there is one.
+    # With the Resource Graph discovery backend a single projected query is used instead.
+    # Only the name, ID and resource group of each web app are kept; get_web_app fetches the
+    # full payload of one web app when it is needed.
+    # ///////////////////////////////////////////////////////////////
+    def fetch_web_apps(self, etag: Optional[str] = None) -> Tuple[Optional[List[ResourceRecord]], Optional[str], bool]:
+        return run_async(self.fetch_web_apps_async(etag))
+
+    # FETCH WEB APPS FROM AZURE (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    @traced("appsettings.list_web_apps")
+    async def fetch_web_apps_async(self, etag: Optional[str] = None) -> Tuple[Optional[List[ResourceRecord]], Optional[str], bool]:
         url: str = (
             f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
             f"providers/Microsoft.Web/sites?api-version={self.api_version}"
         )
 
-        response: Optional[Dict[str, Any]] =  make_api_request(
+        if self.config_manager.configurations.get("discovery_options", {}).get("backend") == "resource_graph":
+            web_apps = project_resources(await query_resource_graph_async(self.base_url, self.headers, [self.subscription['subscriptionId']], ["Microsoft.Web/sites"], self.http_client))
+            return web_apps, None, False
+
+        list_options: Dict[str, Any] = self.config_manager.configurations.get("list_options", {})
+        web_apps, etag, not_modified = await list_all_items_async(
             url=url,
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client,
+            max_items=list_options.get("max_items"),
+            prefetch=list_options.get("prefetch_next_page", False),
+            etag=etag,
+            project=ResourceRecord.from_item
+        )
+
+        return web_apps, etag, not_modified
+
+    # GET WEB APP
+    # Fetches the full resource payload of a single web app
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/appservice/web-apps/get?view=rest-appservice-2023-12-01
+    # ///////////////////////////////////////////////////////////////
+    def get_web_app(self, web_app: str, resource_group: str) -> Optional[Dict[str, Any]]:
+        return run_async(self.get_web_app_async(web_app, resource_group))
+
+    # GET WEB APP (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def get_web_app_async(self, web_app: str, resource_group: str) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=self.web_app_url(web_app, resource_group),
             method="GET",
             headers=self.headers,
-            retry_callback=self.list_web_apps,
-            create_role_assignment= self.subscription_manager.create_role_assignment,
-            subscription = self.subscription
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client
         )
 
-        if isinstance(response, dict):
-            web_apps: List[Dict[str, Any]] = response.get("value", [])
-        elif isinstance(response, list):
-            web_apps: List[Dict[str, Any]] = response
-        else:
-            print("Unexpected response format. Returning an empty list.")
-            return []
+    # FETCH APP SETTINGS AND SAVE TO FILE
+    # Fetches app settings and connection strings for the selected (or given) web app and records
+    # the changes since its last export in the snapshot history. The history keeps Key Vault
+    # references as they are; only the saved file gets the resolved values.
+    # The web app is picked here, before the fetch is handed to the event loop.
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/appservice/web-apps/list-application-settings?view=rest-appservice-2023-12-01
+    # ///////////////////////////////////////////////////////////////
+    def fetch_and_save(self, web_app: Optional[str] = None, resource_group: Optional[str] = None) -> None:
+        selected_webapp, selected_resourceGroup = (web_app, resource_group) if web_app and resource_group else self.select_web_app(self.web_apps)
+        if not selected_webapp or not selected_resourceGroup:
+            print("No web app selected. Aborting.")
+            return
+
+        run_async(self.fetch_and_save_async(selected_webapp, selected_resourceGroup))
+
+    # FETCH APP SETTINGS AND SAVE TO FILE (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    @traced("appsettings.fetch_and_save")
+    async def fetch_and_save_async(self, web_app: str, resource_group: str) -> None:
+        (appsettings_response, conn_strings_response), = await self.fetch_config_lists_async([{"name": web_app, "resourceGroup": resource_group}])
+        await self.save_settings(web_app, appsettings_response, conn_strings_response)
 
+    # EXPORT APP SETTINGS FOR ALL WEB APPS
+    # Fetches app settings and connection strings for every web app (optionally filtered by a
+    # glob pattern), saving each file as soon as both parts arrive.
+    # With ARM batching both parts of a group of apps are fetched in a single /batch call.
+    # With the "ndjson" output format every app is written as one line of a single file instead.
+    # ///////////////////////////////////////////////////////////////
+    def export_all(self, pattern: Optional[str] = None) -> Dict[str, Any]:
+        return run_async(self.export_all_async(pattern))
+
+    # EXPORT APP SETTINGS FOR ALL WEB APPS (ASYNC)
+    # Every group of apps is a coroutine on the event loop, with at most bulk_options.max_workers
+    # of them waiting on a response at once. A semaphore passed as limit is used instead, so
+    # several bulk operations (such as the jobs of a batch run) can share one bound.
+    # ///////////////////////////////////////////////////////////////
+    @traced("appsettings.export_all")
+    async def export_all_async(self, pattern: Optional[str] = None, limit: Optional[Any] = None) -> Dict[str, Any]:
+        import asyncio
+
+        summary: Dict[str, Any] = {"succeeded": [], "failed": [], "timings": {}}
+        all_web_apps: Optional[List[ResourceRecord]] = await self.get_web_apps_async()
+        if all_web_apps is None:
+            summary["error"] = "Failed to list the web apps."
+            print("Could not list the web apps. Nothing to export.")
+            return summary
+
+        web_apps: List[Dict[str, Any]] = self.match_web_apps(all_web_apps, pattern)
         if not web_apps:
-            print("No web apps found in the subscription.")
-            return []
+            print("No web apps matched. Nothing to export.")
+            return summary
 
-        for app in web_apps:
-            app['resourceGroup'] = extract_segment(app['id'], 4).lower()
+        if limit is None:
+            max_workers: int = self.config_manager.configurations.get("bulk_options", {}).get("max_workers", 16)
+            limit = asyncio.Semaphore(max_workers)
+            print(f"\nExporting app settings for {len(web_apps)} web apps with up to {max_workers} requests in flight...")
+        else:
+            print(f"\nExporting app settings for {len(web_apps)} web apps...")
 
-        return web_apps
+        started_at: float = time.perf_counter()
+        records: Optional[RecordStream] = self.open_export_records()
 
-    # FETCH APP SETTINGS AND SAVE TO FILE
-    # Fetches app settings and connection strings for the selected web app
+        async def fetch(group: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]]:
+            async with limit:
+                # Timed from here, so time spent waiting for the limit is not counted. Timings are
+                # keyed by resource ID, as names can repeat across resource groups.
+                fetch_started: float = time.perf_counter()
+                try:
+                    responses = await self.fetch_config_lists_async(group)
+                except Exception as e:
+                    print(f"Error occurred while fetching settings for {', '.join(app['name'] for app in group)}: {e}")
+                    responses = [(None, None)] * len(group)
+                for app in group:
+                    summary["timings"][app['id']] = time.perf_counter() - fetch_started
+                return group, responses
+
+        tasks = [fetch(group) for group in self.group_web_apps(web_apps)]
+
+        for task in asyncio.as_completed(tasks):
+            group, responses = await task
+            await self.process_exports(group, responses, records, summary)
+
+        return self.finish_export(records, summary, started_at)
+
+    # FETCH CONFIG LISTS
+    # Sends the "appsettings" and "connectionstrings" list POSTs of several web apps through the batch
+    # client, returning an (appsettings, connectionstrings) pair for each app in order
     # API Reference: https://learn.microsoft.com/en-us/rest/api/appservice/web-apps/list-application-settings?view=rest-appservice-2023-12-01
     # ///////////////////////////////////////////////////////////////
-    def fetch_and_save(self) -> None:
-        selected_webapp, selected_resourceGroup = search_and_select_from_list(
-            items = self.list_web_apps,
+    def fetch_config_lists(self, web_apps: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        return run_async(self.fetch_config_lists_async(web_apps))
+
+    # FETCH CONFIG LISTS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def fetch_config_lists_async(self, web_apps: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        responses: List[Optional[Dict[str, Any]]] = await self.batch_client.send_async(
+            self.config_list_requests(web_apps),
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription
+        )
+        return list(zip(responses[0::2], responses[1::2]))
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # WEB APP URL
+    # ///////////////////////////////////////////////////////////////
+    def web_app_url(self, web_app: str, resource_group: str) -> str:
+        return (
+            f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
+            f"resourceGroups/{resource_group}/"
+            f"providers/Microsoft.Web/sites/{web_app}?api-version={self.api_version}"
+        )
+
+    # SELECT WEB APP
+    # Lets the user search and pick a web app; returns its name and resource group
+    # ///////////////////////////////////////////////////////////////
+    def select_web_app(self, web_apps: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[str], Optional[str]]:
+        return search_and_select_from_list(
+            items = web_apps,
             item_key = 'name',
             item_type = 'Web App',
             select_message = "\nPlease select a web app from the list:",
             num_columns = self.config_manager.configurations['display_options']['number_of_columns'],
-            display_columns = self.config_manager.configurations['display_options']['display_items_in_columns']
-        )
+            display_columns = self.config_manager.configurations['display_options']['display_items_in_columns'],
+            page_size = self.config_manager.configurations['display_options'].get('page_size')
+        ) or (None, None)
 
-        if not selected_webapp or not selected_resourceGroup:
-            print("No web app selected. Aborting.")
+    # SAVE SETTINGS
+    # Records the fetched settings of one web app in the history and saves them to its file.
+    # The database and file writes run on a worker thread so the event loop is never blocked.
+    # ///////////////////////////////////////////////////////////////
+    async def save_settings(self, web_app: str, appsettings_response: Optional[Dict[str, Any]], conn_strings_response: Optional[Dict[str, Any]]) -> None:
+        import asyncio
+
+        if appsettings_response is None or conn_strings_response is None:
+            print(f"Failed to fetch settings for {web_app}. Aborting.")
             return
 
-        settings_url: str = (
-            f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
-            f"resourceGroups/{selected_resourceGroup}/"
-            f"providers/Microsoft.Web/sites/{selected_webapp}/config/appsettings/list"
-            f"?api-version={self.api_version}"
-        )
-        conn_strings_url: str = (
+        loop = asyncio.get_running_loop()
+        combined: Dict[str, Any] = self.combine_settings(appsettings_response, conn_strings_response)
+        await loop.run_in_executor(None, self.record_snapshots, [(web_app, combined)])
+        if self.resolves_references():
+            await self.resolve_references([combined])
+        await loop.run_in_executor(None, save_to_json, combined, f"results/{web_app}_appsettings.json", self.output_writer)
+
+    # MATCH WEB APPS
+    # ///////////////////////////////////////////////////////////////
+    def match_web_apps(self, web_apps: Optional[List[Dict[str, Any]]], pattern: Optional[str]) -> List[Dict[str, Any]]:
+        return [
+            app for app in (web_apps or [])
+            if not pattern or fnmatch.fnmatch(app['name'].lower(), pattern.lower())
+        ]
+
+    # GROUP WEB APPS
+    # Splits the apps into the groups fetched together; one app per group without ARM batching
+    # ///////////////////////////////////////////////////////////////
+    def group_web_apps(self, web_apps: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        group_size: int = max(self.batch_client.max_batch_size // 2, 1) if self.batch_client.enabled else 1
+        return [web_apps[start:start + group_size] for start in range(0, len(web_apps), group_size)]
+
+    # OPEN EXPORT RECORDS
+    # With the "ndjson" output format every exported app is added to one file for the subscription
+    # ///////////////////////////////////////////////////////////////
+    def open_export_records(self) -> Optional[RecordStream]:
+        if self.output_writer.format == "ndjson":
+            return self.output_writer.open_records(f"results/{self.subscription['subscriptionId']}_appsettings.ndjson")
+        return None
+
+    # PROCESS EXPORTS
+    # Records and saves each app of a fetched group as soon as the group arrives. With Key Vault
+    # resolution the references of the group's apps are resolved together first; secrets
+    # shared with earlier groups come from the resolver's cache. The database and file writes
+    # run on a worker thread, so requests still in flight are not held up by them.
+    # ///////////////////////////////////////////////////////////////
+    async def process_exports(
+        self,
+        group: List[Dict[str, Any]],
+        responses: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+        records: Optional[RecordStream],
+        summary: Dict[str, Any]
+    ) -> None:
+        import asyncio
+
+        fetched: List[Tuple[str, Dict[str, Any]]] = []
+        for app, (appsettings_response, conn_strings_response) in zip(group, responses):
+            if appsettings_response is None or conn_strings_response is None:
+                summary["failed"].append(app['name'])
+                continue
+            fetched.append((app['name'], self.combine_settings(appsettings_response, conn_strings_response)))
+        if not fetched:
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.record_snapshots, fetched)
+        if self.resolves_references():
+            await self.resolve_references([combined for _, combined in fetched])
+        await loop.run_in_executor(None, self.save_exports, fetched, records, summary)
+
+    # RECORD SNAPSHOTS
+    # ///////////////////////////////////////////////////////////////
+    def record_snapshots(self, fetched: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for app_name, combined in fetched:
+            self.snapshot_store.record(self.subscription['subscriptionId'], app_name, combined)
+
+    # FINISH EXPORT
+    # Closes the NDJSON file and prints the summary
+    # ///////////////////////////////////////////////////////////////
+    def finish_export(self, records: Optional[RecordStream], summary: Dict[str, Any], started_at: float) -> Dict[str, Any]:
+        if records is not None:
+            written = records.close()
+            print(f"{'Saved' if written else 'No changes for'} {records.output_file}")
+
+        summary["elapsed"] = time.perf_counter() - started_at
+        self.print_export_summary(summary)
+        return summary
+
+    # CONFIG LIST REQUESTS
+    # The appsettings and connectionstrings requests of each app, in that order
+    # ///////////////////////////////////////////////////////////////
+    def config_list_requests(self, web_apps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {"method": "POST", "url": self.config_list_url(app['name'], app['resourceGroup'], section), "json_data": {}}
+            for app in web_apps
+            for section in ("appsettings", "connectionstrings")
+        ]
+
+    # CONFIG LIST URL
+    # ///////////////////////////////////////////////////////////////
+    def config_list_url(self, web_app: str, resource_group: str, section: str) -> str:
+        return (
             f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
-            f"resourceGroups/{selected_resourceGroup}/"
-            f"providers/Microsoft.Web/sites/{selected_webapp}/config/connectionstrings/list"
+            f"resourceGroups/{resource_group}/"
+            f"providers/Microsoft.Web/sites/{web_app}/config/{section}/list"
             f"?api-version={self.api_version}"
         )
 
-        appsettings_response: Dict[str, Any] = make_api_request(
-            url=settings_url,
-            method="POST",
-            headers=self.headers,
-            json_data={},
-            retry_callback=self.fetch_and_save,
-            create_role_assignment= self.subscription_manager.create_role_assignment,
-            subscription = self.subscription
-        )
-        
-        appsettings: Dict[str, Any] = self.nest_dict(appsettings_response.get("properties", {}))
+    # SAVE EXPORTS
+    # ///////////////////////////////////////////////////////////////
+    def save_exports(self, fetched: List[Tuple[str, Dict[str, Any]]], records: Optional[RecordStream], summary: Dict[str, Any]) -> None:
+        for app_name, combined in fetched:
+            self.save_export(app_name, combined, records, summary)
 
-        conn_strings_response: Dict[str, Any] = make_api_request(
-            url=conn_strings_url,
-            method="POST",
-            headers=self.headers,
-            json_data={},
-            retry_callback=self.fetch_and_save,
-            create_role_assignment= self.subscription_manager.create_role_assignment,
-            subscription = self.subscription
-        )
+    # SAVE EXPORT
+    # Saves one exported app to its own file, or adds it to the NDJSON stream, and records the outcome
+    # ///////////////////////////////////////////////////////////////
+    def save_export(self, app_name: str, combined: Dict[str, Any], records: Optional[RecordStream], summary: Dict[str, Any]) -> None:
+        if records is not None:
+            records.add(app_name, {"name": app_name, "appsettings": combined})
+        elif save_to_json(combined, f"results/{app_name}_appsettings.json", self.output_writer) is None:
+            summary["failed"].append(app_name)
+            return
+        summary["succeeded"].append(app_name)
 
-        conn_strings: Dict[str, str] = {key: value['value'] for key, value in conn_strings_response.get("properties", {}).items()}
+    # RESOLVES REFERENCES
+    # ///////////////////////////////////////////////////////////////
+    def resolves_references(self) -> bool:
+        return self.key_vault_resolver is not None and self.key_vault_resolver.enabled
 
-        combined: Dict[str, Any] = appsettings
-        combined['ConnectionStrings'] = conn_strings
+    # RESOLVE KEY VAULT REFERENCES
+    # ///////////////////////////////////////////////////////////////
+    async def resolve_references(self, documents: List[Dict[str, Any]]) -> None:
+        resolved, failed = await self.key_vault_resolver.resolve_async(documents)
+        if resolved or failed:
+            print(f"Key Vault references resolved: {resolved} | unresolved: {failed}")
 
-        save_to_json(combined, f"results/{selected_webapp}_appsettings.json")
+    # COMBINE SETTINGS
+    # Nests the app settings and adds the connection strings under "ConnectionStrings"
+    # ///////////////////////////////////////////////////////////////
+    def combine_settings(self, appsettings_response: Dict[str, Any], conn_strings_response: Dict[str, Any]) -> Dict[str, Any]:
+        combined: Dict[str, Any] = self.nest_dict(appsettings_response.get("properties", {}))
+        combined['ConnectionStrings'] = {key: value['value'] for key, value in conn_strings_response.get("properties", {}).items()}
+        return combined
 
-    # UTILITY FUNCTIONS
+    # PRINT EXPORT SUMMARY
+    # Prints the number of successes and failures along with timing statistics
     # ///////////////////////////////////////////////////////////////
+    def print_export_summary(self, summary: Dict[str, Any]) -> None:
+        timings: List[float] = sorted(summary["timings"].values())
+        print(f"\nExport finished in {summary['elapsed']:.2f}s")
+        print(f"Succeeded: {len(summary['succeeded'])}")
+        print(f"Failed: {len(summary['failed'])}")
+        if timings:
+            print(f"Per app: min {timings[0]:.2f}s | avg {sum(timings) / len(timings):.2f}s | max {timings[-1]:.2f}s")
+        for app_name in summary["failed"]:
+            print(f" - {app_name}")
 
     # NEST DICTIONARY DATA
     # Converts a flat dictionary to a nested dictionary
@@ -0,0 +1,284 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+# IMPORT UTILITY FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+from modules.utils import *
+
+# BATCH SETTINGS
+# ///////////////////////////////////////////////////////////////
+JOB_TYPES: List[str] = ["export_appsettings", "firewall_rule", "firewall_reconcile"]
+DEFAULT_REPORT_FILE: str = "results/batch_report.json"
+
+# BATCH RUNNER CLASS
+# Runs the jobs of a manifest without prompting. Every job shares the session, so the token,
+# the HTTP client, the managers and their resource lists are created once for the whole run.
+# ///////////////////////////////////////////////////////////////
+class BatchRunner:
+
+    # INITIALISE BATCH RUNNER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, session_manager: Any, config_manager: Any) -> None:
+        self.session_manager: Any = session_manager
+        self.config_manager: Any = config_manager
+        self.batch_options: Dict[str, Any] = self.config_manager.configurations.get("batch_options", {})
+        self.public_ip: Optional[str] = None
+
+    # LOAD MANIFEST
+    # Reads a JSON or YAML manifest. Returns None if the file cannot be read or parsed.
+    # YAML manifests need PyYAML, which is only imported when one is loaded.
+    # ///////////////////////////////////////////////////////////////
+    def load_manifest(self, manifest_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(manifest_path, "r") as file:
+                if manifest_path.lower().endswith((".yaml", ".yml")):
+                    try:
+                        import yaml
+                    except ImportError:
+                        print("YAML manifests need PyYAML. Install the requirements with 'pip install -r requirements.txt' or use a JSON manifest.")
+                        return None
+                    manifest = yaml.safe_load(file)
+                else:
+                    manifest = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load manifest {manifest_path}: {e}")
+            return None
+        except Exception as e:
+            print(f"Failed to parse manifest {manifest_path}: {e}")
+            return None
+
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+            print(f"Manifest {manifest_path} must contain a list of 'jobs'.")
+            return None
+        return manifest
+
+    # RUN MANIFEST
+    # Expands every job into tasks, lists the resources they need once, runs every task on the
+    # event loop and writes the report. Returns the report.
+    # max_concurrency is one bound shared by every task: it is the number of web app groups and
+    # SQL servers waiting on Azure at the same time across all jobs.
+    # ///////////////////////////////////////////////////////////////
+    @traced("batch.run")
+    def run(self, manifest: Dict[str, Any], max_concurrency: Optional[int] = None, report_file: Optional[str] = None) -> Dict[str, Any]:
+        max_concurrency = int(
+            max_concurrency
+            or manifest.get("max_concurrency")
+            or self.batch_options.get("max_concurrency")
+            or self.config_manager.configurations.get("bulk_options", {}).get("max_workers", 16)
+        )
+        report_file = report_file or manifest.get("report_file") or self.batch_options.get("report_file", DEFAULT_REPORT_FILE)
+
+        started_at: float = time.perf_counter()
+        report: Dict[str, Any] = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "max_concurrency": max_concurrency,
+            "results": []
+        }
+
+        tasks: List[Dict[str, Any]] = []
+        for index, job in enumerate(manifest["jobs"], start=1):
+            job_name: str = str(job.get("name") or f"job-{index}")
+            try:
+                tasks.extend(self.plan_job(job_name, job))
+            except ValueError as e:
+                print(f"Skipping {job_name}: {e}")
+                report["results"].append(self.result(job_name, job.get("type"), None, None, "failed", error=str(e)))
+
+        print(f"\nRunning {len(tasks)} tasks from {len(manifest['jobs'])} jobs with up to {max_concurrency} requests in flight...")
+
+        loaders: List[Callable] = self.prepare(tasks)
+        report["results"].extend(run_async(self.run_tasks_async(tasks, loaders, max_concurrency)))
+
+        report["finished_at"] = datetime.now(timezone.utc).isoformat()
+        report["elapsed"] = round(time.perf_counter() - started_at, 3)
+        report["succeeded"] = sum(1 for result in report["results"] if result["status"] == "succeeded")
+        report["failed"] = sum(1 for result in report["results"] if result["status"] == "failed")
+
+        # The report is always plain, indented JSON whatever output format the exports use
+        save_to_json(report, report_file, OutputWriter({"format": "pretty", "skip_unchanged": False}))
+        self.print_summary(report)
+        return report
+
+    # PLAN JOB
+    # Validates a job and returns one task per subscription it targets
+    # ///////////////////////////////////////////////////////////////
+    def plan_job(self, job_name: str, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        job_type: Optional[str] = job.get("type")
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"unknown job type '{job_type}'. Expected one of: {', '.join(JOB_TYPES)}")
+
+        if job_type == "firewall_reconcile" and not job.get("ip_ranges"):
+            raise ValueError("firewall_reconcile jobs need a list of 'ip_ranges'")
+
+        target: Optional[str] = job.get("web_app") if job_type == "export_appsettings" else job.get("server")
+        pattern: str = target or job.get("pattern") or "*"
+
+        return [
+            {"job": job_name, "type": job_type, "subscription": subscription, "pattern": pattern, "options": job}
+            for subscription in self.resolve_subscriptions(job)
+        ]
+
+    # PREPARE TASKS
+    # Sets up the manager of every task (signing in if needed) and fetches the public IP once if
+    # any firewall task needs it. Returns one loader per subscription and resource type, which
+    # lists its web apps or SQL servers.
+    # ///////////////////////////////////////////////////////////////
+    def prepare(self, tasks: List[Dict[str, Any]]) -> List[Callable]:
+        loaders: Dict[Tuple[str, str], Callable] = {}
+        for task in tasks:
+            subscription_id: str = task["subscription"]["subscriptionId"]
+            if task["type"] == "export_appsettings":
+                manager = task["manager"] = self.session_manager.get_settings_manager(task["subscription"])
+                loaders.setdefault((subscription_id, "web_apps"), manager.get_web_apps_async)
+            else:
+                manager = task["manager"] = self.session_manager.get_sql_manager(task["subscription"])
+                loaders.setdefault((subscription_id, "sql_servers"), manager.get_sql_servers_async)
+                if task["type"] == "firewall_rule" and not task["options"].get("ip_address") and not self.public_ip:
+                    self.public_ip = manager.get_public_ipv4()
+        return list(loaders.values())
+
+    # RUN TASKS (ASYNC)
+    # Lists the resources of every subscription once, concurrently, then runs every task at once.
+    # The tasks share one semaphore, so at most max_concurrency requests are in flight in total.
+    # ///////////////////////////////////////////////////////////////
+    async def run_tasks_async(self, tasks: List[Dict[str, Any]], loaders: List[Callable], max_concurrency: int) -> List[Dict[str, Any]]:
+        import asyncio
+
+        limit = asyncio.Semaphore(max_concurrency)
+
+        async def load(loader: Callable) -> None:
+            async with limit:
+                await loader()
+
+        await asyncio.gather(*(load(loader) for loader in loaders), return_exceptions=True)
+        return list(await asyncio.gather(*(self.run_task_async(task, limit) for task in tasks)))
+
+    # RUN TASK (ASYNC)
+    # Runs one task and turns its outcome (or exception) into a report entry
+    # ///////////////////////////////////////////////////////////////
+    @traced("batch.run_task")
+    async def run_task_async(self, task: Dict[str, Any], limit: Any) -> Dict[str, Any]:
+        started_at: float = time.perf_counter()
+        try:
+            if task["type"] == "export_appsettings":
+                status, details, error = await self.run_export(task, limit)
+            else:
+                status, details, error = await self.run_firewall_rule(task, limit)
+        except Exception as e:
+            status, details, error = "failed", {}, str(e)
+
+        return self.result(
+            task["job"], task["type"], task["subscription"], task["pattern"], status,
+            error=error, details=details, elapsed=time.perf_counter() - started_at
+        )
+
+    # RUN APP SETTINGS EXPORT
+    # ///////////////////////////////////////////////////////////////
+    async def run_export(self, task: Dict[str, Any], limit: Any) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        summary: Dict[str, Any] = await task["manager"].export_all_async(task["pattern"], limit)
+        details: Dict[str, Any] = {"succeeded": summary["succeeded"], "failed": summary["failed"]}
+
+        if summary.get("error"):
+            return "failed", details, summary["error"]
+        if not summary["succeeded"] and not summary["failed"]:
+            return "failed", details, "No web apps matched."
+        if summary["failed"]:
+            return "failed", details, f"{len(summary['failed'])} web apps failed to export."
+        return "succeeded", details, None
+
+    # RUN FIREWALL RULE UPSERT OR RECONCILE
+    # ///////////////////////////////////////////////////////////////
+    async def run_firewall_rule(self, task: Dict[str, Any], limit: Any) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        manager = task["manager"]
+        ip_ranges: Optional[List[str]] = task["options"].get("ip_ranges") if task["type"] == "firewall_reconcile" else None
+        ip_address: Optional[str] = task["options"].get("ip_address") or self.public_ip
+        if not ip_address and not ip_ranges:
+            return "failed", {}, "Could not fetch public IPv4 address."
+
+        summary: Dict[str, Any] = await manager.apply_to_servers_async(
+            pattern=task["pattern"],
+            resource_group=task["options"].get("resource_group"),
+            firewall_rule_name=task["options"].get("rule_name") or manager.firewall_name,
+            ip_address=ip_address,
+            ip_ranges=ip_ranges,
+            limit=limit
+        )
+        details: Dict[str, Any] = {
+            "succeeded": summary["succeeded"],
+            "failed": summary["failed"],
+            "timings": {name: round(elapsed, 3) for name, elapsed in summary["timings"].items()}
+        }
+
+        if not summary["succeeded"] and not summary["failed"]:
+            return "failed", details, "No SQL servers matched."
+        if summary["failed"]:
+            return "failed", details, f"{len(summary['failed'])} SQL servers failed to update."
+        return "succeeded", details, None
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # RESOLVE SUBSCRIPTIONS
+    # Matches the job's "subscription" or "subscriptions" (IDs or display names, "*" for all)
+    # against the subscriptions the user is eligible for
+    # ///////////////////////////////////////////////////////////////
+    def resolve_subscriptions(self, job: Dict[str, Any]) -> List[Dict[str, str]]:
+        wanted: Any = job.get("subscriptions", job.get("subscription"))
+        if not wanted:
+            raise ValueError("no 'subscription' or 'subscriptions' given")
+        if isinstance(wanted, str):
+            wanted = [wanted]
+
+        available: List[Dict[str, str]] = self.session_manager.get_subscription_manager().list_subscriptions()
+        if "*" in wanted:
+            return available
+
+        selected: List[Dict[str, str]] = []
+        for name in wanted:
+            match = next((
+                subscription for subscription in available
+                if name.lower() in (subscription['subscriptionId'].lower(), subscription['displayName'].lower())
+            ), None)
+            if match is None:
+                raise ValueError(f"no eligible subscription matches '{name}'")
+            selected.append(match)
+        return selected
+
+    # BUILD RESULT ENTRY
+    # ///////////////////////////////////////////////////////////////
+    def result(
+        self,
+        job_name: str,
+        job_type: Optional[str],
+        subscription: Optional[Dict[str, str]],
+        target: Optional[str],
+        status: str,
+        error: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        elapsed: float = 0.0
+    ) -> Dict[str, Any]:
+        return {
+            "job": job_name,
+            "type": job_type,
+            "subscriptionId": subscription['subscriptionId'] if subscription else None,
+            "subscriptionName": subscription['displayName'] if subscription else None,
+            "target": target,
+            "status": status,
+            "error": error,
+            "details": details or {},
+            "elapsed": round(elapsed, 3)
+        }
+
+    # PRINT SUMMARY
+    # ///////////////////////////////////////////////////////////////
+    def print_summary(self, report: Dict[str, Any]) -> None:
+        print(f"\nBatch finished in {report['elapsed']:.2f}s")
+        print(f"Succeeded: {report['succeeded']}")
+        print(f"Failed: {report['failed']}")
+        for result in report["results"]:
+            if result["status"] == "failed":
+                print(f" - {result['job']} ({result['subscriptionName'] or 'no subscription'}): {result['error']}")
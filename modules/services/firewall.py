@@ -1,11 +1,21 @@
 # IMPORT STANDARD LIBRARY MODULES
 # ///////////////////////////////////////////////////////////////
+import fnmatch
+import itertools
+import re
+import time
 from typing import Optional, Tuple, List, Dict, Any
 
 # IMPORT UTILITY FUNCTIONS
 # ///////////////////////////////////////////////////////////////
 from modules.utils import *
 
+# OWNED RULE SUFFIX
+# Rules written by reconcile are named "<rule name>-amt-1", "<rule name>-amt-2", ... so they can
+# never be confused with rules created by hand or by other tools, which are never changed
+# ///////////////////////////////////////////////////////////////
+OWNED_RULE_SUFFIX: str = "-amt-"
+
 # SQL FIREWALL RULE MANAGER CLASS
 # ///////////////////////////////////////////////////////////////
 class SQLFirewallRuleManager:
@@ -16,101 +26,512 @@ class SQLFirewallRuleManager:
         self.subscription_manager: Any = subscription_manager
         self.config_manager: Any = config_manager
         self.subscription: Dict[str, str] = subscription
-        self.base_url: str = "https://management.azure.com"
+        self.base_url: str = self.config_manager.configurations.get("endpoints", {}).get("resource_manager", "https://management.azure.com")
         self.api_version: str = "2021-11-01"
         self.headers: Dict[str, str] = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        self.http_client: HttpClient = get_http_client(self.config_manager.configurations)
+        self.batch_client: ARMBatchClient = ARMBatchClient(self.base_url, self.config_manager.configurations, self.http_client)
         self.firewall_name: str = firewall_name
         self.ip_address: Optional[str] = None
-        self.list_sql_servers: Optional[List[Dict[str, Any]]] = self.list_sql_servers()
+        self.range_prefix: int = int(self.config_manager.configurations.get("firewall_options", {}).get("range_prefix", 24))
+        self.cached_sql_servers: Optional[List[ResourceRecord]] = None
+        get_inventory_cache(self.config_manager.configurations).add_refresh_listener(self.forget_sql_servers)
+
+    # SQL SERVERS
+    # Lists the SQL servers on first use and keeps them for the lifetime of the manager
+    # ///////////////////////////////////////////////////////////////
+    @property
+    def sql_servers(self) -> Optional[List[ResourceRecord]]:
+        return run_async(self.get_sql_servers_async())
+
+    # GET SQL SERVERS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def get_sql_servers_async(self) -> Optional[List[ResourceRecord]]:
+        if self.cached_sql_servers is None:
+            self.cached_sql_servers = await self.list_sql_servers_async()
+        return self.cached_sql_servers
+
+    # REFRESH SQL SERVERS
+    # Drops the memoised and cached lists so the next access fetches them from Azure
+    # ///////////////////////////////////////////////////////////////
+    def refresh_sql_servers(self) -> Optional[List[ResourceRecord]]:
+        get_inventory_cache(self.config_manager.configurations).invalidate(self.subscription['subscriptionId'], "Microsoft.Sql/servers")
+        self.cached_sql_servers = None
+        return self.sql_servers
+
+    # FORGET SQL SERVERS
+    # Called by the inventory cache when it stores a new list of SQL servers for this subscription
+    # (e.g. from a background refresh), so the next access uses it
+    # ///////////////////////////////////////////////////////////////
+    def forget_sql_servers(self, key: str) -> None:
+        if key == get_inventory_cache().make_key(self.subscription['subscriptionId'], "Microsoft.Sql/servers"):
+            self.cached_sql_servers = None
+
+    # SET TOKEN
+    # Updates the bearer token used by this manager after the token has been refreshed
+    # ///////////////////////////////////////////////////////////////
+    def set_token(self, token: str) -> None:
+        self.headers["Authorization"] = f"Bearer {token}"
 
     # LIST SQL SERVERS
     # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/servers/list?view=rest-sql-2021-11-01
     # ///////////////////////////////////////////////////////////////
-    def list_sql_servers(self) -> Optional[List[Dict[str, Any]]]:
+    def list_sql_servers(self) -> Optional[List[ResourceRecord]]:
+        return run_async(self.list_sql_servers_async())
+
+    # LIST SQL SERVERS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def list_sql_servers_async(self) -> Optional[List[ResourceRecord]]:
+        inventory_cache: InventoryCache = get_inventory_cache(self.config_manager.configurations)
+        sql_servers: Optional[List[ResourceRecord]] = await inventory_cache.get_or_fetch_async(
+            self.subscription['subscriptionId'], "Microsoft.Sql/servers", self.fetch_sql_servers_async,
+            self.config_manager.configurations.get("list_options", {}).get("max_items")
+        )
+
+        if not sql_servers:
+            print("No SQL servers found in the subscription.")
+            return None
+
+        return sql_servers
+
+    # FETCH SQL SERVERS FROM AZURE
+    # Reads every page of the list endpoint, sending the cached ETag when there is one.
+    # With the Resource Graph discovery backend a single projected query is used instead.
+    # Only the name, ID and resource group of each SQL server are kept; get_sql_server fetches the
+    # full payload of one SQL server when it is needed.
+    # ///////////////////////////////////////////////////////////////
+    def fetch_sql_servers(self, etag: Optional[str] = None) -> Tuple[Optional[List[ResourceRecord]], Optional[str], bool]:
+        return run_async(self.fetch_sql_servers_async(etag))
+
+    # FETCH SQL SERVERS FROM AZURE (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    @traced("firewall.list_sql_servers")
+    async def fetch_sql_servers_async(self, etag: Optional[str] = None) -> Tuple[Optional[List[ResourceRecord]], Optional[str], bool]:
         url: str = (
             f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
             f"providers/Microsoft.Sql/servers?api-version={self.api_version}"
         )
 
-        response = make_api_request(
+        if self.config_manager.configurations.get("discovery_options", {}).get("backend") == "resource_graph":
+            sql_servers = project_resources(await query_resource_graph_async(self.base_url, self.headers, [self.subscription['subscriptionId']], ["Microsoft.Sql/servers"], self.http_client))
+            return sql_servers, None, False
+
+        list_options: Dict[str, Any] = self.config_manager.configurations.get("list_options", {})
+        sql_servers, etag, not_modified = await list_all_items_async(
             url=url,
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client,
+            max_items=list_options.get("max_items"),
+            prefetch=list_options.get("prefetch_next_page", False),
+            etag=etag,
+            project=ResourceRecord.from_item
+        )
+
+        return sql_servers, etag, not_modified
+
+    # GET SQL SERVER
+    # Fetches the full resource payload of a single SQL server
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/servers/get?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    def get_sql_server(self, server: str, resource_group: str) -> Optional[Dict[str, Any]]:
+        return run_async(self.get_sql_server_async(server, resource_group))
+
+    # GET SQL SERVER (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def get_sql_server_async(self, server: str, resource_group: str) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=self.sql_server_url(server, resource_group),
             method="GET",
             headers=self.headers,
-            retry_callback=self.list_sql_servers,
-            create_role_assignment= self.subscription_manager.create_role_assignment,
-            subscription = self.subscription
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client
         )
 
-        if isinstance(response, dict):
-            sql_servers: List[Dict[str, Any]] = response.get("value", [])
-        elif isinstance(response, list):
-            sql_servers: List[Dict[str, Any]] = response
-        else:
-            print("Unexpected response format. Returning None.")
+    # FETCH PUBLIC IP ADDRESS
+    # Retrieves the public IPv4 address from the shared resolver, which races several endpoints
+    # and caches the answer for the current network
+    # ///////////////////////////////////////////////////////////////
+    def get_public_ipv4(self) -> Optional[str]:
+        self.ip_address = get_public_ip_resolver(self.config_manager.configurations).resolve()
+        if not self.ip_address:
+            print("Failed to fetch public IP.")
+        return self.ip_address
+
+    # CREATE OR UPDATE FIREWALL RULE
+    # Adds or updates the firewall rule for the selected (or given) SQL server.
+    # The server, rule name and IP address are picked or prompted for here when they are not
+    # given, before the write is handed to the event loop.
+    # ///////////////////////////////////////////////////////////////
+    def create_or_update_firewall_rule(
+        self,
+        server: Optional[str] = None,
+        resource_group: Optional[str] = None,
+        firewall_rule_name: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        existing_rules: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        selected_server, selected_resource_group = (server, resource_group) if server and resource_group else self.select_sql_server(self.sql_servers)
+        if not selected_server or not selected_resource_group:
+            print("No SQL server selected. Aborting operation.")
             return None
 
-        if not sql_servers:
-            print("No SQL servers found in the subscription.")
+        firewall_rule_name = firewall_rule_name or self.prompt_firewall_rule_name()
+        ip_address = ip_address or self.resolve_ip_address(firewall_rule_name)
+        if not ip_address:
+            print("Invalid IP address. Aborting.")
             return None
 
-        for server in sql_servers:
-            server['resourceGroup'] = extract_segment(server['id'], 4).lower()
+        return run_async(self.create_or_update_firewall_rule_async(selected_server, selected_resource_group, firewall_rule_name, ip_address, existing_rules))
 
-        return sql_servers
+    # CREATE OR UPDATE FIREWALL RULE (ASYNC)
+    # Writes the rule unless it already covers exactly this range. The server's rules are only
+    # listed when they are not given, and nothing is written when they cannot be listed.
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/create-or-update?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    @traced("firewall.create_or_update_firewall_rule")
+    async def create_or_update_firewall_rule_async(
+        self,
+        server: str,
+        resource_group: str,
+        firewall_rule_name: str,
+        ip_address: str,
+        existing_rules: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        ip_range: Optional[Tuple[str, str]] = self.prepare_firewall_rule(firewall_rule_name, ip_address)
+        if ip_range is None:
+            return None
 
-    # FETCH PUBLIC IP ADDRESS
-    # Retrieves the public IPv4 address
+        existing_rules = await self.get_firewall_rules_async(server, resource_group, existing_rules)
+        if existing_rules is None:
+            return None
+        rule: Optional[Dict[str, Any]] = self.find_matching_rule(existing_rules, firewall_rule_name, ip_range)
+        if rule is not None:
+            return rule
+
+        response = await self.put_firewall_rule_async(server, resource_group, firewall_rule_name, *ip_range)
+        return self.report_firewall_rule_write(firewall_rule_name, response)
+
+    # RECONCILE FIREWALL RULES
+    # Makes the rules owned by firewall_rule_name ("name-amt-1", "name-amt-2", ...) cover exactly
+    # the given addresses, networks and ranges (single addresses are not widened). Overlapping and
+    # adjacent entries are merged first, then only the rules that differ are written or deleted,
+    # so a repeat run makes no writes.
+    # Rules with other names, including "name" itself, are never touched. Returns the changes
+    # made, or None on failure.
     # ///////////////////////////////////////////////////////////////
-    def get_public_ipv4(self) -> Optional[str]:
-        url = "https://api.ipify.org?format=json"
-        
-        response = make_api_request(
-            url=url,
-            method="GET"
+    def reconcile_firewall_rules(
+        self,
+        server: str,
+        resource_group: str,
+        ip_ranges: List[str],
+        firewall_rule_name: str,
+        existing_rules: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, List[str]]]:
+        return run_async(self.reconcile_firewall_rules_async(server, resource_group, ip_ranges, firewall_rule_name, existing_rules))
+
+    # RECONCILE FIREWALL RULES (ASYNC)
+    # The writes and deletes of one server are sent one after another
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/list-by-server?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    @traced("firewall.reconcile_firewall_rules")
+    async def reconcile_firewall_rules_async(
+        self,
+        server: str,
+        resource_group: str,
+        ip_ranges: List[str],
+        firewall_rule_name: str,
+        existing_rules: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, List[str]]]:
+        try:
+            desired: List[Tuple[str, str]] = merge_ip_ranges(ip_ranges)
+        except ValueError as e:
+            print(f"Invalid IP range: {e}")
+            return None
+
+        existing_rules = await self.get_firewall_rules_async(server, resource_group, existing_rules)
+        if existing_rules is None:
+            return None
+
+        changes: Dict[str, Any] = self.plan_firewall_changes(existing_rules, desired, firewall_rule_name)
+
+        for rule_name, (start_ip, end_ip) in changes["put"].items():
+            if await self.put_firewall_rule_async(server, resource_group, rule_name, start_ip, end_ip) is None:
+                print(f"Failed to create/update firewall rule '{rule_name}' on {server}.")
+                return None
+
+        for rule_name in changes["delete"]:
+            if await self.delete_firewall_rule_async(server, resource_group, rule_name) is None:
+                print(f"Failed to delete firewall rule '{rule_name}' on {server}.")
+                return None
+
+        print(
+            f"{server}: {len(changes['put'])} written, {len(changes['delete'])} deleted, "
+            f"{len(changes['unchanged'])} unchanged."
+        )
+        return {"written": list(changes["put"]), "deleted": changes["delete"], "unchanged": changes["unchanged"]}
+
+    # LIST FIREWALL RULES
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/list-by-server?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    def list_firewall_rules(self, server: str, resource_group: str) -> Optional[List[Dict[str, Any]]]:
+        return run_async(self.list_firewall_rules_async(server, resource_group))
+
+    # LIST FIREWALL RULES (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def list_firewall_rules_async(self, server: str, resource_group: str) -> Optional[List[Dict[str, Any]]]:
+        firewall_rules, _, _ = await list_all_items_async(
+            url=self.firewall_rules_url(server, resource_group),
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client
+        )
+        return firewall_rules
+
+    # GET FIREWALL RULES (ASYNC)
+    # Returns the rules already listed for the server (by apply_to_servers' batched listing, for
+    # example), listing them only when they are not given. None when they cannot be listed.
+    # ///////////////////////////////////////////////////////////////
+    async def get_firewall_rules_async(
+        self,
+        server: str,
+        resource_group: str,
+        existing_rules: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        if existing_rules is None:
+            existing_rules = await self.list_firewall_rules_async(server, resource_group)
+        if existing_rules is None:
+            print(f"Failed to list firewall rules for {server}.")
+        return existing_rules
+
+    # LIST FIREWALL RULES OF MANY SQL SERVERS
+    # Lists the rules of several SQL servers through the batch client, one list (or None on failure)
+    # per server in order. A list that has more than one page is finished with list_all_items.
+    # ///////////////////////////////////////////////////////////////
+    def list_firewall_rules_batch(self, sql_servers: List[Dict[str, Any]]) -> List[Optional[List[Dict[str, Any]]]]:
+        return run_async(self.list_firewall_rules_batch_async(sql_servers))
+
+    # LIST FIREWALL RULES OF MANY SQL SERVERS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def list_firewall_rules_batch_async(self, sql_servers: List[Dict[str, Any]]) -> List[Optional[List[Dict[str, Any]]]]:
+        responses: List[Optional[Dict[str, Any]]] = await self.batch_client.send_async(
+            [{"method": "GET", "url": self.firewall_rules_url(server['name'], server['resourceGroup'])} for server in sql_servers],
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription
+        )
+
+        firewall_rules: List[Optional[List[Dict[str, Any]]]] = []
+        for response in responses:
+            if response is None:
+                firewall_rules.append(None)
+                continue
+            rules: List[Dict[str, Any]] = response.get("value", [])
+            if response.get("nextLink"):
+                remaining, _, _ = await list_all_items_async(
+                    url=response["nextLink"],
+                    headers=self.headers,
+                    create_role_assignment=self.subscription_manager.create_role_assignment_async,
+                    subscription=self.subscription,
+                    client=self.http_client
+                )
+                rules = rules + remaining if remaining is not None else None
+            firewall_rules.append(rules)
+        return firewall_rules
+
+    # PUT FIREWALL RULE
+    # ///////////////////////////////////////////////////////////////
+    def put_firewall_rule(self, server: str, resource_group: str, firewall_rule_name: str, start_ip: str, end_ip: str) -> Optional[Dict[str, Any]]:
+        return run_async(self.put_firewall_rule_async(server, resource_group, firewall_rule_name, start_ip, end_ip))
+
+    # PUT FIREWALL RULE (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def put_firewall_rule_async(self, server: str, resource_group: str, firewall_rule_name: str, start_ip: str, end_ip: str) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=self.firewall_rule_url(server, resource_group, firewall_rule_name),
+            method="PUT",
+            headers=self.headers,
+            json_data=self.firewall_rule_body(start_ip, end_ip),
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client
+        )
+
+    # DELETE FIREWALL RULE
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/delete?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    def delete_firewall_rule(self, server: str, resource_group: str, firewall_rule_name: str) -> Optional[Dict[str, Any]]:
+        return run_async(self.delete_firewall_rule_async(server, resource_group, firewall_rule_name))
+
+    # DELETE FIREWALL RULE (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    async def delete_firewall_rule_async(self, server: str, resource_group: str, firewall_rule_name: str) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=self.firewall_rule_url(server, resource_group, firewall_rule_name),
+            method="DELETE",
+            headers=self.headers,
+            create_role_assignment=self.subscription_manager.create_role_assignment_async,
+            subscription=self.subscription,
+            client=self.http_client
         )
-        
-        if response and "ip" in response:
-            self.ip_address = response["ip"]
-            return self.ip_address
+
+    # APPLY FIREWALL RULE TO MANY SQL SERVERS
+    # Creates or updates the same firewall rule on every SQL server matching a name pattern and/or
+    # resource group (or on all of them). The rule name and public IP are prompted for and
+    # resolved here, once for the whole run, when any server matches and they are not given.
+    # ///////////////////////////////////////////////////////////////
+    def apply_to_servers(
+        self,
+        pattern: Optional[str] = None,
+        resource_group: Optional[str] = None,
+        firewall_rule_name: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        ip_ranges: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        if self.match_sql_servers(self.sql_servers, pattern, resource_group):
+            firewall_rule_name = firewall_rule_name or self.prompt_firewall_rule_name()
+            ip_address = ip_address or (None if ip_ranges else self.resolve_ip_address(firewall_rule_name))
+        return run_async(self.apply_to_servers_async(pattern, resource_group, firewall_rule_name, ip_address, ip_ranges))
+
+    # APPLY FIREWALL RULE TO MANY SQL SERVERS (ASYNC)
+    # Every server is a coroutine on the event loop, with at most bulk_options.max_workers of them
+    # waiting on a response at once. With ip_ranges each server's rules are reconciled to those
+    # ranges instead. With ARM batching the existing rules of every server are listed first in
+    # /batch calls of up to max_batch_size servers. Without a rule name the default one is used.
+    # A semaphore passed as limit is used instead of max_workers, so several bulk operations
+    # (such as the jobs of a batch run) can share one bound.
+    # ///////////////////////////////////////////////////////////////
+    @traced("firewall.apply_to_servers")
+    async def apply_to_servers_async(
+        self,
+        pattern: Optional[str] = None,
+        resource_group: Optional[str] = None,
+        firewall_rule_name: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        ip_ranges: Optional[List[str]] = None,
+        limit: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        import asyncio
+
+        sql_servers: List[Dict[str, Any]] = self.match_sql_servers(await self.get_sql_servers_async(), pattern, resource_group)
+
+        summary: Dict[str, Any] = {"succeeded": [], "failed": [], "timings": {}}
+        if not sql_servers:
+            print("No SQL servers matched. Nothing to update.")
+            return summary
+
+        firewall_rule_name = firewall_rule_name or self.firewall_name
+        if not ip_address and not ip_ranges:
+            print("Invalid IP address. Aborting.")
+            summary["failed"] = [server['name'] for server in sql_servers]
+            return summary
+
+        if limit is None:
+            max_workers: int = self.config_manager.configurations.get("bulk_options", {}).get("max_workers", 16)
+            limit = asyncio.Semaphore(max_workers)
+            print(f"\nApplying firewall rule '{firewall_rule_name}' to {len(sql_servers)} SQL servers with up to {max_workers} requests in flight...")
         else:
-            print("Failed to fetch public IP.")
-            return None
+            print(f"\nApplying firewall rule '{firewall_rule_name}' to {len(sql_servers)} SQL servers...")
 
-    # CREATE OR UPDATE FIREWALL RULE
-    # Adds or updates the firewall rule for the selected SQL server
-    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/create-or-update?view=rest-sql-2021-11-01
+        existing_rules: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+
+        async def apply(server: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]], float]:
+            async with limit:
+                started_at = time.perf_counter()
+                rules = existing_rules.get(server['name'])
+                try:
+                    if ip_ranges:
+                        response = await self.reconcile_firewall_rules_async(server['name'], server['resourceGroup'], ip_ranges, firewall_rule_name, rules)
+                    else:
+                        response = await self.create_or_update_firewall_rule_async(server['name'], server['resourceGroup'], firewall_rule_name, ip_address, rules)
+                except Exception as e:
+                    print(f"Error occurred while updating the firewall rule on {server['name']}: {e}")
+                    return server['name'], None, 0.0
+                return server['name'], response, time.perf_counter() - started_at
+
+        started_at: float = time.perf_counter()
+        if self.batch_client.enabled and len(sql_servers) > 1:
+            existing_rules = await self.prefetch_firewall_rules(sql_servers, limit)
+
+        for task in asyncio.as_completed([apply(server) for server in sql_servers]):
+            server_name, response, elapsed = await task
+            summary["timings"][server_name] = elapsed
+            summary["succeeded" if response is not None else "failed"].append(server_name)
+
+        summary["elapsed"] = time.perf_counter() - started_at
+        self.print_apply_summary(summary)
+        return summary
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # SQL SERVER URL
+    # ///////////////////////////////////////////////////////////////
+    def sql_server_url(self, server: str, resource_group: str) -> str:
+        return (
+            f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
+            f"resourceGroups/{resource_group}/"
+            f"providers/Microsoft.Sql/servers/{server}?api-version={self.api_version}"
+        )
+
+    # PREFETCH FIREWALL RULES
+    # Lists the rules of every server in batches sharing the given semaphore, keyed by server name.
+    # Servers whose rules could not be listed are left out, so they are listed again on their own.
+    # ///////////////////////////////////////////////////////////////
+    async def prefetch_firewall_rules(self, sql_servers: List[Dict[str, Any]], limit: Any) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        import asyncio
+
+        size: int = self.batch_client.max_batch_size
+        groups: List[List[Dict[str, Any]]] = [sql_servers[start:start + size] for start in range(0, len(sql_servers), size)]
+        existing_rules: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+
+        async def list_group(group: List[Dict[str, Any]]) -> List[Optional[List[Dict[str, Any]]]]:
+            async with limit:
+                return await self.list_firewall_rules_batch_async(group)
+
+        for group, rules_by_server in zip(groups, await asyncio.gather(*(list_group(group) for group in groups), return_exceptions=True)):
+            if isinstance(rules_by_server, Exception):
+                print(f"Error occurred while listing firewall rules: {rules_by_server}")
+                continue
+            for server, rules in zip(group, rules_by_server):
+                if rules is not None:
+                    existing_rules[server['name']] = rules
+        return existing_rules
+
+    # SELECT SQL SERVER
+    # Lets the user search and pick a SQL server; returns its name and resource group
     # ///////////////////////////////////////////////////////////////
-    def create_or_update_firewall_rule(self) -> Optional[Dict[str, Any]]:
-        selected_server, selected_resource_group = search_and_select_from_list(
-            items = self.list_sql_servers,
+    def select_sql_server(self, sql_servers: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[str], Optional[str]]:
+        return search_and_select_from_list(
+            items = sql_servers,
             item_key = 'name',
             item_type=  'SQL Server',
             select_message = "\nPlease select a SQL server from the list:",
             num_columns = self.config_manager.configurations['display_options']['number_of_columns'],
-            display_columns = self.config_manager.configurations['display_options']['display_items_in_columns']
-        )
+            display_columns = self.config_manager.configurations['display_options']['display_items_in_columns'],
+            page_size = self.config_manager.configurations['display_options'].get('page_size')
+        ) or (None, None)
 
-        if not selected_server or not selected_resource_group:
-            print("No SQL server selected. Aborting operation.")
-            return None
+    # MATCH SQL SERVERS
+    # ///////////////////////////////////////////////////////////////
+    def match_sql_servers(self, sql_servers: Optional[List[Dict[str, Any]]], pattern: Optional[str], resource_group: Optional[str]) -> List[Dict[str, Any]]:
+        return [
+            server for server in (sql_servers or [])
+            if (not pattern or fnmatch.fnmatch(server['name'].lower(), pattern.lower()))
+            and (not resource_group or fnmatch.fnmatch(server['resourceGroup'].lower(), resource_group.lower()))
+        ]
 
-        firewall_rule_name = self.prompt_firewall_rule_name()
+    # PREPARE FIREWALL RULE
+    # Returns the range the rule should cover, or None when there is no valid range
+    # ///////////////////////////////////////////////////////////////
+    def prepare_firewall_rule(self, firewall_rule_name: str, ip_address: str) -> Optional[Tuple[str, str]]:
         print(f"Adding IP to firewall rule: {firewall_rule_name}")
-        
-        if not self.ip_address:
-            self.get_public_ipv4()
-
-        if not self.ip_address:
-            print("Could not fetch public IPv4 address. Aborting.")
-            return None
-
-        ip_address = self.prompt_ip_address() if firewall_rule_name != self.firewall_name else self.ip_address
-        if not ip_address:
-            print("Invalid IP address. Aborting.")
-            return None
 
         start_ip, end_ip = self.calculate_ip_range(ip_address)
         if not start_ip or not end_ip:
@@ -118,51 +539,132 @@ class SQLFirewallRuleManager:
             return None
 
         print(f"IP Range: {start_ip} - {end_ip}")
+        return start_ip, end_ip
 
-        url = (
+    # FIND MATCHING RULE
+    # Returns the existing rule when it already covers exactly this range
+    # ///////////////////////////////////////////////////////////////
+    def find_matching_rule(self, existing_rules: Optional[List[Dict[str, Any]]], firewall_rule_name: str, ip_range: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        for rule in existing_rules or []:
+            properties = rule.get("properties", {})
+            if rule.get("name", "").lower() == firewall_rule_name.lower() and (properties.get("startIpAddress"), properties.get("endIpAddress")) == ip_range:
+                print(f"Firewall rule '{firewall_rule_name}' is already up to date.")
+                return rule
+        return None
+
+    # REPORT FIREWALL RULE WRITE
+    # ///////////////////////////////////////////////////////////////
+    def report_firewall_rule_write(self, firewall_rule_name: str, response: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if response is not None:
+            print(f"Firewall rule '{firewall_rule_name}' created/updated successfully.")
+            return response
+        else:
+            print(f"Failed to create/update firewall rule '{firewall_rule_name}'.")
+            return None
+
+    # FIREWALL RULE URL AND BODY
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/sql/firewall-rules/create-or-update?view=rest-sql-2021-11-01
+    # ///////////////////////////////////////////////////////////////
+    def firewall_rule_url(self, server: str, resource_group: str, firewall_rule_name: str) -> str:
+        return (
             f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
-            f"resourceGroups/{selected_resource_group}/"
-            f"providers/Microsoft.Sql/servers/{selected_server}/"
+            f"resourceGroups/{resource_group}/"
+            f"providers/Microsoft.Sql/servers/{server}/"
             f"firewallRules/{firewall_rule_name}?api-version={self.api_version}"
         )
-        
-        body = {
+
+    def firewall_rule_body(self, start_ip: str, end_ip: str) -> Dict[str, Any]:
+        return {
             "properties": {
                 "startIpAddress": start_ip,
                 "endIpAddress": end_ip
             }
         }
 
-        response = make_api_request(
-            url=url,
-            method="PUT",
-            headers=self.headers,
-            json_data=body,
-            create_role_assignment= self.subscription_manager.create_role_assignment,
-            subscription = self.subscription
+    # FIREWALL RULES URL
+    # ///////////////////////////////////////////////////////////////
+    def firewall_rules_url(self, server: str, resource_group: str) -> str:
+        return (
+            f"{self.base_url}/subscriptions/{self.subscription['subscriptionId']}/"
+            f"resourceGroups/{resource_group}/"
+            f"providers/Microsoft.Sql/servers/{server}/"
+            f"firewallRules?api-version={self.api_version}"
         )
 
-        if response:
-            print(f"Firewall rule '{firewall_rule_name}' created/updated successfully.")
-            return response
-        else:
-            print(f"Failed to create/update firewall rule '{firewall_rule_name}'.")
+    # RESOLVE IP ADDRESS
+    # Uses the public IP for the default rule, or asks for a custom IP for any other rule name
+    # ///////////////////////////////////////////////////////////////
+    def resolve_ip_address(self, firewall_rule_name: str) -> Optional[str]:
+        if not self.ip_address:
+            self.get_public_ipv4()
+
+        if not self.ip_address:
+            print("Could not fetch public IPv4 address. Aborting.")
             return None
-        
-    # UTILITY FUNCTIONS
+
+        return self.prompt_ip_address() if firewall_rule_name != self.firewall_name else self.ip_address
+
+    # PRINT APPLY SUMMARY
+    # Prints the outcome and latency of every SQL server updated by apply_to_servers
     # ///////////////////////////////////////////////////////////////
+    def print_apply_summary(self, summary: Dict[str, Any]) -> None:
+        print(f"\nFirewall update finished in {summary['elapsed']:.2f}s")
+        print(f"Succeeded: {len(summary['succeeded'])}")
+        print(f"Failed: {len(summary['failed'])}")
+        for server_name, elapsed in sorted(summary["timings"].items(), key=lambda timing: timing[1], reverse=True):
+            outcome = "ok" if server_name in summary["succeeded"] else "FAILED"
+            print(f" - {server_name}: {outcome} ({elapsed:.2f}s)")
 
     # CALCULATE IP RANGE
-    # Generates the start and end of the IP range based on the provided IPv4
+    # Generates the start and end of the IP range around the provided IPv4, widened to the
+    # configured prefix length (a /24 by default)
     # ///////////////////////////////////////////////////////////////
     def calculate_ip_range(self, ipv4: str) -> Tuple[Optional[str], Optional[str]]:
         if not ipv4:
             return None, None
-        ip_parts = ipv4.split('.')
-        start_ip = '.'.join(ip_parts[:3] + ['0'])
-        end_ip = '.'.join(ip_parts[:3] + ['255'])
+        try:
+            (start_ip, end_ip), = merge_ip_ranges([ipv4], self.range_prefix)
+        except ValueError:
+            return None, None
         return start_ip, end_ip
-    
+
+    # PLAN FIREWALL CHANGES
+    # Compares the existing rules with the desired (start, end) intervals. Only rules named
+    # "<firewall_rule_name>-amt-N" are owned: intervals that already exist under one of them are
+    # kept, the rest reuse stale owned names before new names are used, and owned rules left
+    # over are deleted. New names never replace an existing rule of any kind.
+    # ///////////////////////////////////////////////////////////////
+    def plan_firewall_changes(self, existing_rules: List[Dict[str, Any]], desired: List[Tuple[str, str]], firewall_rule_name: str) -> Dict[str, Any]:
+        owned_pattern = re.compile(rf"{re.escape(firewall_rule_name.lower() + OWNED_RULE_SUFFIX)}\d+")
+        owned: Dict[str, Tuple[str, str]] = {
+            rule["name"]: (rule.get("properties", {}).get("startIpAddress"), rule.get("properties", {}).get("endIpAddress"))
+            for rule in existing_rules
+            if owned_pattern.fullmatch(rule.get("name", "").lower())
+        }
+
+        unchanged: List[str] = []
+        kept_intervals = set()
+        for name, interval in owned.items():
+            if interval in desired and interval not in kept_intervals:
+                unchanged.append(name)
+                kept_intervals.add(interval)
+        missing: List[Tuple[str, str]] = [interval for interval in desired if interval not in kept_intervals]
+        stale: List[str] = sorted(name for name in owned if name not in unchanged)
+
+        taken = {rule.get("name", "").lower() for rule in existing_rules}
+        candidate_names = (f"{firewall_rule_name}{OWNED_RULE_SUFFIX}{index}" for index in itertools.count(1))
+
+        put: Dict[str, Tuple[str, str]] = {}
+        for interval in missing:
+            if stale:
+                put[stale.pop(0)] = interval
+                continue
+            name = next(name for name in candidate_names if name.lower() not in taken)
+            taken.add(name.lower())
+            put[name] = interval
+
+        return {"put": put, "delete": stale, "unchanged": unchanged}
+
     # PROMPT FOR FIREWALL RULE NAME
     # Prompts the user to provide a firewall rule name or use the default
     # ///////////////////////////////////////////////////////////////
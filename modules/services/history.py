@@ -0,0 +1,107 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List, Optional
+
+# IMPORT UTILITY FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+from modules.utils import *
+
+# HISTORY MANAGER CLASS
+# Answers questions about past app settings exports from the snapshot store
+# ///////////////////////////////////////////////////////////////
+class HistoryManager:
+
+    # INITIALISE HISTORY MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, subscription_manager: Any, config_manager: Any) -> None:
+        self.subscription_manager: Any = subscription_manager
+        self.config_manager: Any = config_manager
+        self.snapshot_store: SnapshotStore = get_snapshot_store(self.config_manager.configurations)
+
+    # SHOW HISTORY
+    # Lets the user pick which history query to run
+    # ///////////////////////////////////////////////////////////////
+    def show_history(self) -> None:
+        if not self.snapshot_store.enabled:
+            print("App settings history is disabled in snapshot_options.")
+            return
+
+        print("\nWhat would you like to see?")
+        print("1. Web apps that changed a setting since a date")
+        print("2. Differences for one web app between two exports")
+        choice = input("Enter the number of your choice: ").strip()
+
+        if choice == "1":
+            self.show_setting_changes()
+        elif choice == "2":
+            self.show_app_diff()
+        else:
+            print("Invalid option.")
+
+    # SHOW SETTING CHANGES
+    # ///////////////////////////////////////////////////////////////
+    def show_setting_changes(self) -> None:
+        setting_pattern = input("Enter a setting name or pattern (e.g. Logging__*): ").strip()
+        since = input("Enter a start date (YYYY-MM-DD) or press Enter for all history: ").strip()
+        if not setting_pattern:
+            print("No setting given. Aborting.")
+            return
+
+        try:
+            changes: List[Dict[str, Any]] = self.snapshot_store.find_changes(setting_pattern, since or None)
+        except ValueError as e:
+            print(f"Invalid date: {e}")
+            return
+
+        if not changes:
+            print(f"No changes to {setting_pattern} found.")
+            return
+
+        print(f"\nFound {len(changes)} changes:")
+        for change in changes:
+            print(f" - {change['takenAt']} | {change['appName']} ({change['subscriptionId']}) | {change['setting']} {change['change']}")
+
+    # SHOW APP DIFF
+    # Compares two exports of a web app; defaults to the latest two
+    # ///////////////////////////////////////////////////////////////
+    def show_app_diff(self) -> None:
+        subscription: Dict[str, str] = self.subscription_manager.select_subscription()
+        app_name = input("Enter the web app name: ").strip()
+        snapshots: List[Dict[str, Any]] = self.snapshot_store.list_snapshots(subscription['subscriptionId'], app_name)
+
+        if len(snapshots) < 2:
+            print(f"At least two exports of {app_name} are needed to compare.")
+            return
+
+        print(f"\nExports of {app_name}:")
+        for snapshot in snapshots:
+            print(f"{snapshot['snapshotId']}. {snapshot['takenAt']} ({snapshot['changeCount']} changes)")
+
+        from_snapshot = self.prompt_snapshot("Enter the older export number", snapshots[-2]['snapshotId'])
+        to_snapshot = self.prompt_snapshot("Enter the newer export number", snapshots[-1]['snapshotId'])
+        if from_snapshot is None or to_snapshot is None:
+            print("Invalid export number. Aborting.")
+            return
+
+        diff: Dict[str, Dict[str, Any]] = self.snapshot_store.diff(subscription['subscriptionId'], app_name, from_snapshot, to_snapshot)
+        if not any(diff.values()):
+            print("No differences.")
+            return
+
+        for setting, value in diff["added"].items():
+            print(f" + {setting} = {value}")
+        for setting, value in diff["removed"].items():
+            print(f" - {setting} = {value}")
+        for setting, values in diff["changed"].items():
+            print(f" ~ {setting}: {values['from']} -> {values['to']}")
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # PROMPT FOR SNAPSHOT
+    # ///////////////////////////////////////////////////////////////
+    def prompt_snapshot(self, message: str, default: int) -> Optional[int]:
+        user_input = input(f"{message} or press Enter for {default}: ").strip()
+        if not user_input:
+            return default
+        return int(user_input) if user_input.isdigit() else None
@@ -0,0 +1,180 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import time
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+
+# IMPORT UTILITY FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+from modules.utils import *
+
+# Resource types included in the inventory, keyed by their lower-case ARM type
+RESOURCE_TYPES: Dict[str, str] = {
+    "microsoft.web/sites": "Web App",
+    "microsoft.sql/servers": "SQL Server"
+}
+
+# INVENTORY MANAGER CLASS
+# Lists web apps and SQL servers across many subscriptions concurrently
+# ///////////////////////////////////////////////////////////////
+class InventoryManager:
+
+    # INITIALISE INVENTORY MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, subscriptions: List[Dict[str, str]], session_manager: Any) -> None:
+        self.subscriptions: List[Dict[str, str]] = subscriptions
+        self.session_manager: Any = session_manager
+        self.config_manager: Any = session_manager.config_manager
+        self.options: Dict[str, Any] = self.config_manager.configurations.get("inventory_options", {})
+        self.items: List[Dict[str, Any]] = []
+        self.failed_subscriptions: List[str] = []
+
+    # COLLECT INVENTORY
+    # Signs in and sets up the managers of every subscription, then runs the listings on the
+    # event loop
+    # ///////////////////////////////////////////////////////////////
+    def collect(self) -> List[Dict[str, Any]]:
+        if self.config_manager.configurations.get("discovery_options", {}).get("backend") == "resource_graph":
+            return self.collect_from_resource_graph()
+
+        listings: List[Tuple[Dict[str, str], str, Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]]] = []
+        for subscription in self.subscriptions:
+            listings.append((subscription, "Web App", self.session_manager.get_settings_manager(subscription).get_web_apps_async))
+            listings.append((subscription, "SQL Server", self.session_manager.get_sql_manager(subscription).get_sql_servers_async))
+        return run_async(self.collect_async(listings))
+
+    # COLLECT INVENTORY (ASYNC)
+    # Runs one listing task per subscription and resource type, with at most max_workers of them
+    # at once and at most per_subscription_concurrency for any one subscription, so a large
+    # subscription cannot take every worker or exceed its own ARM read limit. A listing waits
+    # for its subscription's slot before taking a worker, so waiting never holds one.
+    # The whole fan-out has a deadline: listings still running when it passes are cancelled,
+    # which stops their requests, and are reported as skipped.
+    # ///////////////////////////////////////////////////////////////
+    @traced("inventory.collect")
+    async def collect_async(self, listings: List[Tuple[Dict[str, str], str, Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]]]) -> List[Dict[str, Any]]:
+        import asyncio
+
+        max_workers: int = self.options.get("max_workers", 8)
+        timeout: Optional[float] = self.options.get("subscription_timeout", 120)
+        limit = asyncio.Semaphore(max_workers)
+        per_subscription: int = self.options.get("per_subscription_concurrency", 1)
+        subscription_limits: Dict[str, Any] = {
+            subscription["subscriptionId"]: asyncio.Semaphore(per_subscription) for subscription, _, _ in listings
+        }
+
+        print(f"\nListing resources across {len(self.subscriptions)} subscriptions...")
+        started_at: float = time.perf_counter()
+
+        async def run(subscription: Dict[str, str], resource_type: str, list_resources: Callable) -> List[Dict[str, Any]]:
+            async with subscription_limits[subscription["subscriptionId"]], limit:
+                return [self.tag_item(item, subscription, resource_type) for item in await list_resources() or []]
+
+        tasks: Dict[Any, Tuple[Dict[str, str], str]] = {
+            asyncio.ensure_future(run(subscription, resource_type, list_resources)): (subscription, resource_type)
+            for subscription, resource_type, list_resources in listings
+        }
+        not_done = set()
+        if tasks:
+            _, not_done = await asyncio.wait(tasks, timeout=timeout)
+        for task in not_done:
+            task.cancel()
+        # Wait for the cancelled listings to unwind so none of their requests outlive the deadline
+        await asyncio.gather(*not_done, return_exceptions=True)
+
+        items: List[Dict[str, Any]] = []
+        failed: List[str] = []
+        for task, (subscription, resource_type) in tasks.items():
+            label = f"{subscription.get('displayName', subscription['subscriptionId'])} ({resource_type})"
+            if task in not_done:
+                print(f"Timed out while listing {label}. Skipping.")
+                failed.append(label)
+                continue
+            try:
+                items.extend(task.result())
+            except Exception as e:
+                print(f"Error occurred while listing {label}: {e}")
+                failed.append(label)
+
+        self.items = sorted(items, key=lambda item: item['displayName'].lower())
+        self.failed_subscriptions = failed
+        print(f"Found {len(self.items)} resources in {time.perf_counter() - started_at:.2f}s.")
+        return self.items
+
+    # COLLECT INVENTORY FROM RESOURCE GRAPH
+    # Lists web apps and SQL servers for every subscription with a single Resource Graph query
+    # ///////////////////////////////////////////////////////////////
+    def collect_from_resource_graph(self) -> List[Dict[str, Any]]:
+        subscription_manager = self.session_manager.get_subscription_manager()
+        subscriptions: Dict[str, Dict[str, str]] = {
+            subscription["subscriptionId"].lower(): subscription for subscription in self.subscriptions
+        }
+
+        print(f"\nQuerying Resource Graph across {len(subscriptions)} subscriptions...")
+        started_at: float = time.perf_counter()
+
+        resources = query_resource_graph(
+            subscription_manager.base_url,
+            subscription_manager.headers,
+            [subscription["subscriptionId"] for subscription in self.subscriptions],
+            list(RESOURCE_TYPES),
+            subscription_manager.http_client
+        )
+
+        items: List[Dict[str, Any]] = []
+        for resource in resources or []:
+            subscription = subscriptions.get((resource.get("subscriptionId") or "").lower())
+            resource_type = RESOURCE_TYPES.get((resource.get("type") or "").lower())
+            if subscription and resource_type:
+                items.append(self.tag_item(resource, subscription, resource_type))
+
+        self.items = sorted(items, key=lambda item: item['displayName'].lower())
+        self.failed_subscriptions = [] if resources is not None else [subscription["subscriptionId"] for subscription in self.subscriptions]
+        print(f"Found {len(self.items)} resources in {time.perf_counter() - started_at:.2f}s.")
+        return self.items
+
+    # SEARCH AND SELECT RESOURCE
+    # Lets the user search the merged inventory and returns the selected tagged item
+    # ///////////////////////////////////////////////////////////////
+    def select_resource(self) -> Optional[Dict[str, Any]]:
+        by_display_name: Dict[str, Dict[str, Any]] = {item['displayName']: item for item in self.items}
+
+        selection = search_and_select_from_list(
+            items = self.items,
+            item_key = 'displayName',
+            item_type = 'Resource',
+            select_message = "\nPlease select a resource from the list:",
+            num_columns = self.config_manager.configurations['display_options']['number_of_columns'],
+            display_columns = self.config_manager.configurations['display_options']['display_items_in_columns'],
+            page_size = self.config_manager.configurations['display_options'].get('page_size')
+        )
+
+        if not selection:
+            return None
+        return by_display_name.get(selection[0])
+
+    # PERFORM ACTION ON RESOURCE
+    # Exports app settings for a web app or updates the firewall rule for a SQL server
+    # ///////////////////////////////////////////////////////////////
+    def perform_action(self, item: Dict[str, Any]) -> None:
+        resource_group: str = extract_segment(item['id'], 4)
+        if item['resourceType'] == "Web App":
+            self.session_manager.get_settings_manager(item['subscription']).fetch_and_save(item['name'], resource_group)
+        elif item['resourceType'] == "SQL Server":
+            self.session_manager.get_sql_manager(item['subscription']).create_or_update_firewall_rule(item['name'], resource_group)
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # TAG ITEM
+    # Adds the subscription and resource type to an item so it can be searched in a merged list
+    # ///////////////////////////////////////////////////////////////
+    def tag_item(self, item: Dict[str, Any], subscription: Dict[str, str], resource_type: str) -> Dict[str, Any]:
+        subscription_name: str = subscription.get('displayName', subscription['subscriptionId'])
+        return {
+            **item,
+            "subscriptionId": subscription["subscriptionId"],
+            "subscriptionName": subscription_name,
+            "subscription": subscription,
+            "resourceType": resource_type,
+            "displayName": f"{item['name']} [{resource_type} | {subscription_name}]"
+        }
@@ -0,0 +1,207 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from urllib.parse import urlparse
+
+# IMPORT UTILITY FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+from modules.utils import *
+
+# DEFAULT KEY VAULT OPTIONS
+# Used when config.json does not provide a "keyvault_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_KEYVAULT_OPTIONS: Dict[str, Any] = {
+    "resolve_references": False,
+    "max_workers": 8,
+    "cache_ttl_seconds": 300,
+    "api_version": "7.4",
+    "scope": "https://vault.azure.net/.default",
+    "vault_dns_suffix": ".vault.azure.net",
+    "vault_url_template": None
+}
+
+REFERENCE_PATTERN = re.compile(r"^@Microsoft\.KeyVault\((?P<body>.*)\)$", re.IGNORECASE)
+# Key Vault names, secret names and versions only hold letters, digits and hyphens
+NAME_PATTERN = re.compile(r"^[0-9a-z-]+$", re.IGNORECASE)
+
+# KEY VAULT RESOLVER CLASS
+# Replaces "@Microsoft.KeyVault(...)" references in exported settings with the secret values.
+# References are collected across every document, deduplicated, grouped by vault and fetched
+# concurrently; values are cached in memory for a short time.
+# ///////////////////////////////////////////////////////////////
+class KeyVaultResolver:
+
+    # INITIALISE KEY VAULT RESOLVER
+    # token_provider receives a scope and returns a bearer token for it
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, token_provider: Callable[[str], str], config_manager: Any) -> None:
+        self.token_provider: Callable[[str], str] = token_provider
+        self.config_manager: Any = config_manager
+        self.options: Dict[str, Any] = {**DEFAULT_KEYVAULT_OPTIONS, **self.config_manager.configurations.get("keyvault_options", {})}
+        self.enabled: bool = bool(self.options["resolve_references"])
+        self.http_client: HttpClient = get_http_client(self.config_manager.configurations)
+        self.cache: Dict[str, Tuple[str, float]] = {}
+        self.lock = threading.Lock()
+
+    # RESOLVE DOCUMENTS
+    # Resolves the references in every document in place. Unresolved references are left as they
+    # are. Returns the number of references resolved and the number that failed.
+    # ///////////////////////////////////////////////////////////////
+    def resolve(self, documents: List[Dict[str, Any]]) -> Tuple[int, int]:
+        return run_async(self.resolve_async(documents))
+
+    # RESOLVE DOCUMENTS (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    @traced("keyvault.resolve")
+    async def resolve_async(self, documents: List[Dict[str, Any]]) -> Tuple[int, int]:
+        locations: Dict[str, List[Tuple[Dict[str, Any], str]]] = defaultdict(list)
+        vaults: Dict[str, str] = {}
+        rejected: int = 0
+        for document in documents:
+            for container, key, value in self.find_references(document):
+                reference = self.parse_reference(value)
+                if reference:
+                    vaults[reference[1]] = reference[0]
+                    locations[reference[1]].append((container, key))
+                else:
+                    rejected += 1
+
+        if not locations:
+            return 0, rejected
+
+        values: Dict[str, Optional[str]] = await self.fetch_secrets(vaults)
+
+        resolved, failed = 0, rejected
+        for secret_url, places in locations.items():
+            value = values.get(secret_url)
+            if value is None:
+                failed += len(places)
+                continue
+            for container, key in places:
+                container[key] = value
+            resolved += len(places)
+
+        return resolved, failed
+
+    # FETCH SECRETS
+    # Fetches each distinct secret (a secret URL mapped to its vault name) once, with at most
+    # max_workers requests in flight, serving fresh values from the cache.
+    # The token provider may block, so it is called on a worker thread.
+    # ///////////////////////////////////////////////////////////////
+    async def fetch_secrets(self, secret_urls: Dict[str, str]) -> Dict[str, Optional[str]]:
+        import asyncio
+
+        values: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        now: float = time.monotonic()
+
+        with self.lock:
+            for secret_url in secret_urls:
+                cached = self.cache.get(secret_url)
+                if cached and now - cached[1] < float(self.options["cache_ttl_seconds"]):
+                    values[secret_url] = cached[0]
+                else:
+                    missing.append(secret_url)
+
+        if not missing:
+            return values
+
+        by_vault: Dict[str, List[str]] = defaultdict(list)
+        for secret_url in missing:
+            by_vault[secret_urls[secret_url]].append(secret_url)
+        print(f"Resolving {len(missing)} Key Vault references from {len(by_vault)} vaults...")
+
+        token: str = await asyncio.get_running_loop().run_in_executor(None, self.token_provider, self.options["scope"])
+        headers: Dict[str, str] = {"Authorization": f"Bearer {token}"}
+        ordered: List[str] = [secret_url for urls in by_vault.values() for secret_url in urls]
+        limit = asyncio.Semaphore(int(self.options["max_workers"]))
+
+        async def fetch(secret_url: str) -> Optional[str]:
+            async with limit:
+                return await self.fetch_secret(secret_url, headers)
+
+        for secret_url, value in zip(ordered, await asyncio.gather(*(fetch(secret_url) for secret_url in ordered))):
+            values[secret_url] = value
+            if value is not None:
+                with self.lock:
+                    self.cache[secret_url] = (value, time.monotonic())
+
+        return values
+
+    # FETCH SECRET
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/keyvault/secrets/get-secret/get-secret?view=rest-keyvault-secrets-7.4
+    # ///////////////////////////////////////////////////////////////
+    async def fetch_secret(self, secret_url: str, headers: Dict[str, str]) -> Optional[str]:
+        response = await make_api_request_async(
+            url=f"{secret_url}?api-version={self.options['api_version']}",
+            method="GET",
+            headers=headers,
+            client=self.http_client
+        )
+        if response is None or "value" not in response:
+            print(f"Failed to resolve Key Vault reference {secret_url}.")
+            return None
+        return response["value"]
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # FIND REFERENCES
+    # Yields (container, key, value) for every Key Vault reference in a nested document
+    # ///////////////////////////////////////////////////////////////
+    def find_references(self, document: Dict[str, Any]):
+        for key, value in document.items():
+            if isinstance(value, dict):
+                yield from self.find_references(value)
+            elif isinstance(value, str) and REFERENCE_PATTERN.match(value.strip()):
+                yield document, key, value
+
+    # PARSE REFERENCE
+    # Turns either reference form into the vault name and secret URL (without api-version):
+    #   @Microsoft.KeyVault(SecretUri=https://myvault.vault.azure.net/secrets/name/version)
+    #   @Microsoft.KeyVault(VaultName=myvault;SecretName=name;SecretVersion=version)
+    # The Key Vault token is sent to the secret URL, so a SecretUri is only accepted over https
+    # on a host ending in vault_dns_suffix; any other reference is skipped. With
+    # vault_url_template set (e.g. "http://127.0.0.1:8200/{vault}") every vault is reached
+    # through that address instead, which is how a local mock vault is used.
+    # ///////////////////////////////////////////////////////////////
+    def parse_reference(self, value: str) -> Optional[Tuple[str, str]]:
+        match = REFERENCE_PATTERN.match(value.strip())
+        if not match:
+            return None
+
+        parts: Dict[str, str] = {}
+        for part in match.group("body").split(";"):
+            name, _, part_value = part.partition("=")
+            if part_value:
+                parts[name.strip().lower()] = part_value.strip()
+
+        dns_suffix: str = self.options["vault_dns_suffix"].lower()
+        if "secreturi" in parts:
+            secret_uri = urlparse(parts["secreturi"])
+            host: str = (secret_uri.hostname or "").lower()
+            if secret_uri.scheme.lower() != "https" or secret_uri.netloc.lower() != host or not host.endswith(dns_suffix):
+                print(f"Skipping Key Vault reference to untrusted address {secret_uri.scheme}://{secret_uri.netloc}.")
+                return None
+            path = [segment for segment in secret_uri.path.split("/") if segment]
+            if len(path) < 2 or path[0].lower() != "secrets":
+                return None
+            vault_name = host[:-len(dns_suffix)]
+            secret_name, secret_version = path[1], path[2] if len(path) > 2 else ""
+        elif "vaultname" in parts and "secretname" in parts:
+            vault_name = parts["vaultname"]
+            secret_name, secret_version = parts["secretname"], parts.get("secretversion", "")
+        else:
+            return None
+
+        if not all(NAME_PATTERN.match(name) for name in (vault_name, secret_name, secret_version or "latest")):
+            return None
+        vault_url: str = f"https://{vault_name}{dns_suffix}"
+        if self.options["vault_url_template"]:
+            vault_url = self.options["vault_url_template"].format(vault=vault_name).rstrip("/")
+
+        return vault_name.lower(), f"{vault_url}/secrets/{secret_name}" + (f"/{secret_version}" if secret_version else "")
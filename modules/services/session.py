@@ -0,0 +1,104 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+# IMPORT SERVICE MANAGERS
+# ///////////////////////////////////////////////////////////////
+from .appsettings import AppSettingsManager
+from .firewall import SQLFirewallRuleManager
+from .subscription import SubscriptionManager
+from .keyvault import KeyVaultResolver
+
+# SESSION MANAGER CLASS
+# Keeps one subscription manager and one manager per subscription alive for the whole run,
+# so resource lists and active roles are reused across "perform another action" cycles
+# ///////////////////////////////////////////////////////////////
+class SessionManager:
+
+    # INITIALISE SESSION MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, auth_manager: Any, config_manager: Any) -> None:
+        self.auth_manager: Any = auth_manager
+        self.config_manager: Any = config_manager
+        self.token: Optional[str] = None
+        self.user_name: Optional[str] = None
+        self.subscription_manager: Optional[SubscriptionManager] = None
+        self.settings_managers: Dict[str, AppSettingsManager] = {}
+        self.sql_managers: Dict[str, SQLFirewallRuleManager] = {}
+        self.key_vault_resolver: KeyVaultResolver = KeyVaultResolver(self.auth_manager.get_scoped_token, self.config_manager)
+        self.lock = threading.RLock()
+        self.auth_manager.add_token_listener(self.set_token)
+
+    # GET TOKEN
+    # Returns the current token and passes refreshed tokens on to every live manager
+    # ///////////////////////////////////////////////////////////////
+    def get_token(self) -> Tuple[str, Optional[str]]:
+        token, user_name = self.auth_manager.get_token()
+        with self.lock:
+            self.user_name = user_name
+        self.set_token(token)
+        return token, user_name
+
+    # SET TOKEN
+    # Called by the authentication manager with every new token, so managers in the middle of a
+    # bulk operation switch to it before the old one expires
+    # ///////////////////////////////////////////////////////////////
+    def set_token(self, token: str) -> None:
+        with self.lock:
+            if token != self.token:
+                self.token = token
+                for manager in self.all_managers():
+                    manager.set_token(token)
+
+    # GET SUBSCRIPTION MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def get_subscription_manager(self) -> SubscriptionManager:
+        token, _ = self.get_token()
+        with self.lock:
+            if self.subscription_manager is None:
+                self.subscription_manager = SubscriptionManager(token, self.config_manager)
+            return self.subscription_manager
+
+    # GET APP SETTINGS MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def get_settings_manager(self, subscription: Dict[str, str]) -> AppSettingsManager:
+        subscription_manager = self.get_subscription_manager()
+        with self.lock:
+            manager = self.settings_managers.get(subscription["subscriptionId"])
+            if manager is None:
+                manager = AppSettingsManager(subscription, self.token, subscription_manager, self.config_manager, self.key_vault_resolver)
+                self.settings_managers[subscription["subscriptionId"]] = manager
+            return manager
+
+    # GET SQL FIREWALL RULE MANAGER
+    # ///////////////////////////////////////////////////////////////
+    def get_sql_manager(self, subscription: Dict[str, str]) -> SQLFirewallRuleManager:
+        subscription_manager = self.get_subscription_manager()
+        with self.lock:
+            manager = self.sql_managers.get(subscription["subscriptionId"])
+            if manager is None:
+                manager = SQLFirewallRuleManager(subscription, self.token, self.user_name, subscription_manager, self.config_manager)
+                self.sql_managers[subscription["subscriptionId"]] = manager
+            return manager
+
+    # REFRESH RESOURCES
+    # Drops every memoised resource list so it is fetched again on next use
+    # ///////////////////////////////////////////////////////////////
+    def refresh_resources(self) -> None:
+        with self.lock:
+            for manager in self.settings_managers.values():
+                manager.cached_web_apps = None
+            for manager in self.sql_managers.values():
+                manager.cached_sql_servers = None
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # ALL MANAGERS
+    # ///////////////////////////////////////////////////////////////
+    def all_managers(self) -> List[Any]:
+        managers: List[Any] = [*self.settings_managers.values(), *self.sql_managers.values()]
+        if self.subscription_manager:
+            managers.append(self.subscription_manager)
+        return managers
@@ -1,7 +1,11 @@
 # IMPORT STANDARD LIBRARY MODULES
 # ///////////////////////////////////////////////////////////////
+import re
+import threading
+import time
 import uuid
-from typing import List, Dict, Optional, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Any, Tuple
 
 # IMPORT UTILITY FUNCTIONS
 # ///////////////////////////////////////////////////////////////
@@ -15,28 +19,49 @@ class SubscriptionManager:
     # ///////////////////////////////////////////////////////////////
     def __init__(self, token: str, config_manager: Any) -> None:
         self.config_manager = config_manager
-        self.base_url: str = "https://management.azure.com"
+        self.base_url: str = self.config_manager.configurations.get("endpoints", {}).get("resource_manager", "https://management.azure.com")
         self.api_version: str = "2020-10-01"
         self.headers: Dict[str, str] = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
-        self.role_eligibilities: Optional[List[Dict[str, Any]]] = self.list_role_eligibilities()
+        self.http_client: HttpClient = get_http_client(self.config_manager.configurations)
+        self.active_roles: Dict[Tuple[str, str], float] = {}
+        self.activations: Dict[Tuple[str, str], Any] = {}
+        self.activation_lock = threading.Lock()
+        self.cached_role_eligibilities: Optional[List[Dict[str, Any]]] = None
+
+    # ROLE ELIGIBILITIES
+    # Lists the role eligibilities on first use and keeps them for the lifetime of the manager
+    # ///////////////////////////////////////////////////////////////
+    @property
+    def role_eligibilities(self) -> Optional[List[Dict[str, Any]]]:
+        if self.cached_role_eligibilities is None:
+            self.cached_role_eligibilities = self.list_role_eligibilities()
+        return self.cached_role_eligibilities
+
+    # SET TOKEN
+    # Updates the bearer token used by this manager after the token has been refreshed
+    # ///////////////////////////////////////////////////////////////
+    def set_token(self, token: str) -> None:
+        self.headers["Authorization"] = f"Bearer {token}"
 
     # LIST ROLE ELIGIBILITIES
     # Retrieves the list of role eligibilities for the current subscription
     # API Reference: https://learn.microsoft.com/en-us/rest/api/authorization/role-eligibility-schedule-instances/get?view=rest-authorization-2020-10-01
     # ///////////////////////////////////////////////////////////////
     def list_role_eligibilities(self) -> Optional[List[Dict[str, Any]]]:
-        url: str = (
-            f"{self.base_url}/providers/Microsoft.Authorization/"
-            f"roleEligibilityScheduleInstances?api-version={self.api_version}&$filter=asTarget()"
-        )
+        return run_async(self.list_role_eligibilities_async())
 
-        response: Optional[Dict[str, Any]] = make_api_request(
-            url=url,
+    # LIST ROLE ELIGIBILITIES (ASYNC)
+    # ///////////////////////////////////////////////////////////////
+    @traced("subscription.list_role_eligibilities")
+    async def list_role_eligibilities_async(self) -> Optional[List[Dict[str, Any]]]:
+        response: Optional[Dict[str, Any]] = await make_api_request_async(
+            url=self.role_eligibilities_url(),
             method="GET",
-            headers=self.headers
+            headers=self.headers,
+            client=self.http_client
         )
 
         if response:
@@ -46,10 +71,196 @@ class SubscriptionManager:
             return None
 
     # CREATE ROLE ASSIGNMENT
-    # Creates a role assignment for the selected subscription
-    # API Reference: https://learn.microsoft.com/en-us/rest/api/authorization/role-assignment-schedule-requests/create?view=rest-authorization-2020-10-01
+    # Makes sure the eligible role is active for the subscription. Roles that are already active
+    # are reused; otherwise a single activation is requested (concurrent callers for the same
+    # subscription and role wait for it) and polled until it is in effect.
     # ///////////////////////////////////////////////////////////////
     def create_role_assignment(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        return run_async(self.create_role_assignment_async(subscription_id, role_definition_id, principal_id))
+
+    # CREATE ROLE ASSIGNMENT (ASYNC)
+    # Every request runs on the shared event loop, so the callers waiting for an activation in
+    # progress are coroutines on the same loop as the one requesting it
+    # ///////////////////////////////////////////////////////////////
+    @traced("subscription.create_role_assignment")
+    async def create_role_assignment_async(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        import asyncio
+
+        key: Tuple[str, str] = (subscription_id.lower(), role_definition_id.lower())
+
+        if self.is_role_active(key):
+            return {"subscriptionId": subscription_id, "roleDefinitionId": role_definition_id, "expiresOn": self.active_roles[key]}
+
+        loop = asyncio.get_running_loop()
+        activation: Optional[Any] = self.activations.get(key)
+        if activation is not None and activation.get_loop() is loop:
+            print("Waiting for the role activation already in progress...")
+            return await asyncio.shield(activation)
+
+        activation = loop.create_future()
+        self.activations[key] = activation
+        result: Optional[Dict[str, Any]] = None
+        try:
+            result = await self.activate_role(subscription_id, role_definition_id, principal_id)
+        except Exception as e:
+            print(f"Error occurred while activating role: {e}")
+        finally:
+            activation.set_result(result)
+            if self.activations.get(key) is activation:
+                del self.activations[key]
+        return result
+
+    # ACTIVATE ROLE
+    # ///////////////////////////////////////////////////////////////
+    async def activate_role(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        instance: Optional[Dict[str, Any]] = await self.get_active_role_assignment(subscription_id, role_definition_id, principal_id)
+        if instance:
+            print("Role is already active for this subscription.")
+            return instance
+
+        if not await self.request_role_assignment(subscription_id, role_definition_id, principal_id):
+            return None
+
+        return await self.wait_for_role_assignment(subscription_id, role_definition_id, principal_id)
+
+    # REQUEST ROLE ASSIGNMENT
+    # Creates a role assignment schedule request for the selected subscription
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/authorization/role-assignment-schedule-requests/create?view=rest-authorization-2020-10-01
+    # ///////////////////////////////////////////////////////////////
+    async def request_role_assignment(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        url, body = self.build_role_assignment_request(subscription_id, role_definition_id, principal_id)
+        response = await make_api_request_async(
+            url=url,
+            method="PUT",
+            headers=self.headers,
+            json_data=body,
+            client=self.http_client
+        )
+        return self.check_role_assignment_request(response)
+
+    # GET ACTIVE ROLE ASSIGNMENT
+    # Looks for an active assignment of the role and records its expiry time
+    # API Reference: https://learn.microsoft.com/en-us/rest/api/authorization/role-assignment-schedule-instances/list-for-scope?view=rest-authorization-2020-10-01
+    # ///////////////////////////////////////////////////////////////
+    async def get_active_role_assignment(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        response: Optional[Dict[str, Any]] = await make_api_request_async(
+            url=self.role_assignments_url(subscription_id),
+            method="GET",
+            headers=self.headers,
+            client=self.http_client
+        )
+        return self.find_active_instance(response, subscription_id, role_definition_id, principal_id)
+
+    # WAIT FOR ROLE ASSIGNMENT
+    # Polls the active assignments with exponential backoff until the activation is in effect
+    # ///////////////////////////////////////////////////////////////
+    async def wait_for_role_assignment(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        import asyncio
+
+        role_options: Dict[str, Any] = self.config_manager.configurations['role_options']
+        timeout: float = float(role_options.get("activation_timeout", 120))
+        delay: float = float(role_options.get("activation_poll_interval", 2))
+        deadline: float = time.time() + timeout
+
+        print("Waiting for the role activation to take effect...")
+        while time.time() < deadline:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.time())))
+            instance = await self.get_active_role_assignment(subscription_id, role_definition_id, principal_id)
+            if instance:
+                print("Role activation is in effect.")
+                return instance
+            delay = min(delay * 2, 15)
+
+        print("Timed out waiting for the role activation to take effect.")
+        return None
+
+    # IS ROLE ACTIVE
+    # Checks the in-process record of activated roles
+    # ///////////////////////////////////////////////////////////////
+    def is_role_active(self, key: Tuple[str, str]) -> bool:
+        with self.activation_lock:
+            expires_on: Optional[float] = self.active_roles.get(key)
+        return expires_on is not None and expires_on > time.time()
+
+    # SELECT SUBSCRIPTION
+    # Prompts the user to select a subscription from the list of eligible roles
+    # ///////////////////////////////////////////////////////////////
+    def select_subscription(self) -> Dict[str, str]:
+        if not self.role_eligibilities:
+            print("No eligible roles found.")
+            raise Exception("No eligible roles found.")
+
+        print("\nPlease select a subscription:")
+        for i, role in enumerate(self.role_eligibilities, start=1):
+            subscription_name = role['properties']['expandedProperties']['scope'].get('displayName', 'Unknown')
+            subscription_id = extract_segment(role['properties']['expandedProperties']['scope'].get('id'), 2)
+            print(f"{i}. {subscription_name} (Subscription ID: {subscription_id})")
+
+        selected_index: int = int(input("Enter the number of your choice: ")) - 1
+        selected_role = self.role_eligibilities[selected_index]
+
+        return self.subscription_from_role(selected_role)
+
+    # SELECT MULTIPLE SUBSCRIPTIONS
+    # Prompts the user to pick several subscriptions (comma separated) or all of them
+    # ///////////////////////////////////////////////////////////////
+    def select_subscriptions(self) -> List[Dict[str, str]]:
+        if not self.role_eligibilities:
+            print("No eligible roles found.")
+            raise Exception("No eligible roles found.")
+
+        print("\nPlease select the subscriptions to include:")
+        for i, role in enumerate(self.role_eligibilities, start=1):
+            subscription = self.subscription_from_role(role)
+            print(f"{i}. {subscription['displayName']} (Subscription ID: {subscription['subscriptionId']})")
+
+        user_input: str = input("Enter numbers separated by commas, or press Enter for all: ").strip().lower()
+        if not user_input or user_input == "all":
+            return self.list_subscriptions()
+
+        selected: List[Dict[str, str]] = []
+        for part in user_input.split(","):
+            part = part.strip()
+            if part.isdigit() and 0 < int(part) <= len(self.role_eligibilities):
+                selected.append(self.subscription_from_role(self.role_eligibilities[int(part) - 1]))
+            else:
+                print(f"Ignoring invalid selection: {part}")
+        return selected
+
+    # LIST SUBSCRIPTIONS
+    # Returns a subscription entry for every role eligibility, skipping duplicate subscriptions
+    # ///////////////////////////////////////////////////////////////
+    def list_subscriptions(self) -> List[Dict[str, str]]:
+        subscriptions: Dict[str, Dict[str, str]] = {}
+        for role in self.role_eligibilities or []:
+            subscription = self.subscription_from_role(role)
+            subscriptions.setdefault(subscription["subscriptionId"], subscription)
+        return list(subscriptions.values())
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # ROLE ELIGIBILITIES URL
+    # ///////////////////////////////////////////////////////////////
+    def role_eligibilities_url(self) -> str:
+        return (
+            f"{self.base_url}/providers/Microsoft.Authorization/"
+            f"roleEligibilityScheduleInstances?api-version={self.api_version}&$filter=asTarget()"
+        )
+
+    # ROLE ASSIGNMENTS URL
+    # ///////////////////////////////////////////////////////////////
+    def role_assignments_url(self, subscription_id: str) -> str:
+        return (
+            f"{self.base_url}/subscriptions/{subscription_id}/"
+            f"providers/Microsoft.Authorization/roleAssignmentScheduleInstances?"
+            f"api-version={self.api_version}&$filter=asTarget()"
+        )
+
+    # BUILD ROLE ASSIGNMENT REQUEST
+    # Returns the URL (with a new request ID) and body of a self-activation request
+    # ///////////////////////////////////////////////////////////////
+    def build_role_assignment_request(self, subscription_id: str, role_definition_id: str, principal_id: str) -> Tuple[str, Dict[str, Any]]:
         url: str = (
             f"{self.base_url}/subscriptions/{subscription_id}/"
             f"providers/Microsoft.Authorization/roleAssignmentScheduleRequests/{uuid.uuid4()}?"
@@ -72,14 +283,11 @@ class SubscriptionManager:
                 "ticketInfo": None
             }
         }
+        return url, body
 
-        response = make_api_request(
-            url=url,
-            method="PUT",
-            headers=self.headers,
-            json_data=body
-        )
-
+    # CHECK ROLE ASSIGNMENT REQUEST
+    # ///////////////////////////////////////////////////////////////
+    def check_role_assignment_request(self, response: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         if response:
             print(f"Role assignment schedule request created successfully.")
             return response
@@ -87,29 +295,60 @@ class SubscriptionManager:
             print("Failed to create role assignment.")
             return None
 
-    # SELECT SUBSCRIPTION
-    # Prompts the user to select a subscription from the list of eligible roles
+    # FIND ACTIVE INSTANCE
+    # Picks the unexpired assignment of the role from a list of schedule instances and records
+    # its expiry time
     # ///////////////////////////////////////////////////////////////
-    def select_subscription(self) -> Dict[str, str]:
-        if not self.role_eligibilities:
-            print("No eligible roles found.")
-            raise Exception("No eligible roles found.")
+    def find_active_instance(self, response: Optional[Dict[str, Any]], subscription_id: str, role_definition_id: str, principal_id: str) -> Optional[Dict[str, Any]]:
+        for instance in (response or {}).get("value", []):
+            properties: Dict[str, Any] = instance.get("properties", {})
+            if (
+                properties.get("roleDefinitionId", "").lower() == role_definition_id.lower()
+                and properties.get("principalId", "").lower() == (principal_id or "").lower()
+                and properties.get("status", "Provisioned") in ("Provisioned", "Accepted")
+            ):
+                expires_on: float = self.parse_end_date_time(properties.get("endDateTime"))
+                if expires_on <= time.time():
+                    continue
+                with self.activation_lock:
+                    self.active_roles[(subscription_id.lower(), role_definition_id.lower())] = expires_on
+                return instance
 
-        print("\nPlease select a subscription:")
-        for i, role in enumerate(self.role_eligibilities, start=1):
-            subscription_name = role['properties']['expandedProperties']['scope'].get('displayName', 'Unknown')
-            subscription_id = extract_segment(role['properties']['expandedProperties']['scope'].get('id'), 2)
-            print(f"{i}. {subscription_name} (Subscription ID: {subscription_id})")
+        return None
 
-        selected_index: int = int(input("Enter the number of your choice: ")) - 1
-        selected_role = self.role_eligibilities[selected_index]
+    # SUBSCRIPTION FROM ROLE
+    # Builds the subscription details used by the managers from a role eligibility
+    # ///////////////////////////////////////////////////////////////
+    def subscription_from_role(self, role: Dict[str, Any]) -> Dict[str, str]:
+        expanded_properties: Dict[str, Any] = role['properties']['expandedProperties']
+        return {
+            "subscriptionId": extract_segment(expanded_properties['scope'].get('id'), 2),
+            "displayName": expanded_properties['scope'].get('displayName', 'Unknown'),
+            "principalId": expanded_properties['principal'].get('id'),
+            "roleDefinitionId": expanded_properties['roleDefinition'].get('id')
+        }
+
+    # PARSE END DATE TIME
+    # Converts an ISO 8601 timestamp to epoch seconds. Assignments without an end date are
+    # treated as expiring after the configured role assignment duration.
+    # ///////////////////////////////////////////////////////////////
+    def parse_end_date_time(self, value: Optional[str]) -> float:
+        if value:
+            match = re.match(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:\d{2})?$", value)
+            if match:
+                fraction: str = (match.group(2) or ".0")[:7].ljust(7, "0")
+                offset: str = match.group(3) or "Z"
+                parsed = datetime.fromisoformat(match.group(1) + fraction + ("+00:00" if offset == "Z" else offset))
+                return parsed.astimezone(timezone.utc).timestamp()
 
-        selected_subscription_id = extract_segment(selected_role['properties']['expandedProperties']['scope'].get('id'), 2)
-        principal_id = selected_role['properties']['expandedProperties']['principal'].get('id')
-        role_definition_id = selected_role['properties']['expandedProperties']['roleDefinition'].get('id')
+        return time.time() + self.parse_duration(self.config_manager.configurations['role_options']['role_assignment_duration'])
 
-        return {
-            "subscriptionId": selected_subscription_id,
-            "principalId": principal_id,
-            "roleDefinitionId": role_definition_id
-        }
\ No newline at end of file
+    # PARSE DURATION
+    # Converts an ISO 8601 duration such as PT30M or P1D to seconds
+    # ///////////////////////////////////////////////////////////////
+    def parse_duration(self, duration: str) -> float:
+        match = re.match(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$", duration or "")
+        if not match:
+            return 0.0
+        days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return float(days * 86400 + hours * 3600 + minutes * 60 + seconds)
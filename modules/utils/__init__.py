@@ -1,8 +1,57 @@
 from .utils import *
+from .http_client import HttpClient, get_http_client
+from .event_loop import run_async, iterate_async
+from .pagination import ListingIncompleteError, iterate_pages, iterate_pages_async, iterate_items, iterate_items_async, list_all_items, list_all_items_async
+from .cache import InventoryCache, get_inventory_cache
+from .retry import RetryPolicy, RateLimitTracker
+from .resource_graph import query_resource_graph, query_resource_graph_async
+from .search import SearchIndex
+from .ip_ranges import parse_ip_range, merge_ip_ranges
+from .public_ip import PublicIPResolver, get_public_ip_resolver
+from .writers import OutputWriter, RecordStream, get_output_writer
+from .snapshots import SnapshotStore, get_snapshot_store
+from .instrumentation import Instrumentation, get_instrumentation, traced, in_current_span
+from .arm_batch import ARMBatchClient
+from .resources import ResourceRecord, project_resources
 
 __all__ = [
     "extract_segment",
     "save_to_json",
     "make_api_request",
-    "search_and_select_from_list"
+    "make_api_request_async",
+    "search_and_select_from_list",
+    "HttpClient",
+    "get_http_client",
+    "run_async",
+    "iterate_async",
+    "ListingIncompleteError",
+    "iterate_pages",
+    "iterate_pages_async",
+    "iterate_items",
+    "iterate_items_async",
+    "list_all_items",
+    "list_all_items_async",
+    "InventoryCache",
+    "get_inventory_cache",
+    "RetryPolicy",
+    "RateLimitTracker",
+    "query_resource_graph",
+    "query_resource_graph_async",
+    "SearchIndex",
+    "parse_ip_range",
+    "merge_ip_ranges",
+    "PublicIPResolver",
+    "get_public_ip_resolver",
+    "OutputWriter",
+    "RecordStream",
+    "get_output_writer",
+    "SnapshotStore",
+    "get_snapshot_store",
+    "Instrumentation",
+    "get_instrumentation",
+    "traced",
+    "in_current_span",
+    "ARMBatchClient",
+    "ResourceRecord",
+    "project_resources"
 ]
\ No newline at end of file
@@ -0,0 +1,202 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from urllib.parse import urlparse
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .event_loop import run_async
+from .http_client import HttpClient, get_http_client
+from .instrumentation import traced
+from .utils import make_api_request_async
+
+# DEFAULT ARM BATCH OPTIONS
+# Used when config.json does not provide an "arm_batch_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_ARM_BATCH_OPTIONS: Dict[str, Any] = {
+    "enabled": True,
+    "max_batch_size": 20,
+    "min_batch_size": 2,
+    "api_version": "2020-06-01",
+    "poll_timeout": 60
+}
+
+# ARM accepts at most 20 requests in one batch
+MAX_ARM_BATCH_SIZE: int = 20
+
+# ARM BATCH CLIENT CLASS
+# Sends many ARM requests as a few POST /batch calls. Responses are handed back in the order the
+# requests were given, and any request that failed inside a batch (or a batch that failed as a
+# whole) is sent again on its own through make_api_request_async, so throttling and 403 role
+# activation behave exactly as they do for single requests.
+# ///////////////////////////////////////////////////////////////
+class ARMBatchClient:
+
+    # INITIALISE ARM BATCH CLIENT
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, base_url: str, configurations: Optional[Dict[str, Any]] = None, client: Optional[HttpClient] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_ARM_BATCH_OPTIONS, **(configurations or {}).get("arm_batch_options", {})}
+        self.enabled: bool = bool(self.options["enabled"])
+        self.max_batch_size: int = max(1, min(int(self.options["max_batch_size"]), MAX_ARM_BATCH_SIZE))
+        self.base_url: str = base_url.rstrip("/")
+        self.url: str = f"{self.base_url}/batch?api-version={self.options['api_version']}"
+        self.client: HttpClient = client or get_http_client(configurations)
+
+    # SEND REQUESTS
+    # Each request is a dictionary with "method", "url" and optionally "json_data". Returns one
+    # result per request, with the same meaning as make_api_request's return value. Fewer requests
+    # than min_batch_size, or batching turned off, sends them one at a time.
+    # ///////////////////////////////////////////////////////////////
+    def send(
+        self,
+        requests: List[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+        create_role_assignment: Optional[Callable] = None,
+        subscription: Optional[Dict[str, str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        return run_async(self.send_async(requests, headers, create_role_assignment, subscription))
+
+    # SEND REQUESTS (ASYNC)
+    # The batches of one call are sent one after another; callers run several send_async calls at
+    # once for more concurrency
+    # ///////////////////////////////////////////////////////////////
+    async def send_async(
+        self,
+        requests: List[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+        create_role_assignment: Optional[Callable] = None,
+        subscription: Optional[Dict[str, str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        if not self.enabled or len(requests) < int(self.options["min_batch_size"]):
+            return [await self.send_single(request, headers, create_role_assignment, subscription) for request in requests]
+
+        results: List[Optional[Dict[str, Any]]] = []
+        for start in range(0, len(requests), self.max_batch_size):
+            results.extend(await self.send_batch(requests[start:start + self.max_batch_size], headers, create_role_assignment, subscription))
+        return results
+
+    # SEND BATCH
+    # Sends up to max_batch_size requests in one call and splits the responses back out by name
+    # ///////////////////////////////////////////////////////////////
+    @traced("arm.batch")
+    async def send_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+        create_role_assignment: Optional[Callable] = None,
+        subscription: Optional[Dict[str, str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        body: Dict[str, Any] = {"requests": [self.build_batch_item(str(index), request) for index, request in enumerate(requests)]}
+        response_headers: Dict[str, str] = {}
+        response: Optional[Dict[str, Any]] = await make_api_request_async(
+            url=self.url,
+            method="POST",
+            headers=headers,
+            json_data=body,
+            client=self.client,
+            response_headers=response_headers
+        )
+
+        # A batch that is still running answers 202 with a Location to poll for the responses
+        if response == {} and get_header(response_headers, "Location"):
+            response = await self.poll_batch(get_header(response_headers, "Location"), headers, response_headers)
+
+        results, failed = self.split_responses(requests, response)
+        for index in failed:
+            results[index] = await self.send_single(requests[index], headers, create_role_assignment, subscription)
+        return results
+
+    # POLL BATCH
+    # Follows the Location of an accepted batch until its responses are ready or poll_timeout passes
+    # ///////////////////////////////////////////////////////////////
+    async def poll_batch(self, location: str, headers: Optional[Dict[str, str]], response_headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        import asyncio
+
+        deadline: float = time.monotonic() + float(self.options["poll_timeout"])
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.client.retry_policy.parse_retry_after(response_headers) or 1.0)
+            response_headers = {}
+            response: Optional[Dict[str, Any]] = await make_api_request_async(
+                url=location,
+                method="GET",
+                headers=headers,
+                client=self.client,
+                response_headers=response_headers
+            )
+            if response is None or "responses" in response:
+                return response
+            location = get_header(response_headers, "Location") or location
+
+        print("Timed out waiting for the batch responses.")
+        return None
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # SEND SINGLE REQUEST
+    # ///////////////////////////////////////////////////////////////
+    async def send_single(
+        self,
+        request: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+        create_role_assignment: Optional[Callable],
+        subscription: Optional[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=request["url"],
+            method=request.get("method", "GET"),
+            headers=headers,
+            json_data=request.get("json_data"),
+            create_role_assignment=create_role_assignment,
+            subscription=subscription,
+            client=self.client
+        )
+
+    # SPLIT RESPONSES
+    # Matches the batch responses to the requests by name. Returns one result per request and the
+    # positions of the requests that failed (every position when the batch itself failed).
+    # ///////////////////////////////////////////////////////////////
+    def split_responses(self, requests: List[Dict[str, Any]], response: Optional[Dict[str, Any]]) -> Tuple[List[Optional[Dict[str, Any]]], List[int]]:
+        responses: Dict[str, Dict[str, Any]] = {item.get("name"): item for item in (response or {}).get("responses", [])}
+        results: List[Optional[Dict[str, Any]]] = []
+        failed: List[int] = []
+
+        for index in range(len(requests)):
+            item: Dict[str, Any] = responses.get(str(index), {})
+            status: Optional[int] = item.get("httpStatusCode")
+            if status in (200, 201):
+                results.append(item.get("content") or {})
+            elif status in (202, 204, 304):
+                results.append({})
+            else:
+                results.append(None)
+                failed.append(index)
+
+        if failed and response is None:
+            print(f"Batch request failed. Sending its {len(requests)} requests one at a time...")
+        elif failed:
+            print(f"{len(failed)} of {len(requests)} batched requests failed. Retrying them one at a time...")
+        return results, failed
+
+    # BUILD BATCH ITEM
+    # Batch items use URLs relative to the Resource Manager endpoint
+    # ///////////////////////////////////////////////////////////////
+    def build_batch_item(self, name: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        url: str = request["url"]
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        else:
+            parsed = urlparse(url)
+            url = f"{parsed.path}?{parsed.query}" if parsed.query else parsed.path
+
+        item: Dict[str, Any] = {"httpMethod": request.get("method", "GET"), "name": name, "url": url}
+        if request.get("json_data") is not None:
+            item["content"] = request["json_data"]
+        return item
+
+# GET HEADER
+# Case-insensitive lookup in a plain dictionary of response headers
+# ///////////////////////////////////////////////////////////////
+def get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    return next((value for key, value in headers.items() if key.lower() == name.lower()), None)
@@ -0,0 +1,241 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from typing import Dict, Any, List, Optional, Callable, Tuple, Awaitable
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .resources import ResourceRecord
+
+# DEFAULT CACHE OPTIONS
+# Used when config.json does not provide a "cache_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_CACHE_OPTIONS: Dict[str, Any] = {
+    "enabled": True,
+    "cache_dir": ".cache",
+    "ttl_seconds": 900,
+    "background_refresh": True
+}
+
+# A fetch function is a coroutine function that receives the cached ETag (or None) and returns the
+# items (None on failure, including when any page failed), the new ETag and whether the server
+# reported the list as not modified
+FetchFunction = Callable[[Optional[str]], Awaitable[Tuple[Optional[List[Dict[str, Any]]], Optional[str], bool]]]
+
+# INVENTORY CACHE CLASS
+# Stores resource listings per subscription and resource type in a JSON index on disk
+# ///////////////////////////////////////////////////////////////
+class InventoryCache:
+
+    # INITIALISE INVENTORY CACHE
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, cache_options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_CACHE_OPTIONS, **(cache_options or {})}
+        self.enabled: bool = bool(self.options["enabled"])
+        self.ttl_seconds: float = float(self.options["ttl_seconds"])
+        self.background_refresh: bool = bool(self.options["background_refresh"])
+        self.index_path: str = os.path.join(self.options["cache_dir"], "inventory.json")
+        self.lock = threading.RLock()
+        self.refreshing: Dict[str, Any] = {}
+        self.refresh_listeners: List[Any] = []
+        self.entries: Dict[str, Dict[str, Any]] = self.load_index()
+
+    # GET OR FETCH (ASYNC)
+    # Returns fresh entries straight from the cache. Stale entries are returned immediately
+    # while a task on the event loop re-fetches them (or fetched before returning if background
+    # refresh is disabled). Missing entries are always fetched before returning.
+    # max_items is the limit the fetch function stops listing at: a list that reaches it may be
+    # missing resources, so it is returned but never cached.
+    # ///////////////////////////////////////////////////////////////
+    async def get_or_fetch_async(
+        self,
+        subscription_id: str,
+        resource_type: str,
+        fetch: FetchFunction,
+        max_items: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            items, _, _ = await fetch(None)
+            return items
+
+        key: str = self.make_key(subscription_id, resource_type)
+        with self.lock:
+            entry: Optional[Dict[str, Any]] = self.entries.get(key)
+
+        if entry is None:
+            return await self.refresh_async(key, fetch, max_items)
+
+        if time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return entry["items"]
+
+        if self.background_refresh:
+            self.refresh_in_background_async(key, fetch, max_items)
+            return entry["items"]
+
+        return await self.refresh_async(key, fetch, max_items)
+
+    # REFRESH ENTRY (ASYNC)
+    # Re-fetches an entry, sending the cached ETag so unchanged lists are not downloaded again.
+    # A failed fetch leaves the cached entry as it was. The index is written on a worker thread.
+    # ///////////////////////////////////////////////////////////////
+    async def refresh_async(self, key: str, fetch: FetchFunction, max_items: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        import asyncio
+
+        with self.lock:
+            entry: Optional[Dict[str, Any]] = self.entries.get(key)
+
+        items, etag, not_modified = await fetch(entry.get("etag") if entry else None)
+        complete: bool = items is not None and (max_items is None or len(items) < max_items)
+        return await asyncio.get_running_loop().run_in_executor(None, self.store, key, entry, items, etag, not_modified, complete)
+
+    # REFRESH ENTRY IN BACKGROUND (ASYNC)
+    # Starts one refresh task per key; calls made while a refresh is running are ignored
+    # ///////////////////////////////////////////////////////////////
+    def refresh_in_background_async(self, key: str, fetch: FetchFunction, max_items: Optional[int] = None) -> None:
+        import asyncio
+
+        with self.lock:
+            if key in self.refreshing:
+                return
+
+            def finished(task: Any) -> None:
+                with self.lock:
+                    self.refreshing.pop(key, None)
+                if not task.cancelled() and task.exception():
+                    print(f"Background refresh of {key} failed: {task.exception()}")
+
+            task = asyncio.get_running_loop().create_task(self.refresh_async(key, fetch, max_items))
+            task.add_done_callback(finished)
+            self.refreshing[key] = task
+
+    # STORE ENTRY
+    # Saves a complete fetched list, or marks the cached one fresh when the server reported it
+    # unchanged. A failed fetch keeps the previous entry and an incomplete list is not saved.
+    # Returns the items to use.
+    # ///////////////////////////////////////////////////////////////
+    def store(
+        self,
+        key: str,
+        entry: Optional[Dict[str, Any]],
+        items: Optional[List[Dict[str, Any]]],
+        etag: Optional[str],
+        not_modified: bool,
+        complete: bool = True
+    ) -> Optional[List[Dict[str, Any]]]:
+        with self.lock:
+            if not_modified and entry is not None:
+                entry["fetched_at"] = time.time()
+                self.save_index()
+                return entry["items"]
+            if items is None:
+                return entry["items"] if entry else None
+            if not complete:
+                return items
+            self.entries[key] = {"fetched_at": time.time(), "etag": etag, "items": items}
+            self.save_index()
+        self.notify_refreshed(key)
+        return items
+
+    # ADD REFRESH LISTENER
+    # The listener (a bound method) is called with the key of every entry replaced by a new list,
+    # including by a background refresh, so objects keeping their own copy of the list can drop
+    # it. Only a weak reference is kept, so listening does not keep the object alive.
+    # ///////////////////////////////////////////////////////////////
+    def add_refresh_listener(self, listener: Callable[[str], None]) -> None:
+        with self.lock:
+            self.refresh_listeners.append(weakref.WeakMethod(listener))
+
+    # INVALIDATE ENTRIES
+    # Removes cached entries, optionally limited to a subscription and/or resource type
+    # ///////////////////////////////////////////////////////////////
+    def invalidate(self, subscription_id: Optional[str] = None, resource_type: Optional[str] = None) -> int:
+        with self.lock:
+            keys: List[str] = [
+                key for key in self.entries
+                if (subscription_id is None or key.split("|", 1)[0] == subscription_id.lower())
+                and (resource_type is None or key.split("|", 1)[1] == resource_type.lower())
+            ]
+            for key in keys:
+                del self.entries[key]
+            self.save_index()
+        return len(keys)
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # NOTIFY REFRESH LISTENERS
+    # ///////////////////////////////////////////////////////////////
+    def notify_refreshed(self, key: str) -> None:
+        with self.lock:
+            listeners = [reference() for reference in self.refresh_listeners]
+            self.refresh_listeners = [reference for reference, listener in zip(self.refresh_listeners, listeners) if listener is not None]
+        for listener in listeners:
+            if listener is not None:
+                listener(key)
+
+    # MAKE CACHE KEY
+    # ///////////////////////////////////////////////////////////////
+    def make_key(self, subscription_id: str, resource_type: str) -> str:
+        return f"{subscription_id.lower()}|{resource_type.lower()}"
+
+    # LOAD INDEX FROM DISK
+    # Cached resources are read back as ResourceRecords, as they are when listed from Azure
+    # ///////////////////////////////////////////////////////////////
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.enabled or not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as file:
+                entries: Dict[str, Dict[str, Any]] = json.load(file)
+            for entry in entries.values():
+                entry["items"] = [ResourceRecord.from_item(item) for item in entry.get("items") or []]
+            return entries
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Ignoring unreadable cache index {self.index_path}: {e}")
+            return {}
+
+    # SAVE INDEX TO DISK
+    # Writes to a temporary file first so a crash never leaves a truncated index behind. The
+    # temporary file is removed if anything goes wrong before it replaces the index.
+    # ///////////////////////////////////////////////////////////////
+    def save_index(self) -> None:
+        if not self.enabled:
+            return
+        temp_path: Optional[str] = None
+        try:
+            directory: str = os.path.dirname(self.index_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(self.entries, file, default=dict)
+            os.replace(temp_path, self.index_path)
+            temp_path = None
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Failed to save cache index: {e}")
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+# SHARED CACHE
+# ///////////////////////////////////////////////////////////////
+_shared_cache: Optional[InventoryCache] = None
+_shared_cache_lock = threading.Lock()
+
+# GET SHARED INVENTORY CACHE
+# Returns the process-wide cache, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_inventory_cache(configurations: Optional[Dict[str, Any]] = None) -> InventoryCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = InventoryCache((configurations or {}).get("cache_options", {}))
+    return _shared_cache
@@ -0,0 +1,96 @@
+# IMPORT STANDARD LIBRARY MODULES
+# asyncio is imported where it is used: it is slow to import and only needed once a request is sent
+# ///////////////////////////////////////////////////////////////
+import atexit
+import contextvars
+import threading
+from typing import Any, Optional, Awaitable, AsyncIterator, Iterator
+
+# SHARED EVENT LOOP
+# Every request runs as a coroutine on one event loop, kept running on a daemon thread for the
+# lifetime of the process. Synchronous callers on any thread hand their coroutine to it with
+# run_async, so they all share the HTTP client's connection pool and every role activation
+# is requested once.
+# ///////////////////////////////////////////////////////////////
+_shared_loop: Optional[Any] = None
+_shared_loop_thread: Optional[threading.Thread] = None
+_shared_loop_lock = threading.Lock()
+
+# GET SHARED EVENT LOOP
+# Starts the loop thread on first use
+# ///////////////////////////////////////////////////////////////
+def get_event_loop() -> Any:
+    global _shared_loop, _shared_loop_thread
+    if _shared_loop is None:
+        with _shared_loop_lock:
+            if _shared_loop is None:
+                import asyncio
+
+                loop = asyncio.new_event_loop()
+                _shared_loop_thread = threading.Thread(target=loop.run_forever, name="event-loop", daemon=True)
+                _shared_loop_thread.start()
+                _shared_loop = loop
+                atexit.register(stop_event_loop)
+    return _shared_loop
+
+# RUN ASYNC
+# Runs a coroutine on the shared loop and blocks the calling thread until it finishes, returning
+# its result or raising its exception. The caller's context variables (such as the current
+# instrumentation span) are carried over. Coroutines already on a loop must await instead.
+# ///////////////////////////////////////////////////////////////
+def run_async(coroutine: Awaitable[Any]) -> Any:
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coroutine.close()
+        raise RuntimeError("run_async cannot be called from a running event loop; await the coroutine instead.")
+
+    context: contextvars.Context = contextvars.copy_context()
+
+    async def run() -> Any:
+        for variable, value in context.items():
+            variable.set(value)
+        return await coroutine
+
+    future = asyncio.run_coroutine_threadsafe(run(), get_event_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # Ctrl+C (or any other interruption) stops the coroutine as well
+        future.cancel()
+        raise
+
+# ITERATE ASYNC
+# Turns an async iterator into a blocking one, reading each item through run_async
+# ///////////////////////////////////////////////////////////////
+def iterate_async(iterator: AsyncIterator[Any]) -> Iterator[Any]:
+    try:
+        while True:
+            try:
+                yield run_async(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        if hasattr(iterator, "aclose"):
+            run_async(iterator.aclose())
+
+# STOP SHARED EVENT LOOP
+# Closes the shared HTTP session and stops the loop when the process exits
+# ///////////////////////////////////////////////////////////////
+def stop_event_loop() -> None:
+    import asyncio
+    from . import http_client
+
+    loop = _shared_loop
+    if loop is None or not loop.is_running():
+        return
+    if http_client._shared_client is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(http_client._shared_client.close(), loop).result(timeout=5)
+        except Exception:
+            pass
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,135 @@
+# IMPORT STANDARD LIBRARY MODULES
+# aiohttp is imported where the session is created: it is slow to import and many runs (or the
+# first prompt) never send a request
+# ///////////////////////////////////////////////////////////////
+import json
+import threading
+import weakref
+from typing import Dict, Any, Optional, Mapping
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .instrumentation import get_instrumentation
+from .retry import RetryPolicy, RateLimitTracker
+
+# DEFAULT HTTP OPTIONS
+# Used when config.json does not provide an "http_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_HTTP_OPTIONS: Dict[str, Any] = {
+    "pool_maxsize": 32,
+    "connection_limit": 100,
+    "connect_timeout": 5,
+    "read_timeout": 60,
+    "keep_alive": True,
+    "compression": True
+}
+
+# HTTP RESPONSE CLASS
+# The parts of a response the request loop reads, kept after the connection is released
+# ///////////////////////////////////////////////////////////////
+class HttpResponse:
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes) -> None:
+        self.status_code: int = status_code
+        self.headers: Mapping[str, str] = headers
+        self.content: bytes = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+# HTTP CLIENT CLASS
+# One aiohttp session with a shared connection pool per event loop. Every request in the process
+# runs on the shared loop (see run_async), so they all share one pool, retry policy and rate
+# limit budget.
+# ///////////////////////////////////////////////////////////////
+class HttpClient:
+
+    # INITIALISE HTTP CLIENT
+    # Sets up the retry policy and rate limit tracker shared by every request sent through this
+    # client. The session is created on the first request, inside the running event loop.
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, http_options: Optional[Dict[str, Any]] = None, retry_options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_HTTP_OPTIONS, **(http_options or {})}
+        self.retry_policy: RetryPolicy = RetryPolicy(retry_options)
+        self.rate_limits: RateLimitTracker = RateLimitTracker(retry_options)
+        self.sessions: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+    # GET SESSION
+    # A session belongs to the event loop it was created on, so a coroutine awaited on another
+    # loop (for example inside asyncio.run) gets a session of its own
+    # ///////////////////////////////////////////////////////////////
+    def get_session(self) -> Any:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        session = self.sessions.get(loop)
+        if session is None or session.closed:
+            session = self.create_session()
+            self.sessions[loop] = session
+        return session
+
+    # CREATE SESSION
+    # Sets the connection limits, timeouts and default headers
+    # ///////////////////////////////////////////////////////////////
+    def create_session(self) -> Any:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=int(self.options["connection_limit"]),
+            limit_per_host=int(self.options["pool_maxsize"]),
+            force_close=not self.options["keep_alive"]
+        )
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=float(self.options["connect_timeout"]),
+            sock_read=float(self.options["read_timeout"])
+        )
+        headers: Dict[str, str] = {"Accept-Encoding": "gzip, deflate"} if self.options["compression"] else {}
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
+    # SEND REQUEST
+    # Reads the whole body before the connection goes back to the pool
+    # ///////////////////////////////////////////////////////////////
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> HttpResponse:
+        async with self.get_session().request(method, url, headers=headers, json=json_data) as response:
+            content: bytes = await response.read()
+            return HttpResponse(response.status, response.headers, content)
+
+    # CLOSE SESSION
+    # Closes the session of the running event loop
+    # ///////////////////////////////////////////////////////////////
+    async def close(self) -> None:
+        import asyncio
+
+        session = self.sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+# SHARED CLIENT
+# ///////////////////////////////////////////////////////////////
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+# GET SHARED HTTP CLIENT
+# Returns the process-wide client, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_http_client(configurations: Optional[Dict[str, Any]] = None) -> HttpClient:
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                http_options = (configurations or {}).get("http_options", {})
+                retry_options = (configurations or {}).get("retry_options", {})
+                _shared_client = HttpClient(http_options, retry_options)
+                # Requests are recorded by the shared instrumentation, so set it up from the same configuration
+                get_instrumentation(configurations)
+    return _shared_client
@@ -0,0 +1,454 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Iterator, Mapping, Tuple
+from urllib.parse import urlparse
+
+# DEFAULT INSTRUMENTATION OPTIONS
+# Used when config.json does not provide an "instrumentation_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_INSTRUMENTATION_OPTIONS: Dict[str, Any] = {
+    "enabled": False,
+    "print_summary": True,
+    "exporter": None,
+    "export_path": "results/trace.jsonl",
+    "service_name": "azure-management-tool"
+}
+
+EXPORTERS: List[str] = ["jsonl", "otel"]
+
+# Code flag of "async def" functions; checked directly because inspect is slow to import
+CO_COROUTINE: int = 0x80
+
+# Path segments that follow these names are resource names and are replaced with {name}
+NAMED_SEGMENTS: Tuple[str, ...] = (
+    "subscriptions", "resourcegroups", "sites", "slots", "servers", "firewallrules", "databases",
+    "vaults", "secrets", "roleassignmentschedulerequests", "roleassignments", "deployments"
+)
+ID_PATTERN = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{32}|\d+)$", re.IGNORECASE)
+
+RATE_LIMIT_HEADERS: Tuple[str, ...] = ("x-ms-ratelimit-remaining-subscription-reads", "x-ms-ratelimit-remaining-subscription-writes")
+
+# The span the current thread (or task) is running under
+current_span: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("current_span", default=None)
+
+# INSTRUMENTATION FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+
+# GET ENDPOINT TEMPLATE
+# Turns a request URL into a template that groups requests to the same endpoint, e.g.
+# /subscriptions/{subscriptionId}/resourceGroups/{name}/providers/Microsoft.Web/sites/{name}/config/appsettings/list
+# ///////////////////////////////////////////////////////////////
+def get_endpoint_template(url: str) -> str:
+    segments: List[str] = [segment for segment in urlparse(url).path.split("/") if segment]
+    template: List[str] = []
+    for index, segment in enumerate(segments):
+        previous: str = segments[index - 1].lower() if index else ""
+        if previous == "subscriptions":
+            template.append("{subscriptionId}")
+        elif previous in NAMED_SEGMENTS or ID_PATTERN.match(segment):
+            template.append("{name}")
+        else:
+            template.append(segment)
+    return "/" + "/".join(template)
+
+# IN CURRENT SPAN
+# Wraps a function so it runs under the caller's span when it is called from another thread,
+# e.g. when it is submitted to a thread pool
+# ///////////////////////////////////////////////////////////////
+def in_current_span(function: Callable) -> Callable:
+    parent: Optional[Dict[str, Any]] = current_span.get()
+
+    @functools.wraps(function)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        token = current_span.set(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            current_span.reset(token)
+
+    return run
+
+# TRACED
+# Decorator that runs a method under a span named after the operation, so every request it
+# makes is grouped under it. Costs one attribute check when instrumentation is disabled.
+# Coroutine functions are wrapped in a coroutine, so the span lasts until they finish.
+# ///////////////////////////////////////////////////////////////
+def traced(name: str) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        if function.__code__.co_flags & CO_COROUTINE:
+            @functools.wraps(function)
+            async def run_async(*args: Any, **kwargs: Any) -> Any:
+                instrumentation = get_instrumentation()
+                if not instrumentation.enabled:
+                    return await function(*args, **kwargs)
+                with instrumentation.span(name):
+                    return await function(*args, **kwargs)
+            return run_async
+
+        @functools.wraps(function)
+        def run(*args: Any, **kwargs: Any) -> Any:
+            instrumentation = get_instrumentation()
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            with instrumentation.span(name):
+                return function(*args, **kwargs)
+        return run
+    return decorator
+
+# INSTRUMENTATION CLASS
+# Collects a record for every request sent by make_api_request and every span opened around a
+# higher-level operation. Records are passed to the registered hooks and the configured exporter,
+# and request latencies are kept per endpoint for the end-of-run summary.
+# ///////////////////////////////////////////////////////////////
+class Instrumentation:
+
+    # INITIALISE INSTRUMENTATION
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, instrumentation_options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_INSTRUMENTATION_OPTIONS, **(instrumentation_options or {})}
+        self.enabled: bool = bool(self.options["enabled"])
+        self.start_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.end_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.endpoint_stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.exporter: Optional[Any] = self.create_exporter()
+        self.closed: bool = False
+
+    # ADD HOOK
+    # on_start receives the request record before it is sent; on_end receives the completed
+    # request and span records. Adding a hook turns instrumentation on.
+    # ///////////////////////////////////////////////////////////////
+    def add_hook(
+        self,
+        on_start: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_end: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        if on_start:
+            self.start_hooks.append(on_start)
+        if on_end:
+            self.end_hooks.append(on_end)
+        self.enabled = True
+
+    # START REQUEST
+    # ///////////////////////////////////////////////////////////////
+    def start_request(self, method: str, url: str) -> Dict[str, Any]:
+        parent: Optional[Dict[str, Any]] = current_span.get()
+        record: Dict[str, Any] = {
+            "type": "request",
+            "traceId": parent["traceId"] if parent else os.urandom(16).hex(),
+            "spanId": os.urandom(8).hex(),
+            "parentSpanId": parent["spanId"] if parent else None,
+            "operation": parent["name"] if parent else None,
+            "method": method,
+            "host": urlparse(url).netloc,
+            "endpoint": get_endpoint_template(url),
+            "startedAt": time.time(),
+            "started": time.perf_counter()
+        }
+        self.call_hooks(self.start_hooks, record)
+        return record
+
+    # END REQUEST
+    # outcome is filled in by make_api_request: the last status code, attempts, 429s seen,
+    # response size and headers, and any error
+    # ///////////////////////////////////////////////////////////////
+    def end_request(self, record: Dict[str, Any], outcome: Dict[str, Any]) -> None:
+        headers: Mapping[str, str] = outcome.get("headers") or {}
+        attempts: int = outcome.get("attempts", 1)
+        record.update({
+            "status": outcome.get("status"),
+            "latencyMs": round((time.perf_counter() - record.pop("started")) * 1000, 3),
+            "attempts": attempts,
+            "retries": max(0, attempts - 1),
+            "throttled": outcome.get("throttled", 0),
+            "bytes": outcome.get("bytes", 0),
+            "rateLimitRemaining": next((headers.get(name) for name in RATE_LIMIT_HEADERS if headers.get(name) is not None), None),
+            "retryAfter": headers.get("Retry-After"),
+            "error": outcome.get("error")
+        })
+
+        with self.lock:
+            stats = self.endpoint_stats.setdefault((record["method"], record["endpoint"]), {
+                "latencies": [], "errors": 0, "retries": 0, "throttled": 0, "bytes": 0
+            })
+            stats["latencies"].append(record["latencyMs"])
+            stats["retries"] += record["retries"]
+            stats["throttled"] += record["throttled"]
+            stats["bytes"] += record["bytes"]
+            if record["error"] or not record["status"] or record["status"] >= 400:
+                stats["errors"] += 1
+
+        self.finish(record)
+
+    # SPAN
+    # Groups the requests made inside the block under one named operation
+    # ///////////////////////////////////////////////////////////////
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        parent: Optional[Dict[str, Any]] = current_span.get()
+        span: Dict[str, Any] = {
+            "type": "span",
+            "name": name,
+            "traceId": parent["traceId"] if parent else os.urandom(16).hex(),
+            "spanId": os.urandom(8).hex(),
+            "parentSpanId": parent["spanId"] if parent else None,
+            "startedAt": time.time(),
+            "attributes": attributes,
+            "status": "ok"
+        }
+        started: float = time.perf_counter()
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span["status"] = "error"
+            span["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            span["durationMs"] = round((time.perf_counter() - started) * 1000, 3)
+            self.finish(span)
+
+    # SUMMARY
+    # Returns one row per endpoint, slowest total time first
+    # ///////////////////////////////////////////////////////////////
+    def summary(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            items = [(key, dict(stats, latencies=sorted(stats["latencies"]))) for key, stats in self.endpoint_stats.items()]
+
+        rows: List[Dict[str, Any]] = []
+        for (method, endpoint), stats in items:
+            latencies: List[float] = stats["latencies"]
+            rows.append({
+                "method": method,
+                "endpoint": endpoint,
+                "count": len(latencies),
+                "errors": stats["errors"],
+                "retries": stats["retries"],
+                "throttled": stats["throttled"],
+                "bytes": stats["bytes"],
+                "totalMs": round(sum(latencies), 3),
+                "p50Ms": latencies[int(round(0.50 * (len(latencies) - 1)))],
+                "p95Ms": latencies[int(round(0.95 * (len(latencies) - 1)))],
+                "maxMs": latencies[-1]
+            })
+        return sorted(rows, key=lambda row: row["totalMs"], reverse=True)
+
+    # PRINT SUMMARY
+    # ///////////////////////////////////////////////////////////////
+    def print_summary(self) -> None:
+        rows: List[Dict[str, Any]] = self.summary()
+        if not rows:
+            return
+
+        print("\nRequest summary:")
+        print(f"{'count':>6} {'err':>4} {'retry':>5} {'429':>4} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'KB':>8}  endpoint")
+        for row in rows:
+            print(
+                f"{row['count']:>6} {row['errors']:>4} {row['retries']:>5} {row['throttled']:>4} "
+                f"{row['p50Ms']:>8.1f} {row['p95Ms']:>8.1f} {row['maxMs']:>8.1f} {row['bytes'] / 1024:>8.1f}  "
+                f"{row['method']} {row['endpoint']}"
+            )
+
+    # CLOSE
+    # Prints the summary and flushes the exporter; safe to call more than once
+    # ///////////////////////////////////////////////////////////////
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self.enabled and self.options["print_summary"]:
+            self.print_summary()
+        if self.exporter:
+            self.exporter.close()
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # FINISH RECORD
+    # ///////////////////////////////////////////////////////////////
+    def finish(self, record: Dict[str, Any]) -> None:
+        self.call_hooks(self.end_hooks, record)
+        if self.exporter:
+            self.exporter.export(record)
+
+    # CALL HOOKS
+    # A failing hook is reported but never breaks the request
+    # ///////////////////////////////////////////////////////////////
+    def call_hooks(self, hooks: List[Callable[[Dict[str, Any]], None]], record: Dict[str, Any]) -> None:
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                print(f"Instrumentation hook failed: {e}")
+
+    # CREATE EXPORTER
+    # ///////////////////////////////////////////////////////////////
+    def create_exporter(self) -> Optional[Any]:
+        exporter: Optional[str] = self.options["exporter"]
+        if not self.enabled or not exporter:
+            return None
+        if exporter not in EXPORTERS:
+            print(f"Unknown instrumentation exporter '{exporter}'. Expected one of: {', '.join(EXPORTERS)}.")
+            return None
+        if exporter == "otel":
+            return OTelJsonExporter(self.options["export_path"], self.options["service_name"])
+        return JsonLinesExporter(self.options["export_path"])
+
+# JSON LINES EXPORTER CLASS
+# Appends one JSON object per request or span as soon as it completes
+# ///////////////////////////////////////////////////////////////
+class JsonLinesExporter:
+
+    # INITIALISE JSON LINES EXPORTER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, export_path: str) -> None:
+        self.export_path: str = export_path
+        self.file: Optional[Any] = None
+        self.lock = threading.Lock()
+
+    # EXPORT RECORD
+    # ///////////////////////////////////////////////////////////////
+    def export(self, record: Dict[str, Any]) -> None:
+        line: str = json.dumps(record, default=str) + "\n"
+        with self.lock:
+            try:
+                if self.file is None:
+                    os.makedirs(os.path.dirname(self.export_path) or ".", exist_ok=True)
+                    self.file = open(self.export_path, "a", encoding="utf-8")
+                self.file.write(line)
+            except OSError as e:
+                print(f"Failed to write trace record: {e}")
+
+    # CLOSE
+    # ///////////////////////////////////////////////////////////////
+    def close(self) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+# OPENTELEMETRY JSON EXPORTER CLASS
+# Collects the records and writes them as one OTLP/JSON document (the format accepted by the
+# OpenTelemetry Collector's otlpjsonfile receiver) when the run ends
+# ///////////////////////////////////////////////////////////////
+class OTelJsonExporter:
+
+    SPAN_KIND_INTERNAL: int = 1
+    SPAN_KIND_CLIENT: int = 3
+    STATUS_OK: int = 1
+    STATUS_ERROR: int = 2
+
+    # INITIALISE OPENTELEMETRY JSON EXPORTER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, export_path: str, service_name: str) -> None:
+        self.export_path: str = export_path
+        self.service_name: str = service_name
+        self.spans: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+    # EXPORT RECORD
+    # ///////////////////////////////////////////////////////////////
+    def export(self, record: Dict[str, Any]) -> None:
+        span: Dict[str, Any] = self.to_otel_span(record)
+        with self.lock:
+            self.spans.append(span)
+
+    # CLOSE
+    # ///////////////////////////////////////////////////////////////
+    def close(self) -> None:
+        with self.lock:
+            spans, self.spans = self.spans, []
+        if not spans:
+            return
+
+        document: Dict[str, Any] = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self.attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": self.service_name}, "spans": spans}]
+            }]
+        }
+        try:
+            os.makedirs(os.path.dirname(self.export_path) or ".", exist_ok=True)
+            with open(self.export_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(document) + "\n")
+        except OSError as e:
+            print(f"Failed to write trace file: {e}")
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # TO OPENTELEMETRY SPAN
+    # Requests become CLIENT spans with the HTTP semantic convention attributes
+    # ///////////////////////////////////////////////////////////////
+    def to_otel_span(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        is_request: bool = record["type"] == "request"
+        duration_ms: float = record["latencyMs"] if is_request else record["durationMs"]
+        start_ns: int = int(record["startedAt"] * 1e9)
+
+        if is_request:
+            name: str = f"{record['method']} {record['endpoint']}"
+            values: Dict[str, Any] = {
+                "http.request.method": record["method"],
+                "http.response.status_code": record["status"],
+                "http.request.resend_count": record["retries"],
+                "http.response.body.size": record["bytes"],
+                "server.address": record["host"],
+                "url.template": record["endpoint"],
+                "azure.throttled": record["throttled"],
+                "azure.ratelimit.remaining": record["rateLimitRemaining"]
+            }
+            failed: bool = bool(record["error"] or not record["status"] or record["status"] >= 400)
+        else:
+            name = record["name"]
+            values = dict(record["attributes"])
+            failed = record["status"] == "error"
+
+        span: Dict[str, Any] = {
+            "traceId": record["traceId"],
+            "spanId": record["spanId"],
+            "name": name,
+            "kind": self.SPAN_KIND_CLIENT if is_request else self.SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(duration_ms * 1e6)),
+            "attributes": [self.attribute(key, value) for key, value in values.items() if value is not None],
+            "status": {"code": self.STATUS_ERROR if failed else self.STATUS_OK}
+        }
+        if record["parentSpanId"]:
+            span["parentSpanId"] = record["parentSpanId"]
+        return span
+
+    # ATTRIBUTE
+    # ///////////////////////////////////////////////////////////////
+    def attribute(self, key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+# SHARED INSTRUMENTATION
+# ///////////////////////////////////////////////////////////////
+_shared_instrumentation: Optional[Instrumentation] = None
+_shared_instrumentation_lock = threading.Lock()
+
+# GET SHARED INSTRUMENTATION
+# Returns the process-wide instrumentation, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_instrumentation(configurations: Optional[Dict[str, Any]] = None) -> Instrumentation:
+    global _shared_instrumentation
+    if _shared_instrumentation is None:
+        with _shared_instrumentation_lock:
+            if _shared_instrumentation is None:
+                _shared_instrumentation = Instrumentation((configurations or {}).get("instrumentation_options", {}))
+    return _shared_instrumentation
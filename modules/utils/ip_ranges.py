@@ -0,0 +1,44 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import ipaddress
+from typing import List, Optional, Tuple
+
+# IP RANGE FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+
+# PARSE IP RANGE
+# Converts "1.2.3.4", "1.2.3.0/24" or "1.2.3.4-1.2.3.9" to an inclusive (start, end) pair of
+# integers. Single addresses are widened to the given prefix length when one is passed.
+# Raises ValueError for anything that is not an IPv4 address, network or range.
+# ///////////////////////////////////////////////////////////////
+def parse_ip_range(value: str, prefix: Optional[int] = None) -> Tuple[int, int]:
+    value = value.strip()
+
+    if "-" in value:
+        start_text, end_text = (part.strip() for part in value.split("-", 1))
+        start, end = int(ipaddress.IPv4Address(start_text)), int(ipaddress.IPv4Address(end_text))
+        if start > end:
+            raise ValueError(f"{value} ends before it starts")
+        return start, end
+
+    if "/" not in value and prefix is not None:
+        value = f"{value}/{prefix}"
+
+    network = ipaddress.IPv4Network(value, strict=False)
+    return int(network.network_address), int(network.broadcast_address)
+
+# MERGE IP RANGES
+# Parses the given addresses, networks and ranges and merges overlapping or adjacent ones
+# into the smallest set of (start, end) intervals, sorted by start address
+# ///////////////////////////////////////////////////////////////
+def merge_ip_ranges(values: List[str], prefix: Optional[int] = None) -> List[Tuple[str, str]]:
+    intervals: List[Tuple[int, int]] = sorted(parse_ip_range(value, prefix) for value in values)
+
+    merged: List[List[int]] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return [(str(ipaddress.IPv4Address(start)), str(ipaddress.IPv4Address(end))) for start, end in merged]
@@ -0,0 +1,239 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List, Optional, Callable, Iterator, AsyncIterator, Tuple
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .event_loop import run_async, iterate_async
+from .http_client import HttpClient
+from .utils import make_api_request_async
+
+# LISTING INCOMPLETE ERROR
+# Raised by the page iterators when a page cannot be read, so a failed page is never mistaken
+# for the end of the list
+# ///////////////////////////////////////////////////////////////
+class ListingIncompleteError(RuntimeError):
+
+    def __init__(self, url: str, pages_read: int) -> None:
+        super().__init__(f"Listing incomplete: a page could not be read after {pages_read} page(s) ({url}).")
+        self.url: str = url
+        self.pages_read: int = pages_read
+
+# PAGINATION FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+
+# ITERATE PAGES
+# Follows ARM "nextLink" values lazily and yields each page's "value" list as it arrives.
+# With prefetch enabled the next page is requested while the caller consumes the current one.
+# Raises ListingIncompleteError when any page fails.
+# ///////////////////////////////////////////////////////////////
+def iterate_pages(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    prefetch: bool = False
+) -> Iterator[List[Dict[str, Any]]]:
+    return iterate_async(iterate_pages_async(url, method, headers, create_role_assignment, subscription, client, prefetch))
+
+# ITERATE PAGES (ASYNC)
+# The async generator behind iterate_pages
+# ///////////////////////////////////////////////////////////////
+async def iterate_pages_async(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    prefetch: bool = False
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    import asyncio
+
+    async def fetch_page(page_url: str) -> Optional[Dict[str, Any]]:
+        return await make_api_request_async(
+            url=page_url,
+            method=method,
+            headers=headers,
+            create_role_assignment=create_role_assignment,
+            subscription=subscription,
+            client=client
+        )
+
+    pending: Optional[Any] = None
+    pages_read: int = 0
+
+    try:
+        next_url: Optional[str] = url
+        response: Optional[Dict[str, Any]] = await fetch_page(next_url)
+
+        while True:
+            if response is None:
+                raise ListingIncompleteError(next_url, pages_read)
+            if isinstance(response, list):
+                yield response
+                return
+
+            pages_read += 1
+            next_url = response.get("nextLink")
+            if next_url and prefetch:
+                pending = asyncio.ensure_future(fetch_page(next_url))
+
+            yield response.get("value", [])
+
+            if not next_url:
+                return
+            if pending:
+                response, pending = await pending, None
+            else:
+                response = await fetch_page(next_url)
+    finally:
+        if pending:
+            pending.cancel()
+
+# ITERATE ITEMS
+# Yields individual resources from a paginated list endpoint, stopping once max_items is reached.
+# With project, each resource is passed through it and only the result is kept.
+# Raises ListingIncompleteError when any page fails.
+# ///////////////////////////////////////////////////////////////
+def iterate_items(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    max_items: Optional[int] = None,
+    prefetch: bool = False,
+    project: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> Iterator[Any]:
+    return iterate_async(iterate_items_async(url, method, headers, create_role_assignment, subscription, client, max_items, prefetch, project))
+
+# ITERATE ITEMS (ASYNC)
+# The async generator behind iterate_items
+# ///////////////////////////////////////////////////////////////
+async def iterate_items_async(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    max_items: Optional[int] = None,
+    prefetch: bool = False,
+    project: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> AsyncIterator[Any]:
+    if max_items is not None and max_items <= 0:
+        return
+
+    count = 0
+    pages = iterate_pages_async(
+        url=url,
+        method=method,
+        headers=headers,
+        create_role_assignment=create_role_assignment,
+        subscription=subscription,
+        client=client,
+        prefetch=prefetch
+    )
+
+    try:
+        async for page in pages:
+            for item in page:
+                yield project(item) if project else item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+    finally:
+        await pages.aclose()
+
+# LIST ALL ITEMS (CONDITIONAL)
+# Reads every page of a list endpoint. When an ETag is given the first request is sent with
+# If-None-Match, and a 304 response is reported as not modified without reading further pages.
+# Returns the items (None if any page fails, never a partial list), the ETag of the first page
+# and whether it was not modified.
+# With project, every page is projected as soon as it is parsed, so only one page of full
+# payloads is held at a time.
+# ///////////////////////////////////////////////////////////////
+def list_all_items(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    max_items: Optional[int] = None,
+    prefetch: bool = False,
+    etag: Optional[str] = None,
+    project: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> Tuple[Optional[List[Any]], Optional[str], bool]:
+    return run_async(list_all_items_async(url, headers, create_role_assignment, subscription, client, max_items, prefetch, etag, project))
+
+# LIST ALL ITEMS (ASYNC)
+# The listing behind list_all_items
+# ///////////////////////////////////////////////////////////////
+async def list_all_items_async(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    max_items: Optional[int] = None,
+    prefetch: bool = False,
+    etag: Optional[str] = None,
+    project: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> Tuple[Optional[List[Any]], Optional[str], bool]:
+    request_headers: Dict[str, str] = {**(headers or {}), "If-None-Match": etag} if etag else dict(headers or {})
+    response_headers: Dict[str, str] = {}
+
+    response: Optional[Dict[str, Any]] = await make_api_request_async(
+        url=url,
+        method="GET",
+        headers=request_headers,
+        create_role_assignment=create_role_assignment,
+        subscription=subscription,
+        client=client,
+        response_headers=response_headers
+    )
+
+    if response is None:
+        return None, etag, False
+
+    new_etag: Optional[str] = next((value for key, value in response_headers.items() if key.lower() == "etag"), None)
+    if etag and response == {}:
+        return None, etag, True
+
+    if isinstance(response, list):
+        return project_page(response[:max_items] if max_items is not None else response, project), new_etag, False
+
+    items: List[Any] = project_page(response.get("value", []), project)
+    next_url: Optional[str] = response.get("nextLink")
+    # Release the first page's payloads before the remaining pages are read
+    del response
+    if max_items is not None and len(items) >= max_items:
+        return items[:max_items], new_etag, False
+
+    if next_url:
+        try:
+            async for item in iterate_items_async(
+                url=next_url,
+                headers=headers,
+                create_role_assignment=create_role_assignment,
+                subscription=subscription,
+                client=client,
+                max_items=max_items - len(items) if max_items is not None else None,
+                prefetch=prefetch,
+                project=project
+            ):
+                items.append(item)
+        except ListingIncompleteError as e:
+            print(f"{e} Discarding the {len(items)} item(s) read so far.")
+            return None, etag, False
+
+    return items, new_etag, False
+
+# PROJECT PAGE
+# ///////////////////////////////////////////////////////////////
+def project_page(page: List[Dict[str, Any]], project: Optional[Callable[[Dict[str, Any]], Any]]) -> List[Any]:
+    return [project(item) for item in page] if project else list(page)
@@ -0,0 +1,197 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import ipaddress
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .event_loop import run_async
+from .http_client import HttpClient, get_http_client
+
+# DEFAULT PUBLIC IP OPTIONS
+# Used when config.json does not provide a "public_ip_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_PUBLIC_IP_OPTIONS: Dict[str, Any] = {
+    "endpoints": [
+        "https://api.ipify.org?format=json",
+        "https://checkip.amazonaws.com",
+        "https://icanhazip.com",
+        "https://ifconfig.me/ip"
+    ],
+    "timeout": 3,
+    "ttl_seconds": 300,
+    "cache_path": ".cache/public_ip.json",
+    "probe_address": "8.8.8.8"
+}
+
+# PUBLIC IP RESOLVER CLASS
+# Asks several echo endpoints for the public IPv4 address at the same time and keeps the first
+# valid answer. Answers are cached in memory and on disk for a short time, keyed by the local
+# network interface so a network change (VPN, Wi-Fi switch) fetches the address again.
+# ///////////////////////////////////////////////////////////////
+class PublicIPResolver:
+
+    # INITIALISE PUBLIC IP RESOLVER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, public_ip_options: Optional[Dict[str, Any]] = None, client: Optional[HttpClient] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_PUBLIC_IP_OPTIONS, **(public_ip_options or {})}
+        self.endpoints: List[str] = list(self.options["endpoints"])
+        self.timeout: float = float(self.options["timeout"])
+        self.ttl_seconds: float = float(self.options["ttl_seconds"])
+        self.cache_path: Optional[str] = self.options["cache_path"]
+        self.client: HttpClient = client or get_http_client()
+        self.lock = threading.Lock()
+        self.cached: Optional[Dict[str, Any]] = None
+
+    # RESOLVE PUBLIC IP
+    # Returns the cached address for the current network, or races the endpoints for a new one
+    # ///////////////////////////////////////////////////////////////
+    def resolve(self, force_refresh: bool = False) -> Optional[str]:
+        with self.lock:
+            fingerprint: str = self.get_network_fingerprint()
+
+            if not force_refresh:
+                entry = self.cached or self.load_cache()
+                if self.is_valid_entry(entry, fingerprint):
+                    self.cached = entry
+                    return entry["ip"]
+
+            ip_address: Optional[str] = run_async(self.race_endpoints())
+            if ip_address:
+                self.cached = {"ip": ip_address, "fingerprint": fingerprint, "fetched_at": time.time()}
+                self.save_cache()
+            return ip_address
+
+    # RACE ENDPOINTS
+    # Sends every endpoint request at once and returns the first valid IPv4 address.
+    # The slower requests are cancelled once there is an answer.
+    # ///////////////////////////////////////////////////////////////
+    async def race_endpoints(self) -> Optional[str]:
+        import asyncio
+
+        if not self.endpoints:
+            print("No public IP endpoints configured.")
+            return None
+
+        pending = {asyncio.ensure_future(self.query_endpoint(endpoint)) for endpoint in self.endpoints}
+        deadline: float = time.monotonic() + self.timeout
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    ip_address = task.result()
+                    if ip_address:
+                        return ip_address
+        finally:
+            for task in pending:
+                task.cancel()
+
+        print("Failed to fetch public IP from any endpoint.")
+        return None
+
+    # QUERY ENDPOINT
+    # Accepts either a JSON body with an "ip" field or a plain-text body holding just the address
+    # ///////////////////////////////////////////////////////////////
+    async def query_endpoint(self, endpoint: str) -> Optional[str]:
+        try:
+            response = await self.client.request("GET", endpoint)
+            if response.status_code != 200:
+                return None
+            text: str = response.text.strip()
+            if text.startswith("{"):
+                text = str(json.loads(text).get("ip", ""))
+            return str(ipaddress.IPv4Address(text.strip()))
+        except Exception:
+            return None
+
+    # INVALIDATE CACHE
+    # ///////////////////////////////////////////////////////////////
+    def invalidate(self) -> None:
+        with self.lock:
+            self.cached = None
+            if self.cache_path and os.path.exists(self.cache_path):
+                try:
+                    os.remove(self.cache_path)
+                except OSError as e:
+                    print(f"Failed to remove public IP cache: {e}")
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # GET NETWORK FINGERPRINT
+    # Identifies the local interface used for outbound traffic. Connecting a UDP socket only picks
+    # a route; no packet is sent.
+    # ///////////////////////////////////////////////////////////////
+    def get_network_fingerprint(self) -> str:
+        local_address: str = "unknown"
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.connect((self.options["probe_address"], 80))
+                local_address = probe.getsockname()[0]
+        except OSError:
+            pass
+        return f"{socket.gethostname()}|{local_address}"
+
+    # IS VALID ENTRY
+    # ///////////////////////////////////////////////////////////////
+    def is_valid_entry(self, entry: Optional[Dict[str, Any]], fingerprint: str) -> bool:
+        return bool(
+            entry
+            and entry.get("fingerprint") == fingerprint
+            and time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+        )
+
+    # LOAD CACHE FROM DISK
+    # ///////////////////////////////////////////////////////////////
+    def load_cache(self) -> Optional[Dict[str, Any]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    # SAVE CACHE TO DISK
+    # Writes to a temporary file first so a crash never leaves a truncated file behind
+    # ///////////////////////////////////////////////////////////////
+    def save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            directory: str = os.path.dirname(self.cache_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(self.cached, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Failed to save public IP cache: {e}")
+
+# SHARED RESOLVER
+# ///////////////////////////////////////////////////////////////
+_shared_resolver: Optional[PublicIPResolver] = None
+_shared_resolver_lock = threading.Lock()
+
+# GET SHARED PUBLIC IP RESOLVER
+# Returns the process-wide resolver, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_public_ip_resolver(configurations: Optional[Dict[str, Any]] = None) -> PublicIPResolver:
+    global _shared_resolver
+    if _shared_resolver is None:
+        with _shared_resolver_lock:
+            if _shared_resolver is None:
+                _shared_resolver = PublicIPResolver(
+                    (configurations or {}).get("public_ip_options", {}),
+                    get_http_client(configurations)
+                )
+    return _shared_resolver
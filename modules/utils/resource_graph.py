@@ -0,0 +1,96 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List, Optional
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .event_loop import run_async
+from .http_client import HttpClient
+from .utils import make_api_request_async
+
+# RESOURCE GRAPH SETTINGS
+# ///////////////////////////////////////////////////////////////
+RESOURCE_GRAPH_API_VERSION: str = "2022-10-01"
+MAX_SUBSCRIPTIONS_PER_QUERY: int = 1000
+PAGE_SIZE: int = 1000
+
+# RESOURCE GRAPH FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+
+# BUILD RESOURCE QUERY
+# Builds a KQL query that returns only the fields used to search and select resources
+# ///////////////////////////////////////////////////////////////
+def build_resource_query(resource_types: List[str]) -> str:
+    types: str = ", ".join(f"'{resource_type.lower()}'" for resource_type in resource_types)
+    return (
+        f"Resources | where type in~ ({types}) "
+        f"| project name, id, resourceGroup, subscriptionId, type "
+        f"| order by name asc"
+    )
+
+# QUERY RESOURCE GRAPH
+# Lists resources of the given types across many subscriptions with one projected query per
+# chunk of subscriptions, following $skipToken until every row has been read.
+# Returns None if any request fails.
+# API Reference: https://learn.microsoft.com/en-us/rest/api/azureresourcegraph/resourcegraph/resources/resources?view=rest-azureresourcegraph-resourcegraph-2022-10-01
+# ///////////////////////////////////////////////////////////////
+def query_resource_graph(
+    base_url: str,
+    headers: Dict[str, str],
+    subscription_ids: List[str],
+    resource_types: List[str],
+    client: Optional[HttpClient] = None
+) -> Optional[List[Dict[str, Any]]]:
+    return run_async(query_resource_graph_async(base_url, headers, subscription_ids, resource_types, client))
+
+# QUERY RESOURCE GRAPH (ASYNC)
+# The query behind query_resource_graph
+# ///////////////////////////////////////////////////////////////
+async def query_resource_graph_async(
+    base_url: str,
+    headers: Dict[str, str],
+    subscription_ids: List[str],
+    resource_types: List[str],
+    client: Optional[HttpClient] = None
+) -> Optional[List[Dict[str, Any]]]:
+    url: str = f"{base_url}/providers/Microsoft.ResourceGraph/resources?api-version={RESOURCE_GRAPH_API_VERSION}"
+    query: str = build_resource_query(resource_types)
+    resources: List[Dict[str, Any]] = []
+
+    for start in range(0, len(subscription_ids), MAX_SUBSCRIPTIONS_PER_QUERY):
+        skip_token: Optional[str] = None
+        while True:
+            options: Dict[str, Any] = {"resultFormat": "objectArray", "$top": PAGE_SIZE}
+            if skip_token:
+                options["$skipToken"] = skip_token
+
+            response: Optional[Dict[str, Any]] = await make_api_request_async(
+                url=url,
+                method="POST",
+                headers=headers,
+                json_data={
+                    "subscriptions": subscription_ids[start:start + MAX_SUBSCRIPTIONS_PER_QUERY],
+                    "query": query,
+                    "options": options
+                },
+                client=client
+            )
+
+            if response is None:
+                print("Resource Graph query failed.")
+                return None
+
+            for row in response.get("data", []):
+                resources.append({
+                    "name": row.get("name"),
+                    "id": row.get("id"),
+                    "resourceGroup": (row.get("resourceGroup") or "").lower(),
+                    "subscriptionId": row.get("subscriptionId"),
+                    "type": row.get("type")
+                })
+
+            skip_token = response.get("$skipToken")
+            if not skip_token:
+                break
+
+    return resources
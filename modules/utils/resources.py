@@ -0,0 +1,61 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import sys
+from collections.abc import Mapping
+from typing import Dict, Any, List, Iterator, Optional
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from .utils import extract_segment
+
+# RESOURCE RECORD CLASS
+# The fields of an ARM resource that listing, searching and selecting read. Lists of web apps and
+# SQL servers keep these records instead of the full payloads, which carry siteConfig, hostNames,
+# tags and more. A record reads like a read-only dictionary (record['name'], record.get('id'),
+# {**record}), so code written for the payloads keeps working.
+# ///////////////////////////////////////////////////////////////
+class ResourceRecord(Mapping):
+
+    __slots__ = ("name", "id", "resourceGroup")
+
+    # INITIALISE RESOURCE RECORD
+    # Resource group names repeat across many resources, so one copy of each is kept
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, name: str, id: str, resource_group: str) -> None:
+        self.name: str = name
+        self.id: str = id
+        self.resourceGroup: str = sys.intern(resource_group.lower())
+
+    # FROM ITEM
+    # Projects a resource payload (or a record read back from the cache) to a record. The resource
+    # group comes from the resource ID when the payload does not have one.
+    # ///////////////////////////////////////////////////////////////
+    @classmethod
+    def from_item(cls, item: Mapping) -> "ResourceRecord":
+        resource_id: str = item.get("id") or ""
+        return cls(item.get("name") or "", resource_id, item.get("resourceGroup") or extract_segment(resource_id, 4))
+
+    # MAPPING SUPPORT
+    # ///////////////////////////////////////////////////////////////
+    def __getitem__(self, key: str) -> str:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ResourceRecord(name={self.name!r}, id={self.id!r}, resourceGroup={self.resourceGroup!r})"
+
+# PROJECT RESOURCES
+# Turns one page of resource payloads into records, so the payloads can be released before the
+# next page is read
+# ///////////////////////////////////////////////////////////////
+def project_resources(items: Optional[List[Dict[str, Any]]]) -> Optional[List[ResourceRecord]]:
+    if items is None:
+        return None
+    return [ResourceRecord.from_item(item) for item in items]
@@ -0,0 +1,138 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, Mapping, Tuple
+
+# DEFAULT RETRY OPTIONS
+# Used when config.json does not provide a "retry_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_RETRY_OPTIONS: Dict[str, Any] = {
+    "max_attempts": 5,
+    "backoff_base": 1.0,
+    "backoff_cap": 30.0,
+    "jitter": True,
+    "retry_statuses": [429, 500, 502, 503, 504],
+    "max_role_activations": 1,
+    "rate_limit_threshold": 100,
+    "rate_limit_max_delay": 5.0
+}
+
+# ARM reports the remaining request budget per subscription in these headers
+RATE_LIMIT_HEADERS: Dict[str, str] = {
+    "reads": "x-ms-ratelimit-remaining-subscription-reads",
+    "writes": "x-ms-ratelimit-remaining-subscription-writes"
+}
+
+# RETRY POLICY CLASS
+# Decides which responses are retried and how long to wait between attempts
+# ///////////////////////////////////////////////////////////////
+class RetryPolicy:
+
+    # INITIALISE RETRY POLICY
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, retry_options: Optional[Dict[str, Any]] = None) -> None:
+        options: Dict[str, Any] = {**DEFAULT_RETRY_OPTIONS, **(retry_options or {})}
+        self.max_attempts: int = max(1, int(options["max_attempts"]))
+        self.backoff_base: float = float(options["backoff_base"])
+        self.backoff_cap: float = float(options["backoff_cap"])
+        self.jitter: bool = bool(options["jitter"])
+        self.retry_statuses: Tuple[int, ...] = tuple(options["retry_statuses"])
+        self.max_role_activations: int = int(options["max_role_activations"])
+
+    # SHOULD RETRY STATUS
+    # ///////////////////////////////////////////////////////////////
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    # GET RETRY DELAY
+    # Honours Retry-After when present, otherwise uses capped exponential backoff with full jitter
+    # ///////////////////////////////////////////////////////////////
+    def get_delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        retry_after: Optional[float] = self.parse_retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+
+        delay: float = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    # PARSE RETRY-AFTER HEADER
+    # Accepts both the delay-seconds and HTTP-date forms
+    # ///////////////////////////////////////////////////////////////
+    def parse_retry_after(self, headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        value: Optional[str] = headers.get("Retry-After") if headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        # email.utils is slow to import and HTTP-date values are rare, so it is loaded only here
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+# RATE LIMIT TRACKER CLASS
+# Records ARM's remaining read/write budget per subscription and slows callers down as the
+# budget runs low, so bulk operations back off before they are throttled with a 429
+# ///////////////////////////////////////////////////////////////
+class RateLimitTracker:
+
+    # INITIALISE RATE LIMIT TRACKER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, retry_options: Optional[Dict[str, Any]] = None) -> None:
+        options: Dict[str, Any] = {**DEFAULT_RETRY_OPTIONS, **(retry_options or {})}
+        self.threshold: int = int(options["rate_limit_threshold"])
+        self.max_delay: float = float(options["rate_limit_max_delay"])
+        self.remaining: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+
+    # RECORD RESPONSE HEADERS
+    # ///////////////////////////////////////////////////////////////
+    def record(self, url: str, method: str, headers: Mapping[str, str]) -> None:
+        kind: str = self.request_kind(method)
+        value: Optional[str] = headers.get(RATE_LIMIT_HEADERS[kind])
+        if value is None:
+            return
+        try:
+            remaining = int(value)
+        except ValueError:
+            return
+        with self.lock:
+            self.remaining[(self.subscription_key(url), kind)] = remaining
+
+    # GET THROTTLE DELAY
+    # Returns how long to wait before the next request; grows linearly as the budget approaches zero
+    # ///////////////////////////////////////////////////////////////
+    def get_delay(self, url: str, method: str) -> float:
+        key: Tuple[str, str] = (self.subscription_key(url), self.request_kind(method))
+        with self.lock:
+            remaining: Optional[int] = self.remaining.get(key)
+            if remaining is None or remaining >= self.threshold or self.threshold <= 0:
+                return 0.0
+            # Count this request against the budget until the next response updates it
+            self.remaining[key] = max(0, remaining - 1)
+        return self.max_delay * (1 - remaining / self.threshold)
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # REQUEST KIND
+    # ///////////////////////////////////////////////////////////////
+    def request_kind(self, method: str) -> str:
+        return "reads" if method.upper() == "GET" else "writes"
+
+    # SUBSCRIPTION KEY
+    # Budgets are tracked per subscription; tenant-level calls share one budget
+    # ///////////////////////////////////////////////////////////////
+    def subscription_key(self, url: str) -> str:
+        parts = url.split("?", 1)[0].split("/")
+        lowered = [part.lower() for part in parts]
+        if "subscriptions" in lowered:
+            index = lowered.index("subscriptions") + 1
+            if index < len(parts):
+                return parts[index].lower()
+        return "tenant"
@@ -0,0 +1,113 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import re
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+# SEARCH SETTINGS
+# ///////////////////////////////////////////////////////////////
+WORD_SEPARATORS: str = "-_. /"
+
+# Match ranks, lower is better
+RANK_PREFIX: int = 0
+RANK_WORD_BOUNDARY: int = 1
+RANK_SUBSTRING: int = 2
+RANK_SUBSEQUENCE: int = 3
+
+# SEARCH INDEX CLASS
+# Prebuilt index over a list of items for fast, ranked, incremental searching.
+# Keys are normalised once and stored in result order (shortest first, then alphabetical), so
+# each rank bucket comes out already sorted. Every character maps to a bitmask of the keys
+# containing it, so a query only inspects keys holding all of its characters, and refining a
+# search only re-ranks the previous result.
+# ///////////////////////////////////////////////////////////////
+class SearchIndex:
+
+    # INITIALISE SEARCH INDEX
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, items: List[Dict[str, Any]], item_key: str) -> None:
+        self.items: List[Dict[str, Any]] = items
+        normalised: List[str] = [self.normalise(item[item_key]) for item in items]
+        self.positions: List[int] = sorted(range(len(items)), key=lambda index: (len(normalised[index]), normalised[index]))
+        self.keys: List[str] = [normalised[index] for index in self.positions]
+        self.slots: List[int] = [0] * len(items)
+        for slot, index in enumerate(self.positions):
+            self.slots[index] = slot
+        self.all_mask: int = (1 << len(items)) - 1
+        self.char_masks: Dict[str, int] = {}
+        self.build()
+
+    # BUILD INDEX
+    # Builds one bitmask per character from a string of "0"/"1" flags, which keeps the work in C
+    # ///////////////////////////////////////////////////////////////
+    def build(self) -> None:
+        reversed_keys: List[str] = self.keys[::-1]
+        alphabet: Set[str] = set().union(*map(set, self.keys)) if self.keys else set()
+        self.char_masks = {
+            char: int("".join(["1" if char in key else "0" for key in reversed_keys]), 2)
+            for char in alphabet
+        }
+
+    # SEARCH
+    # Returns the indexes of matching items, best matches first:
+    # prefix > word boundary > substring > subsequence, then shorter keys, then alphabetical.
+    # Pass the previous result as "within" to narrow an earlier search incrementally.
+    # ///////////////////////////////////////////////////////////////
+    def search(self, query: str, within: Optional[List[int]] = None) -> List[int]:
+        query = self.normalise(query)
+        if not query:
+            return list(within) if within is not None else list(range(len(self.items)))
+
+        if within is not None and len(within) < len(self.items) // 8:
+            # A small earlier result is cheaper to re-rank directly than to intersect
+            slots: List[int] = sorted(self.slots[index] for index in within)
+        else:
+            candidates: int = self.all_mask
+            for char in set(query):
+                candidates &= self.char_masks.get(char, 0)
+                if not candidates:
+                    return []
+            slots = self.mask_to_slots(candidates)
+            if within is not None:
+                allowed: Set[int] = {self.slots[index] for index in within}
+                slots = [slot for slot in slots if slot in allowed]
+
+        boundary_pattern = re.compile(f"[{re.escape(WORD_SEPARATORS)}]{re.escape(query)}")
+        subsequence_pattern = re.compile("".join(f"[^{re.escape(char)}]*{re.escape(char)}" for char in query))
+
+        buckets: Tuple[List[int], ...] = ([], [], [], [])
+        keys = self.keys
+        for slot in slots:
+            key = keys[slot]
+            if query in key:
+                if key.startswith(query):
+                    buckets[RANK_PREFIX].append(slot)
+                elif boundary_pattern.search(key):
+                    buckets[RANK_WORD_BOUNDARY].append(slot)
+                else:
+                    buckets[RANK_SUBSTRING].append(slot)
+            elif subsequence_pattern.match(key):
+                buckets[RANK_SUBSEQUENCE].append(slot)
+
+        positions = self.positions
+        return [positions[slot] for bucket in buckets for slot in bucket]
+
+    # SEARCH ITEMS
+    # Convenience wrapper returning the matching items rather than their indexes
+    # ///////////////////////////////////////////////////////////////
+    def search_items(self, query: str, within: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        return [self.items[index] for index in self.search(query, within)]
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # MASK TO SLOTS
+    # Converts a bitmask to the list of set bit positions in one pass over its binary string
+    # ///////////////////////////////////////////////////////////////
+    def mask_to_slots(self, mask: int) -> List[int]:
+        bits: str = bin(mask)[:1:-1]
+        return [slot for slot, bit in enumerate(bits) if bit == "1"]
+
+    # NORMALISE KEY
+    # ///////////////////////////////////////////////////////////////
+    def normalise(self, value: str) -> str:
+        return str(value).strip().casefold()
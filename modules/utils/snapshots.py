@@ -0,0 +1,320 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import fnmatch
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+# DEFAULT SNAPSHOT OPTIONS
+# Used when config.json does not provide a "snapshot_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_SNAPSHOT_OPTIONS: Dict[str, Any] = {
+    "enabled": True,
+    "database_path": "results/appsettings_history.sqlite3",
+    "key_path": None,
+    "plain_patterns": [
+        "ASPNETCORE_ENVIRONMENT",
+        "DOTNET_ENVIRONMENT",
+        "FUNCTIONS_EXTENSION_VERSION",
+        "FUNCTIONS_WORKER_RUNTIME",
+        "Logging__LogLevel__*",
+        "WEBSITE_NODE_DEFAULT_VERSION",
+        "WEBSITE_TIME_ZONE",
+        "WEBSITES_ENABLE_APP_SERVICE_STORAGE"
+    ]
+}
+
+KEY_SEPARATOR: str = "__"
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_key TEXT NOT NULL,
+    subscription_id TEXT NOT NULL,
+    app_name TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    change_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    setting TEXT NOT NULL,
+    change TEXT NOT NULL,
+    value_hash TEXT,
+    value TEXT,
+    PRIMARY KEY (snapshot_id, setting)
+);
+CREATE TABLE IF NOT EXISTS current (
+    app_key TEXT NOT NULL,
+    setting TEXT NOT NULL,
+    value_hash TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (app_key, setting)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_app ON snapshots (app_key, id);
+CREATE INDEX IF NOT EXISTS changes_by_setting ON changes (setting, snapshot_id);
+"""
+
+# SNAPSHOT STORE CLASS
+# Keeps the history of every exported web app's settings in SQLite. Each export is stored only as
+# the settings added, changed or removed since the previous snapshot of that app. Every value is
+# kept as a keyed hash only, so changes can be detected without storing it, except for settings
+# on the plain_patterns allow-list. The hash key is kept in its own file, readable only by the
+# owner, so a copy of the database alone cannot be used to guess values.
+# ///////////////////////////////////////////////////////////////
+class SnapshotStore:
+
+    # INITIALISE SNAPSHOT STORE
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, snapshot_options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_SNAPSHOT_OPTIONS, **(snapshot_options or {})}
+        self.enabled: bool = bool(self.options["enabled"])
+        self.database_path: str = self.options["database_path"]
+        self.key_path: str = self.options["key_path"] or f"{self.database_path}.key"
+        self.plain_patterns: List[str] = [pattern.lower() for pattern in self.options["plain_patterns"]]
+        self.lock = threading.Lock()
+        self.connection: Optional[sqlite3.Connection] = None
+        self.hash_key: bytes = b""
+
+    # RECORD SNAPSHOT
+    # Stores the differences between the given settings and the app's latest snapshot.
+    # Returns the new snapshot ID, or None when the store is disabled or cannot be written.
+    # ///////////////////////////////////////////////////////////////
+    def record(self, subscription_id: str, app_name: str, settings: Dict[str, Any]) -> Optional[int]:
+        if not self.enabled:
+            return None
+
+        app_key: str = self.make_app_key(subscription_id, app_name)
+
+        try:
+            with self.lock:
+                connection = self.connect()
+                flat: Dict[str, Tuple[str, Optional[str]]] = {
+                    setting: self.encode_value(setting, value) for setting, value in self.flatten(settings).items()
+                }
+                previous: Dict[str, str] = dict(connection.execute(
+                    "SELECT setting, value_hash FROM current WHERE app_key = ?", (app_key,)
+                ))
+
+                changes: List[Tuple[str, str, Optional[str], Optional[str]]] = []
+                for setting, (value_hash, value) in flat.items():
+                    if setting not in previous:
+                        changes.append((setting, "added", value_hash, value))
+                    elif previous[setting] != value_hash:
+                        changes.append((setting, "changed", value_hash, value))
+                for setting in previous.keys() - flat.keys():
+                    changes.append((setting, "removed", None, None))
+
+                with connection:
+                    cursor = connection.execute(
+                        "INSERT INTO snapshots (app_key, subscription_id, app_name, taken_at, change_count) VALUES (?, ?, ?, ?, ?)",
+                        (app_key, subscription_id, app_name, self.now(), len(changes))
+                    )
+                    snapshot_id: int = cursor.lastrowid
+                    connection.executemany(
+                        "INSERT INTO changes (snapshot_id, setting, change, value_hash, value) VALUES (?, ?, ?, ?, ?)",
+                        [(snapshot_id, *change) for change in changes]
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO current (app_key, setting, value_hash, value) VALUES (?, ?, ?, ?)",
+                        [(app_key, setting, value_hash, value) for setting, change, value_hash, value in changes if change != "removed"]
+                    )
+                    connection.executemany(
+                        "DELETE FROM current WHERE app_key = ? AND setting = ?",
+                        [(app_key, setting) for setting, change, _, _ in changes if change == "removed"]
+                    )
+                return snapshot_id
+        except sqlite3.Error as e:
+            print(f"Failed to record settings snapshot for {app_name}: {e}")
+            return None
+
+    # FIND CHANGED APPS
+    # Lists every change to settings matching a name or glob pattern (e.g. "Logging__*") since
+    # the given ISO date or date-time, oldest first. Names match regardless of case.
+    # ///////////////////////////////////////////////////////////////
+    def find_changes(self, setting_pattern: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        since_text: str = self.normalise_date(since) if since else ""
+        with self.lock:
+            rows = self.connect().execute(
+                """
+                SELECT s.id, s.subscription_id, s.app_name, s.taken_at, c.setting, c.change
+                FROM changes c JOIN snapshots s ON s.id = c.snapshot_id
+                WHERE lower(c.setting) GLOB ? AND s.taken_at >= ?
+                ORDER BY s.id
+                """,
+                (setting_pattern.lower(), since_text)
+            ).fetchall()
+
+        return [
+            {"snapshotId": row[0], "subscriptionId": row[1], "appName": row[2], "takenAt": row[3], "setting": row[4], "change": row[5]}
+            for row in rows
+        ]
+
+    # LIST SNAPSHOTS
+    # ///////////////////////////////////////////////////////////////
+    def list_snapshots(self, subscription_id: str, app_name: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.connect().execute(
+                "SELECT id, taken_at, change_count FROM snapshots WHERE app_key = ? ORDER BY id",
+                (self.make_app_key(subscription_id, app_name),)
+            ).fetchall()
+        return [{"snapshotId": row[0], "takenAt": row[1], "changeCount": row[2]} for row in rows]
+
+    # DIFF SNAPSHOTS
+    # Compares an app's settings as they were at two snapshots. Returns the added, removed and
+    # changed settings; values kept only as a hash are shown as "<hidden>".
+    # ///////////////////////////////////////////////////////////////
+    def diff(self, subscription_id: str, app_name: str, from_snapshot: int, to_snapshot: int) -> Dict[str, Dict[str, Any]]:
+        before = self.state_at(subscription_id, app_name, from_snapshot)
+        after = self.state_at(subscription_id, app_name, to_snapshot)
+
+        result: Dict[str, Dict[str, Any]] = {"added": {}, "removed": {}, "changed": {}}
+        for setting in sorted(before.keys() | after.keys()):
+            if setting not in before:
+                result["added"][setting] = self.display_value(after[setting])
+            elif setting not in after:
+                result["removed"][setting] = self.display_value(before[setting])
+            elif before[setting][0] != after[setting][0]:
+                result["changed"][setting] = {"from": self.display_value(before[setting]), "to": self.display_value(after[setting])}
+        return result
+
+    # STATE AT SNAPSHOT
+    # Rebuilds an app's settings at a snapshot from the latest change to each setting up to it
+    # ///////////////////////////////////////////////////////////////
+    def state_at(self, subscription_id: str, app_name: str, snapshot_id: int) -> Dict[str, Tuple[str, Optional[str]]]:
+        with self.lock:
+            rows = self.connect().execute(
+                """
+                SELECT c.setting, c.change, c.value_hash, c.value
+                FROM changes c JOIN snapshots s ON s.id = c.snapshot_id
+                WHERE s.app_key = ? AND s.id <= ?
+                ORDER BY s.id
+                """,
+                (self.make_app_key(subscription_id, app_name), snapshot_id)
+            ).fetchall()
+
+        state: Dict[str, Tuple[str, Optional[str]]] = {}
+        for setting, change, value_hash, value in rows:
+            if change == "removed":
+                state.pop(setting, None)
+            else:
+                state[setting] = (value_hash, value)
+        return state
+
+    # CLOSE STORE
+    # ///////////////////////////////////////////////////////////////
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    # UTILITY FUNCTIONS
+    # ///////////////////////////////////////////////////////////////
+
+    # CONNECT
+    # Opens the database on first use, creating the tables and loading the hash key.
+    # Must be called with the lock held.
+    # ///////////////////////////////////////////////////////////////
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            directory: str = os.path.dirname(self.database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.database_path, check_same_thread=False)
+            connection.executescript(SCHEMA)
+            self.hash_key = self.load_hash_key()
+            self.connection = connection
+        return self.connection
+
+    # LOAD HASH KEY
+    # Reads the key from its file, creating the file (owner read/write only) with a new random key
+    # on first use
+    # ///////////////////////////////////////////////////////////////
+    def load_hash_key(self) -> bytes:
+        if not os.path.exists(self.key_path):
+            key_directory: str = os.path.dirname(self.key_path)
+            if key_directory:
+                os.makedirs(key_directory, exist_ok=True)
+            file_descriptor: int = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(file_descriptor, "w") as file:
+                file.write(secrets.token_hex(32))
+
+        if os.name == "posix" and os.stat(self.key_path).st_mode & 0o077:
+            os.chmod(self.key_path, 0o600)
+        with open(self.key_path, "r") as file:
+            return bytes.fromhex(file.read().strip())
+
+    # FLATTEN SETTINGS
+    # Turns the nested export back into the original setting names ("Parent__Child")
+    # ///////////////////////////////////////////////////////////////
+    def flatten(self, settings: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        flat: Dict[str, Any] = {}
+        for key, value in settings.items():
+            name = f"{prefix}{KEY_SEPARATOR}{key}" if prefix else key
+            if isinstance(value, dict) and value:
+                flat.update(self.flatten(value, name))
+            else:
+                flat[name] = value
+        return flat
+
+    # ENCODE VALUE
+    # Returns the value's keyed hash, with the value itself only for allow-listed settings.
+    # Must be called after connect(), which loads the hash key.
+    # ///////////////////////////////////////////////////////////////
+    def encode_value(self, setting: str, value: Any) -> Tuple[str, Optional[str]]:
+        text: str = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+        value_hash: str = hmac.new(self.hash_key, text.encode("utf-8"), hashlib.sha256).hexdigest()
+        return value_hash, text if self.is_plain(setting) else None
+
+    # IS PLAIN SETTING
+    # Whether the setting is on the allow-list of settings whose values may be stored
+    # ///////////////////////////////////////////////////////////////
+    def is_plain(self, setting: str) -> bool:
+        setting = setting.lower()
+        return any(fnmatch.fnmatchcase(setting, pattern) for pattern in self.plain_patterns)
+
+    # DISPLAY VALUE
+    # ///////////////////////////////////////////////////////////////
+    def display_value(self, entry: Tuple[str, Optional[str]]) -> str:
+        return entry[1] if entry[1] is not None else "<hidden>"
+
+    # MAKE APP KEY
+    # ///////////////////////////////////////////////////////////////
+    def make_app_key(self, subscription_id: str, app_name: str) -> str:
+        return f"{subscription_id.lower()}|{app_name.lower()}"
+
+    # NORMALISE DATE
+    # Converts an ISO date or date-time to the UTC format the snapshots are stored in
+    # ///////////////////////////////////////////////////////////////
+    def normalise_date(self, value: str) -> str:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    # CURRENT TIME
+    # ///////////////////////////////////////////////////////////////
+    def now(self) -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+# SHARED STORE
+# ///////////////////////////////////////////////////////////////
+_shared_store: Optional[SnapshotStore] = None
+_shared_store_lock = threading.Lock()
+
+# GET SHARED SNAPSHOT STORE
+# Returns the process-wide store, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_snapshot_store(configurations: Optional[Dict[str, Any]] = None) -> SnapshotStore:
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = SnapshotStore((configurations or {}).get("snapshot_options", {}))
+    return _shared_store
@@ -1,71 +1,230 @@
 # IMPORT STANDARD LIBRARY MODULES
 # ///////////////////////////////////////////////////////////////
-import json
-import os
+import functools
 import math
+import shutil
+import sys
 from typing import Dict, Any, List, Optional, Callable, Tuple
 
-# IMPORT THIRD-PARTY PACKAGES
+# IMPORT LOCAL MODULES
 # ///////////////////////////////////////////////////////////////
-import requests
+from .event_loop import run_async
+from .http_client import HttpClient, get_http_client
+from .instrumentation import Instrumentation, get_instrumentation, in_current_span
+from .retry import RetryPolicy
+from .search import SearchIndex
+from .writers import OutputWriter, get_output_writer
+
+# DISPLAY SETTINGS
+# ///////////////////////////////////////////////////////////////
+COLUMN_SEPARATOR: str = " | "
+PAGE_COMMANDS: Dict[str, int] = {">": 1, "<": -1}
+PAGE_RESERVED_LINES: int = 8
+MIN_PAGE_ROWS: int = 10
 
 # UTILITY FUNCTIONS
 # ///////////////////////////////////////////////////////////////
 
 # MAKE API REQUEST
-# Sends an HTTP request (GET, POST or PUT) and handles the response with error handling and retries
+# Sends an HTTP request (GET, POST, PUT or DELETE) and handles the response with error handling and retries.
+# 429, 5xx and connection errors are retried with backoff up to the client's retry policy limit,
+# and a 403 AuthorizationFailed activates the role (if possible) before retrying once.
+# Responses without a body (202 Accepted, 204 No Content, or 304 Not Modified for a conditional
+# request) return an empty dictionary, so callers should check the result against None.
+# Blocks until make_api_request_async has finished on the shared event loop.
 # ///////////////////////////////////////////////////////////////
 def make_api_request(
     url: str,
     method: str = "GET",
     headers: Optional[Dict[str, str]] = None,
     json_data: Optional[Dict[str, Any]] = None,
-    retry_callback: Optional[Callable] = None,
     create_role_assignment: Optional[Callable] = None,
-    subscription: Optional[Dict[str, str]] = None
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    response_headers: Optional[Dict[str, str]] = None
 ) -> Optional[Dict[str, Any]]:
+    return run_async(make_api_request_async(url, method, headers, json_data, create_role_assignment, subscription, client, response_headers))
+
+# MAKE API REQUEST (ASYNC)
+# The request behind make_api_request, awaited by every manager. create_role_assignment may be a
+# coroutine function or a plain function; a plain one runs on a worker thread so it can block.
+# With instrumentation enabled every call is recorded, including its retries.
+# ///////////////////////////////////////////////////////////////
+async def make_api_request_async(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    json_data: Optional[Dict[str, Any]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    response_headers: Optional[Dict[str, str]] = None
+) -> Optional[Dict[str, Any]]:
+    instrumentation: Instrumentation = get_instrumentation()
+    if not instrumentation.enabled:
+        return await send_api_request(url, method, headers, json_data, create_role_assignment, subscription, client, response_headers)
+
+    record: Dict[str, Any] = instrumentation.start_request(method, url)
+    outcome: Dict[str, Any] = {}
     try:
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
-        elif method == "PUT":
-            response = requests.put(url, headers=headers, json=json_data)
-        else:
-            raise ValueError("Invalid HTTP method. Only 'GET', 'POST' and 'PUT' are supported.")
+        return await send_api_request(url, method, headers, json_data, create_role_assignment, subscription, client, response_headers, outcome)
+    finally:
+        instrumentation.end_request(record, outcome)
 
-        if response.status_code in (200, 201):
-            return response.json()
-
-        elif response.status_code == 403:
-            error_data = response.json().get("error", {})
-            if error_data.get("code") == "AuthorizationFailed":
-                print(f"Authorisation failed: {error_data.get('message')}")
-                
-                if subscription and create_role_assignment:
-                    print("Creating a new role assignment to grant necessary permissions...")
-                    create_role_assignment(subscription['subscriptionId'], subscription['roleDefinitionId'], subscription['principalId'])
-
-                if retry_callback:
-                    print("Retrying the operation after successful role assignment...")
-                    return retry_callback()
-            else:
-                print(f"Failed request. Status Code: {response.status_code}")
-                print(f"Response: {response.text}")
-                return None
+# SEND API REQUEST
+# The request and retry loop behind make_api_request_async; waits with asyncio.sleep so other
+# requests carry on meanwhile. When outcome is given it is filled in with the last status code,
+# the number of attempts and 429s, the response size and headers, and any error.
+# ///////////////////////////////////////////////////////////////
+async def send_api_request(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    json_data: Optional[Dict[str, Any]] = None,
+    create_role_assignment: Optional[Callable] = None,
+    subscription: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    response_headers: Optional[Dict[str, str]] = None,
+    outcome: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    # asyncio and aiohttp are slow to import and only needed once a request is sent
+    import asyncio
+    from aiohttp import ClientConnectionError
 
-        else:
-            print(f"Failed request. Status Code: {response.status_code}")
-            print(f"Response: {response.text}")
+    outcome = outcome if outcome is not None else {}
+    if not is_supported_method(method):
+        return None
+
+    client = client or get_http_client()
+    attempt: int = 0
+    role_activations: int = 0
+
+    while True:
+        attempt += 1
+        outcome["attempts"] = attempt
+        throttle_delay: float = client.rate_limits.get_delay(url, method)
+        if throttle_delay > 0:
+            await asyncio.sleep(throttle_delay)
+
+        try:
+            response = await client.request(method, url, headers=headers, json_data=json_data if method != "GET" else None)
+        except (ClientConnectionError, asyncio.TimeoutError) as e:
+            delay = get_connection_retry_delay(e, client.retry_policy, attempt, outcome)
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+            continue
+        except Exception as e:
+            outcome["error"] = str(e) or type(e).__name__
+            print(f"Error occurred while making the API request: {outcome['error']}")
             return None
 
+        action, value = handle_response(response, url, method, client, attempt, role_activations, bool(subscription and create_role_assignment), response_headers, outcome)
+        if action == "retry":
+            await asyncio.sleep(value)
+            continue
+        if action == "activate":
+            arguments = (subscription['subscriptionId'], subscription['roleDefinitionId'], subscription['principalId'])
+            if asyncio.iscoroutinefunction(create_role_assignment):
+                await create_role_assignment(*arguments)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, in_current_span(functools.partial(create_role_assignment, *arguments)))
+            role_activations += 1
+            print("Retrying the operation after successful role assignment...")
+            continue
+        return value
+
+# HANDLE RESPONSE
+# Decides what the request loops do with a response. Returns ("return", value) with the value to
+# hand back, ("retry", delay) to send the request again after the delay, or ("activate", None)
+# to activate the role before sending it again.
+# ///////////////////////////////////////////////////////////////
+def handle_response(
+    response: Any,
+    url: str,
+    method: str,
+    client: Any,
+    attempt: int,
+    role_activations: int,
+    can_activate_role: bool,
+    response_headers: Optional[Dict[str, str]],
+    outcome: Dict[str, Any]
+) -> Tuple[str, Any]:
+    policy: RetryPolicy = client.retry_policy
+    outcome.update(status=response.status_code, bytes=len(response.content), headers=response.headers, error=None)
+    if response.status_code == 429:
+        outcome["throttled"] = outcome.get("throttled", 0) + 1
+    client.rate_limits.record(url, method, response.headers)
+    if response_headers is not None:
+        response_headers.update(response.headers)
+
+    try:
+        if response.status_code in (200, 201):
+            return "return", response.json() if response.content else {}
+
+        elif response.status_code in (202, 204, 304):
+            return "return", {}
+
+        elif response.status_code == 403 and get_error_code(response) == "AuthorizationFailed":
+            print(f"Authorisation failed: {response.json().get('error', {}).get('message')}")
+
+            if not can_activate_role or role_activations >= policy.max_role_activations:
+                return "return", None
+
+            print("Creating a new role assignment to grant necessary permissions...")
+            return "activate", None
+
+        elif policy.should_retry_status(response.status_code) and attempt < policy.max_attempts:
+            delay = policy.get_delay(attempt, response.headers)
+            print(f"Request returned {response.status_code}. Retrying in {delay:.1f}s (attempt {attempt}/{policy.max_attempts})...")
+            return "retry", delay
+
+        print(f"Failed request. Status Code: {response.status_code}")
+        print(f"Response: {response.text}")
+        return "return", None
+
     except Exception as e:
+        outcome["error"] = str(e)
         print(f"Error occurred while making the API request: {e}")
+        return "return", None
+
+# GET CONNECTION RETRY DELAY
+# Returns how long to wait before retrying after a connection error, or None once the attempts
+# are used up
+# ///////////////////////////////////////////////////////////////
+def get_connection_retry_delay(error: Exception, policy: RetryPolicy, attempt: int, outcome: Dict[str, Any]) -> Optional[float]:
+    outcome["error"] = str(error) or type(error).__name__
+    if attempt < policy.max_attempts:
+        delay = policy.get_delay(attempt)
+        print(f"Connection error: {outcome['error']}. Retrying in {delay:.1f}s (attempt {attempt}/{policy.max_attempts})...")
+        return delay
+    print(f"Error occurred while making the API request: {outcome['error']}")
+    return None
+
+# IS SUPPORTED METHOD
+# ///////////////////////////////////////////////////////////////
+def is_supported_method(method: str) -> bool:
+    if method in ("GET", "POST", "PUT", "DELETE"):
+        return True
+    print("Error occurred while making the API request: Invalid HTTP method. Only 'GET', 'POST', 'PUT' and 'DELETE' are supported.")
+    return False
+
+# GET ERROR CODE
+# Reads the ARM error code from a response body, if there is one
+# ///////////////////////////////////////////////////////////////
+def get_error_code(response: Any) -> Optional[str]:
+    try:
+        return response.json().get("error", {}).get("code")
+    except ValueError:
         return None
 
 # SEARCH AND SELECT FROM LIST
 # Provides the user with an option to search or pick an item (Web App, SQL Server, etc.) from a list.
 # Displays the list first and allows the user to either pick by number or refine the search.
+# Searches use a prebuilt index and rank prefix matches first, then word starts, substrings and
+# finally fuzzy (in-order character) matches.
+# Long lists are shown one page at a time; ">" and "<" move between pages and the numbers
+# shown always refer to the whole list, so they stay the same on every page.
 # ///////////////////////////////////////////////////////////////
 def search_and_select_from_list(
     items: List[Dict[str, Any]],
@@ -73,26 +232,52 @@ def search_and_select_from_list(
     item_type: str,
     select_message: str,
     num_columns: int = 2,
-    display_columns: bool = True
+    display_columns: bool = True,
+    page_size: Optional[int] = None
 ) -> Optional[Tuple[str, str]]:
     
     if not items:
         print(f"No {item_type} found.")
         return None
 
+    page: int = 0
+    page_count: int = 1
+
     def display_items(item_list: List[Dict[str, Any]]):
-        if display_columns:
-            display_items_in_columns([item[item_key] for item in item_list], num_columns)
+        nonlocal page_count
+        page_count = display_items_in_columns(
+            [item[item_key] for item in item_list],
+            num_columns if display_columns else 1,
+            page,
+            page_size
+        )
+
+    def change_page(user_input: str, item_list: List[Dict[str, Any]]) -> bool:
+        nonlocal page
+        if user_input not in PAGE_COMMANDS:
+            return False
+        new_page = page + PAGE_COMMANDS[user_input]
+        if 0 <= new_page < page_count:
+            page = new_page
+            display_items(item_list)
         else:
-            for i, item in enumerate(item_list, start=1):
-                print(f"{i}. {item[item_key]}")
+            print("No more pages in that direction.")
+        return True
+
+    search_index = SearchIndex(items, item_key)
 
-    def get_user_choice(matching_items: List[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+    def get_user_choice(matching_indexes: List[int], query: str) -> Optional[Tuple[str, str]]:
+        nonlocal page
+        matching_items = [items[index] for index in matching_indexes]
         while len(matching_items) > 1:
             print(f"\nFound {len(matching_items)} matching {item_type.lower()}s.")
+            page = 0
             display_items(matching_items)
 
-            user_input = input(f"\nEnter more characters to refine search or the number of your choice: ").strip()
+            while True:
+                user_input = input(f"\nEnter more characters to refine search or the number of your choice{page_hint()}: ").strip()
+                if not change_page(user_input, matching_items):
+                    break
 
             if user_input.isdigit():
                 selected_index = int(user_input) - 1
@@ -103,7 +288,11 @@ def search_and_select_from_list(
                 else:
                     print("Invalid selection. Please enter a valid number.")
             else:
-                matching_items = [item for item in items if user_input.lower() in item[item_key].lower()]
+                # A query that extends the previous one only needs to search the current matches
+                within = matching_indexes if user_input.casefold().startswith(query.casefold()) else None
+                matching_indexes = search_index.search(user_input, within)
+                matching_items = [items[index] for index in matching_indexes]
+                query = user_input
 
         if len(matching_items) == 1:
             selected_item = matching_items[0]
@@ -113,12 +302,17 @@ def search_and_select_from_list(
             print(f"No matching {item_type.lower()}s found.")
             return None
 
+    def page_hint() -> str:
+        return " (> next page, < previous page)" if page_count > 1 else ""
+
     print(select_message)
     display_items(items)
 
     while True:
-        refine_choice = input(f"\nEnter a number to pick, or characters to refine the search: ").strip()
+        refine_choice = input(f"\nEnter a number to pick, or characters to refine the search{page_hint()}: ").strip()
 
+        if change_page(refine_choice, items):
+            continue
         if refine_choice.isdigit():
             selected_index = int(refine_choice) - 1
             if 0 <= selected_index < len(items):
@@ -128,36 +322,68 @@ def search_and_select_from_list(
             else:
                 print("Invalid selection. Please enter a valid number.")
         else:
-            matching_items = [item for item in items if refine_choice.lower() in item[item_key].lower()]
-            return get_user_choice(matching_items)
+            return get_user_choice(search_index.search(refine_choice), refine_choice)
 
 # DISPLAY ITEMS IN COLUMNS (LONGEST ON RIGHT)
-# Prints a list of items side by side in columns, with the longest items on the right
+# Prints one page of items side by side in columns, with the longest items on the right.
+# Each column is only as wide as its own longest entry, columns are dropped until the page fits
+# the terminal width, and the whole page is written at once. Numbers refer to the full list.
+# Returns the number of pages.
 # ///////////////////////////////////////////////////////////////
-def display_items_in_columns(items: List[str], num_columns: int = 2) -> None:
+def display_items_in_columns(items: List[str], num_columns: int = 2, page: int = 0, page_size: Optional[int] = None) -> int:
     total_items = len(items)
-    num_rows = math.ceil(total_items / num_columns)
+    if not total_items:
+        return 0
+
+    terminal_width, terminal_height = shutil.get_terminal_size((100, 30))
+    if not page_size:
+        page_size = max(terminal_height - PAGE_RESERVED_LINES, MIN_PAGE_ROWS) * max(num_columns, 1)
+
+    page_count = math.ceil(total_items / page_size)
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    end = min(start + page_size, total_items)
+
+    max_index_length = len(str(end))
+    entries = [f"{str(index + 1).rjust(max_index_length)}. {items[index]}" for index in range(start, end)]
 
-    max_item_length = max(len(item) for item in items)
-    max_index_length = len(str(total_items))
+    for columns in range(max(num_columns, 1), 0, -1):
+        num_rows = math.ceil(len(entries) / columns)
+        column_entries = [entries[col * num_rows:(col + 1) * num_rows] for col in range(columns)]
+        column_entries = [column for column in column_entries if column]
+        widths = [max(len(entry) for entry in column) for column in column_entries]
+        if sum(widths) + len(COLUMN_SEPARATOR) * (len(widths) - 1) <= terminal_width:
+            break
 
+    lines = []
     for row in range(num_rows):
-        row_items = []
-        for col in range(num_columns):
-            index = row + col * num_rows
-            if index < total_items:
-                row_items.append(f"{str(index + 1).rjust(max_index_length)}. {items[index]:<{max_item_length + 5}}")
-        print(" | ".join(row_items))
+        row_items = [
+            f"{column[row]:<{width}}"
+            for column, width in zip(column_entries, widths)
+            if row < len(column)
+        ]
+        lines.append(COLUMN_SEPARATOR.join(row_items).rstrip())
+
+    if page_count > 1:
+        lines.append(f"-- Page {page + 1} of {page_count} (items {start + 1}-{end} of {total_items}) --")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    return page_count
 
 # SAVE DATA TO JSON FILE
-# Saves the provided data as a JSON file with error handling
+# Saves the provided data as a JSON file with error handling. The file is written atomically in
+# the writer's format (the shared writer by default) and left alone when its content is unchanged.
+# Returns the path of the saved file, or None if it could not be saved.
 # ///////////////////////////////////////////////////////////////
-def save_to_json(data: Dict[str, Any], output_file: str) -> None:
+def save_to_json(data: Dict[str, Any], output_file: str, writer: Optional[OutputWriter] = None) -> Optional[str]:
     try:
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, "w") as file:
-            json.dump(data, file, indent=4)
-        print(f"Data successfully saved to {output_file}")
+        output_file, written = (writer or get_output_writer()).write(data, output_file)
+        if written:
+            print(f"Data successfully saved to {output_file}")
+        else:
+            print(f"No changes for {output_file}. Skipped writing.")
+        return output_file
     except OSError as e:
         print(f"Failed to save file: {e}")
         return None
@@ -0,0 +1,168 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import gzip
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+# OPTIONAL ORJSON ENCODER
+# orjson is optional; the standard library encoder is used when it is not installed. It is
+# imported on the first compact write so that starting the tool does not pay for it.
+# ///////////////////////////////////////////////////////////////
+orjson: Any = False
+
+def load_orjson() -> Any:
+    global orjson
+    if orjson is False:
+        try:
+            import orjson as module
+            orjson = module
+        except ImportError:
+            orjson = None
+    return orjson
+
+# DEFAULT OUTPUT OPTIONS
+# Used when config.json does not provide an "output_options" section
+# ///////////////////////////////////////////////////////////////
+DEFAULT_OUTPUT_OPTIONS: Dict[str, Any] = {
+    "format": "pretty",
+    "skip_unchanged": True
+}
+
+OUTPUT_FORMATS: List[str] = ["pretty", "compact", "gzip", "ndjson"]
+
+# WRITER FUNCTIONS
+# ///////////////////////////////////////////////////////////////
+
+# ENCODE JSON
+# Pretty output keeps the 4-space indentation of earlier versions. Compact output uses orjson
+# when it is installed.
+# ///////////////////////////////////////////////////////////////
+def encode_json(data: Any, compact: bool = False) -> bytes:
+    if not compact:
+        return json.dumps(data, indent=4).encode("utf-8")
+    if load_orjson() is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+# WRITE FILE ATOMICALLY
+# Writes to a temporary file in the same directory and renames it over the target, so readers
+# never see a partial file. Returns False without writing when skip_unchanged is set and the
+# file already holds exactly this content.
+# ///////////////////////////////////////////////////////////////
+def write_atomic(output_file: str, content: bytes, skip_unchanged: bool = True) -> bool:
+    if skip_unchanged and is_unchanged(output_file, content):
+        return False
+
+    directory: str = os.path.dirname(output_file) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, output_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+# IS UNCHANGED
+# Compares sizes first so differing files are usually ruled out without reading them
+# ///////////////////////////////////////////////////////////////
+def is_unchanged(output_file: str, content: bytes) -> bool:
+    try:
+        if os.path.getsize(output_file) != len(content):
+            return False
+        with open(output_file, "rb") as file:
+            return file.read() == content
+    except OSError:
+        return False
+
+# OUTPUT WRITER CLASS
+# Writes JSON documents in the configured format: "pretty" (indented), "compact", "gzip"
+# (compact and gzipped, saved with a .gz suffix) or "ndjson" (one line per record when several
+# records go to one file; single documents are written compact)
+# ///////////////////////////////////////////////////////////////
+class OutputWriter:
+
+    # INITIALISE OUTPUT WRITER
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, output_options: Optional[Dict[str, Any]] = None) -> None:
+        self.options: Dict[str, Any] = {**DEFAULT_OUTPUT_OPTIONS, **(output_options or {})}
+        self.format: str = self.options["format"] if self.options["format"] in OUTPUT_FORMATS else "pretty"
+        self.skip_unchanged: bool = bool(self.options["skip_unchanged"])
+
+    # WRITE DOCUMENT
+    # Returns the path written to and whether the file was written (False when unchanged)
+    # ///////////////////////////////////////////////////////////////
+    def write(self, data: Any, output_file: str) -> Tuple[str, bool]:
+        content: bytes = encode_json(data, compact=self.format != "pretty")
+        if self.format == "gzip":
+            output_file = f"{output_file}.gz"
+            # A fixed timestamp keeps identical data byte-for-byte identical, so unchanged checks work
+            content = gzip.compress(content, mtime=0)
+        return output_file, write_atomic(output_file, content, self.skip_unchanged)
+
+    # OPEN RECORD STREAM
+    # Returns a stream that collects one encoded line per record and writes them all as one
+    # NDJSON file when closed
+    # ///////////////////////////////////////////////////////////////
+    def open_records(self, output_file: str) -> "RecordStream":
+        return RecordStream(output_file, self.skip_unchanged)
+
+# RECORD STREAM CLASS
+# Each record is encoded as soon as it is added, so the caller can drop the original data.
+# Lines are sorted by key when the stream is closed so identical runs produce identical files.
+# ///////////////////////////////////////////////////////////////
+class RecordStream:
+
+    # INITIALISE RECORD STREAM
+    # ///////////////////////////////////////////////////////////////
+    def __init__(self, output_file: str, skip_unchanged: bool = True) -> None:
+        self.output_file: str = output_file
+        self.skip_unchanged: bool = skip_unchanged
+        self.lines: Dict[str, bytes] = {}
+        self.lock = threading.Lock()
+
+    # ADD RECORD
+    # ///////////////////////////////////////////////////////////////
+    def add(self, key: str, record: Dict[str, Any]) -> None:
+        line: bytes = encode_json(record, compact=True)
+        with self.lock:
+            self.lines[key] = line
+
+    # CLOSE STREAM
+    # Writes every line to the output file. Returns whether the file was written.
+    # ///////////////////////////////////////////////////////////////
+    def close(self) -> bool:
+        with self.lock:
+            content: bytes = b"".join(self.lines[key] + b"\n" for key in sorted(self.lines))
+        return write_atomic(self.output_file, content, self.skip_unchanged)
+
+    # CONTEXT MANAGER SUPPORT
+    # ///////////////////////////////////////////////////////////////
+    def __enter__(self) -> "RecordStream":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self.close()
+
+# SHARED WRITER
+# ///////////////////////////////////////////////////////////////
+_shared_writer: Optional[OutputWriter] = None
+_shared_writer_lock = threading.Lock()
+
+# GET SHARED OUTPUT WRITER
+# Returns the process-wide writer, creating it from the configuration on first use
+# ///////////////////////////////////////////////////////////////
+def get_output_writer(configurations: Optional[Dict[str, Any]] = None) -> OutputWriter:
+    global _shared_writer
+    if _shared_writer is None:
+        with _shared_writer_lock:
+            if _shared_writer is None:
+                _shared_writer = OutputWriter((configurations or {}).get("output_options", {}))
+    return _shared_writer
@@ -0,0 +1,97 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import os
+import sys
+from types import SimpleNamespace
+from typing import Dict, Any, Iterator
+
+import pytest
+
+# Allow importing the tool and the mock ARM server from the tests
+TESTS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from mock_arm_server import MockARMServer
+from modules.services.session import SessionManager
+from modules.services.subscription import SubscriptionManager
+
+# TEST SETTINGS
+# A small mock subscription with no latency: 250 web apps and SQL servers make three pages of 100
+# ///////////////////////////////////////////////////////////////
+TEST_TOKEN: str = "test-token"
+MOCK_OPTIONS: Dict[str, Any] = {
+    "web_apps": 250,
+    "sql_servers": 250,
+    "resource_groups": 5,
+    "page_size": 100,
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "batch_item_latency_ms": 0.0
+}
+
+# MOCK ARM SERVER
+# One server for the whole run, reset before every test
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture(scope="session")
+def mock_server() -> Iterator[MockARMServer]:
+    with MockARMServer(MOCK_OPTIONS) as server:
+        yield server
+
+@pytest.fixture
+def mock_arm(mock_server: MockARMServer) -> MockARMServer:
+    mock_server.reset()
+    mock_server.configure(failures=[], latency_ms=0.0, throttle_rate=0.0, forbidden_rate=0.0, require_activation=False, batch_async=False)
+    return mock_server
+
+# CONFIGURATIONS
+# The tool configuration pointed at the mock, with caches off and a short retry backoff. The HTTP
+# client is shared by the whole process, so its retry options are the same in every test.
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def configurations(mock_arm: MockARMServer, tmp_path: Any) -> Dict[str, Any]:
+    return {
+        "app_name": "Tests",
+        "endpoints": {"resource_manager": mock_arm.url},
+        "display_options": {"display_items_in_columns": False, "number_of_columns": 2, "page_size": None},
+        "role_options": {"role_assignment_duration": "PT30M", "activation_timeout": 5, "activation_poll_interval": 0.01},
+        "list_options": {"max_items": None, "prefetch_next_page": True},
+        "bulk_options": {"max_workers": 8},
+        "public_ip_options": {"endpoints": [f"{mock_arm.url}/ip"], "cache_path": None},
+        "output_options": {"format": "compact", "skip_unchanged": False},
+        "snapshot_options": {"enabled": False},
+        "cache_options": {"enabled": False},
+        "retry_options": {"max_attempts": 2, "backoff_base": 0.01, "backoff_cap": 0.05}
+    }
+
+@pytest.fixture
+def config_manager(configurations: Dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(configurations=configurations)
+
+# SUBSCRIPTION
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def subscription_manager(config_manager: SimpleNamespace) -> SubscriptionManager:
+    return SubscriptionManager(TEST_TOKEN, config_manager)
+
+@pytest.fixture
+def subscription(subscription_manager: SubscriptionManager) -> Dict[str, str]:
+    return subscription_manager.list_subscriptions()[0]
+
+# SESSION
+# A session signed in with the test token, without Azure
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def session_manager(config_manager: SimpleNamespace) -> SessionManager:
+    auth_manager = SimpleNamespace(
+        get_token=lambda: (TEST_TOKEN, "tester"),
+        get_scoped_token=lambda scope: TEST_TOKEN,
+        add_token_listener=lambda listener: None
+    )
+    return SessionManager(auth_manager, config_manager)
+
+@pytest.fixture
+def headers() -> Dict[str, str]:
+    return {"Authorization": f"Bearer {TEST_TOKEN}"}
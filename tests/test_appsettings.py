@@ -0,0 +1,86 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import json
+import os
+from types import SimpleNamespace
+from typing import List, Tuple
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from conftest import TEST_TOKEN
+from modules.services import appsettings
+from modules.services.appsettings import AppSettingsManager
+from modules.services.keyvault import KeyVaultResolver
+from modules.utils import get_inventory_cache
+
+# EXPORT ALL
+# ///////////////////////////////////////////////////////////////
+def test_export_timings_leave_out_the_wait_for_a_worker(mock_arm, subscription, subscription_manager, config_manager, configurations, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    configurations["bulk_options"] = {"max_workers": 1}
+    configurations["arm_batch_options"] = {"enabled": False}
+    manager = AppSettingsManager(subscription, TEST_TOKEN, subscription_manager, config_manager)
+
+    # A clock that only moves by one tick per fetch, so each timing counts the fetches it waited on
+    clock: List[float] = [0.0]
+    monkeypatch.setattr(appsettings, "time", SimpleNamespace(perf_counter=lambda: clock[0]))
+    fetch_config_lists_async = manager.fetch_config_lists_async
+
+    async def tick(web_apps):
+        responses = await fetch_config_lists_async(web_apps)
+        clock[0] += 1.0
+        return responses
+    monkeypatch.setattr(manager, "fetch_config_lists_async", tick)
+
+    summary = manager.export_all(pattern="app-0000*")
+
+    # Queued apps would otherwise report 1, 2, ... 10 ticks
+    assert len(summary["succeeded"]) == 10
+    assert sorted(summary["timings"]) == sorted(app["id"] for app in manager.match_web_apps(manager.web_apps, "app-0000*"))
+    assert set(summary["timings"].values()) == {1.0}
+
+# WEB APPS
+# ///////////////////////////////////////////////////////////////
+def test_failed_listing_is_not_kept(mock_arm, subscription, subscription_manager, config_manager):
+    mock_arm.configure(failures=[{"route": "list_web_apps"}])
+    manager = AppSettingsManager(subscription, TEST_TOKEN, subscription_manager, config_manager)
+
+    assert manager.web_apps is None
+    assert manager.export_all()["error"]
+
+    mock_arm.configure(failures=[])
+    assert len(manager.web_apps) == 250
+
+# KEY VAULT REFERENCES
+# ///////////////////////////////////////////////////////////////
+def test_export_resolves_and_saves_each_group_as_it_arrives(mock_arm, subscription, subscription_manager, config_manager, configurations, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    configurations["keyvault_options"] = {"resolve_references": True, "vault_url_template": f"{mock_arm.url}/kv/{{vault}}"}
+    resolver = KeyVaultResolver(lambda scope: TEST_TOKEN, config_manager)
+    manager = AppSettingsManager(subscription, TEST_TOKEN, subscription_manager, config_manager, resolver)
+    calls: List[Tuple[int, int]] = []
+    resolve_async = resolver.resolve_async
+
+    async def record_call(documents):
+        calls.append((len(documents), len(os.listdir("results")) if os.path.isdir("results") else 0))
+        return await resolve_async(documents)
+    monkeypatch.setattr(resolver, "resolve_async", record_call)
+
+    summary = manager.export_all(pattern="app-000*")
+
+    assert len(summary["succeeded"]) == 100
+    # One resolution per group of ten apps, with the earlier groups already saved
+    assert [documents for documents, _ in calls] == [10] * 10
+    assert [saved for _, saved in calls] == list(range(0, 100, 10))
+    assert json.loads((tmp_path / "results" / "app-00001_appsettings.json").read_text())["ApiKey"] == "kv-bench:app-00001-api-key"
+
+def test_new_cached_listing_replaces_the_kept_one(mock_arm, subscription, subscription_manager, config_manager):
+    manager = AppSettingsManager(subscription, TEST_TOKEN, subscription_manager, config_manager)
+    cache = get_inventory_cache()
+    assert len(manager.web_apps) == 250
+
+    cache.notify_refreshed(cache.make_key(subscription["subscriptionId"], "Microsoft.Sql/servers"))
+    assert manager.cached_web_apps is not None
+
+    cache.notify_refreshed(cache.make_key(subscription["subscriptionId"], "Microsoft.Web/sites"))
+    assert manager.cached_web_apps is None
@@ -0,0 +1,75 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils import ARMBatchClient, get_http_client, list_all_items
+
+# MAKE CLIENT AND REQUESTS
+# One GET per web app of the mock subscription, by the id the listing returns
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def batch_client(mock_arm, configurations) -> ARMBatchClient:
+    return ARMBatchClient(mock_arm.url, configurations, get_http_client(configurations))
+
+def make_requests(mock_arm: Any, configurations: Dict[str, Any], subscription: Dict[str, str], headers: Dict[str, str], count: int) -> List[Dict[str, Any]]:
+    url: str = f"{mock_arm.url}/subscriptions/{subscription['subscriptionId']}/providers/Microsoft.Web/sites?api-version=2022-03-01"
+    web_apps, _, _ = list_all_items(url, headers, client=get_http_client(configurations))
+    mock_arm.reset()
+    return [{"method": "GET", "url": f"{mock_arm.url}{app['id']}?api-version=2022-03-01"} for app in web_apps[:count]]
+
+def names(results: List[Any]) -> List[str]:
+    return [result["name"] if result else None for result in results]
+
+# SPLIT INTO BATCHES
+# ///////////////////////////////////////////////////////////////
+def test_requests_are_split_into_batches_in_order(mock_arm, configurations, subscription, headers, batch_client):
+    requests = make_requests(mock_arm, configurations, subscription, headers, 45)
+
+    results = batch_client.send(requests, headers)
+    stats = mock_arm.stats()
+
+    assert names(results) == [request["url"].split("/")[-1].split("?")[0] for request in requests]
+    assert stats.get("batch:200") == 3
+    assert stats.get("batched:get_web_app:200") == 45
+    assert "get_web_app:200" not in stats
+
+def test_too_few_requests_are_sent_on_their_own(mock_arm, configurations, subscription, headers, batch_client):
+    requests = make_requests(mock_arm, configurations, subscription, headers, 1)
+
+    assert len(names(batch_client.send(requests, headers))) == 1
+    assert "batch:200" not in mock_arm.stats()
+
+def test_accepted_batch_is_polled_for_its_responses(mock_arm, configurations, subscription, headers, batch_client):
+    requests = make_requests(mock_arm, configurations, subscription, headers, 5)
+    mock_arm.configure(batch_async=True)
+
+    assert None not in batch_client.send(requests, headers)
+    assert mock_arm.stats().get("get_batch_results:200") == 1
+
+# RETRY ON THEIR OWN
+# ///////////////////////////////////////////////////////////////
+def test_failed_batched_request_is_retried_on_its_own(mock_arm, configurations, subscription, headers, batch_client):
+    requests = make_requests(mock_arm, configurations, subscription, headers, 10)
+    failing: str = requests[3]["url"].split("?")[0][len(mock_arm.url):]
+    mock_arm.configure(failures=[{"route": "get_web_app", "match": failing, "count": 1}])
+
+    results = batch_client.send(requests, headers)
+    stats = mock_arm.stats()
+
+    assert None not in results
+    assert stats.get("batched:get_web_app:500") == 1
+    assert stats.get("batched:get_web_app:200") == 9
+    assert stats.get("get_web_app:200") == 1
+
+def test_failed_batch_sends_every_request_on_its_own(mock_arm, configurations, subscription, headers, batch_client):
+    requests = make_requests(mock_arm, configurations, subscription, headers, 5)
+    mock_arm.configure(failures=[{"route": "batch", "status": 400, "count": 1}])
+
+    results = batch_client.send(requests, headers)
+
+    assert None not in results
+    assert mock_arm.stats().get("get_web_app:200") == 5
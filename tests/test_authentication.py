@@ -0,0 +1,82 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.core.authentication import AuthenticationManager
+from modules.services.session import SessionManager
+
+# FAKE CREDENTIAL
+# Hands out tokens with the given lifetimes in turn; None raises as a failed refresh would
+# ///////////////////////////////////////////////////////////////
+class FakeCredential:
+
+    def __init__(self, lifetimes: List[Any]) -> None:
+        self.lifetimes: List[Any] = lifetimes
+        self.calls: int = 0
+
+    def get_token(self, scope: str) -> SimpleNamespace:
+        lifetime = self.lifetimes[min(self.calls, len(self.lifetimes) - 1)]
+        self.calls += 1
+        if lifetime is None:
+            raise RuntimeError("token endpoint unavailable")
+        return SimpleNamespace(token=f"token-{self.calls}", expires_on=time.time() + lifetime)
+
+@pytest.fixture
+def auth_manager() -> Iterator[AuthenticationManager]:
+    config_manager = SimpleNamespace(configurations={"auth_options": {"refresh_margin_seconds": 300, "refresh_retry_seconds": 0.05}})
+    manager = AuthenticationManager(config_manager)
+    yield manager
+    if manager.refresh_timer:
+        manager.refresh_timer.cancel()
+
+def wait_for_token(auth_manager: AuthenticationManager, token: str) -> None:
+    deadline: float = time.time() + 2
+    while auth_manager.token != token and time.time() < deadline:
+        time.sleep(0.01)
+    # The refresh holds the lock until the next one is scheduled
+    with auth_manager.lock:
+        pass
+
+# BACKGROUND REFRESH
+# ///////////////////////////////////////////////////////////////
+def test_token_inside_the_margin_is_refreshed_after_a_back_off(auth_manager):
+    auth_manager.credential = FakeCredential([60, 3600])
+
+    auth_manager.refresh_token()
+    assert auth_manager.refresh_timer.interval == pytest.approx(0.05)
+    wait_for_token(auth_manager, "token-2")
+
+    assert auth_manager.credential.calls == 2
+    assert auth_manager.token == "token-2"
+    assert auth_manager.refresh_timer.interval == pytest.approx(3300, abs=1)
+
+def test_failed_background_refresh_is_retried(auth_manager):
+    auth_manager.credential = FakeCredential([60, None, 3600])
+
+    auth_manager.refresh_token()
+    wait_for_token(auth_manager, "token-3")
+
+    assert auth_manager.credential.calls == 3
+    assert auth_manager.token == "token-3"
+    assert auth_manager.refresh_timer.interval == pytest.approx(3300, abs=1)
+
+# TOKEN LISTENERS
+# ///////////////////////////////////////////////////////////////
+def test_refreshed_token_reaches_live_managers(auth_manager, config_manager, subscription):
+    auth_manager.credential = FakeCredential([3600])
+    auth_manager.decode_token = lambda: None
+    session_manager = SessionManager(auth_manager, config_manager)
+    manager = session_manager.get_settings_manager(subscription)
+    assert manager.headers["Authorization"] == "Bearer token-1"
+
+    # As the background timer does, without going through SessionManager.get_token
+    auth_manager.refresh_token()
+
+    assert manager.headers["Authorization"] == "Bearer token-2"
+    assert session_manager.get_subscription_manager().headers["Authorization"] == "Bearer token-2"
@@ -0,0 +1,37 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import json
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.services.batch import BatchRunner
+
+# RUN MANIFEST
+# ///////////////////////////////////////////////////////////////
+def test_jobs_share_one_concurrency_limit(mock_arm, session_manager, config_manager, configurations, subscription, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    configurations["bulk_options"] = {"max_workers": 32}
+    mock_arm.configure(latency_ms=10.0)
+    manifest = {
+        "jobs": [
+            {"name": "export-a", "type": "export_appsettings", "subscription": "*", "pattern": "app-000*"},
+            {"name": "export-b", "type": "export_appsettings", "subscription": "*", "pattern": "app-001*"},
+            {"name": "office", "type": "firewall_rule", "subscription": "*", "server": "sql-00*", "rule_name": "office", "ip_address": "203.0.113.10"},
+            {"name": "ranges", "type": "firewall_reconcile", "subscription": "*", "server": "sql-01*", "rule_name": "office", "ip_ranges": ["10.0.0.0/24"]}
+        ]
+    }
+
+    report = BatchRunner(session_manager, config_manager).run(manifest, max_concurrency=3, report_file=str(tmp_path / "report.json"))
+
+    assert report["failed"] == 0 and report["succeeded"] == 4
+    assert [result["job"] for result in report["results"]] == ["export-a", "export-b", "office", "ranges"]
+    assert mock_arm.stats()["peak_in_flight"] <= 3
+    assert json.loads((tmp_path / "report.json").read_text())["succeeded"] == 4
+
+def test_invalid_job_is_reported_without_running(mock_arm, session_manager, config_manager, subscription, tmp_path):
+    manifest = {"jobs": [{"name": "broken", "type": "firewall_reconcile", "subscription": "*"}]}
+
+    report = BatchRunner(session_manager, config_manager).run(manifest, report_file=str(tmp_path / "report.json"))
+
+    assert report["failed"] == 1
+    assert "ip_ranges" in report["results"][0]["error"]
@@ -0,0 +1,139 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import asyncio
+import os
+from typing import Dict, Any, List, Optional
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils import InventoryCache, get_http_client, list_all_items_async, run_async
+
+SUBSCRIPTION_ID: str = "00000000-0000-0000-0000-000000000001"
+MIDDLE_PAGE_FAILURE: Dict[str, Any] = {"route": "list_web_apps", "match": "$skiptoken=100"}
+
+# MAKE CACHE AND FETCH FUNCTION
+# The fetch function lists the mock's web apps the way the managers do
+# ///////////////////////////////////////////////////////////////
+def make_cache(tmp_path: Any, **options: Any) -> InventoryCache:
+    return InventoryCache({"cache_dir": str(tmp_path / "cache"), "background_refresh": False, **options})
+
+def make_fetch(mock_arm: Any, configurations: Dict[str, Any], headers: Dict[str, str], max_items: Optional[int] = None) -> Any:
+    url: str = f"{mock_arm.url}/subscriptions/{SUBSCRIPTION_ID}/providers/Microsoft.Web/sites?api-version=2022-03-01"
+
+    async def fetch(etag: Optional[str]) -> Any:
+        return await list_all_items_async(url, headers, client=get_http_client(configurations), etag=etag, max_items=max_items)
+    return fetch
+
+def expire(cache: InventoryCache) -> None:
+    for entry in cache.entries.values():
+        entry["fetched_at"] = 0
+
+# PARTIAL LISTINGS
+# ///////////////////////////////////////////////////////////////
+def test_failed_listing_is_not_cached(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path)
+    mock_arm.configure(failures=[MIDDLE_PAGE_FAILURE])
+
+    items = run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", make_fetch(mock_arm, configurations, headers)))
+
+    assert items is None
+    assert cache.entries == {}
+    assert make_cache(tmp_path).entries == {}
+
+def test_listing_cut_short_by_max_items_is_not_cached(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path)
+
+    items = run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", make_fetch(mock_arm, configurations, headers, 150), 150))
+
+    assert len(items) == 150
+    assert cache.entries == {}
+
+def test_complete_listing_is_cached(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path)
+
+    items = run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", make_fetch(mock_arm, configurations, headers, 1000), 1000))
+
+    assert len(items) == 250
+    assert len(make_cache(tmp_path).entries[cache.make_key(SUBSCRIPTION_ID, "Microsoft.Web/sites")]["items"]) == 250
+
+# FAILED REFRESHES
+# ///////////////////////////////////////////////////////////////
+def test_failed_refresh_keeps_previous_entry(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path)
+    fetch = make_fetch(mock_arm, configurations, headers)
+    run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch))
+
+    # A reset changes the list ETag, so the refresh has to read every page again
+    mock_arm.reset()
+    mock_arm.configure(failures=[MIDDLE_PAGE_FAILURE])
+    expire(cache)
+    items = run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch))
+
+    assert len(items) == 250
+    assert len(cache.entries[cache.make_key(SUBSCRIPTION_ID, "Microsoft.Web/sites")]["items"]) == 250
+
+def test_failed_background_refresh_keeps_previous_entry(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path, background_refresh=True)
+    fetch = make_fetch(mock_arm, configurations, headers)
+    key: str = cache.make_key(SUBSCRIPTION_ID, "Microsoft.Web/sites")
+    run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch))
+
+    mock_arm.reset()
+    mock_arm.configure(failures=[MIDDLE_PAGE_FAILURE])
+    expire(cache)
+
+    async def refresh_in_background() -> Any:
+        items = await cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch)
+        await asyncio.gather(*cache.refreshing.values())
+        return items
+
+    items = run_async(refresh_in_background())
+
+    assert len(items) == 250
+    assert cache.refreshing == {}
+    assert len(cache.entries[key]["items"]) == 250
+    # Still expired, so the next call tries again
+    assert cache.entries[key]["fetched_at"] == 0
+
+# REFRESH LISTENERS
+# ///////////////////////////////////////////////////////////////
+class Listener:
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+
+    def refreshed(self, key: str) -> None:
+        self.keys.append(key)
+
+def test_background_refresh_notifies_listeners(mock_arm, configurations, headers, tmp_path):
+    cache = make_cache(tmp_path, background_refresh=True)
+    fetch = make_fetch(mock_arm, configurations, headers)
+    key: str = cache.make_key(SUBSCRIPTION_ID, "Microsoft.Web/sites")
+    run_async(cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch))
+    listener = Listener()
+    cache.add_refresh_listener(listener.refreshed)
+
+    mock_arm.reset()
+    expire(cache)
+
+    async def refresh_in_background() -> None:
+        await cache.get_or_fetch_async(SUBSCRIPTION_ID, "Microsoft.Web/sites", fetch)
+        await asyncio.gather(*cache.refreshing.values())
+
+    run_async(refresh_in_background())
+    assert listener.keys == [key]
+
+    # Listeners are only weakly referenced
+    del listener
+    cache.notify_refreshed(key)
+    assert cache.refresh_listeners == []
+
+# SAVE INDEX
+# ///////////////////////////////////////////////////////////////
+def test_failed_index_write_leaves_no_temporary_file(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.entries["bad|entry"] = {"fetched_at": 0, "etag": None, "items": [object()]}
+
+    cache.save_index()
+
+    assert os.listdir(tmp_path / "cache") == []
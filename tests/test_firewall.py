@@ -0,0 +1,111 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from conftest import TEST_TOKEN
+from modules.services.firewall import SQLFirewallRuleManager
+from modules.utils import merge_ip_ranges
+
+SERVER: str = "sql-0000"
+RESOURCE_GROUP: str = "rg-sql-0"
+
+# MAKE RULE AND MANAGER
+# ///////////////////////////////////////////////////////////////
+def make_rule(name: str, start_ip: str, end_ip: str) -> Dict[str, Any]:
+    return {"name": name, "properties": {"startIpAddress": start_ip, "endIpAddress": end_ip}}
+
+@pytest.fixture
+def manager(subscription, subscription_manager, config_manager) -> SQLFirewallRuleManager:
+    return SQLFirewallRuleManager(subscription, TEST_TOKEN, "office", subscription_manager, config_manager)
+
+def rule_names(manager: SQLFirewallRuleManager) -> List[str]:
+    return sorted(rule["name"] for rule in manager.list_firewall_rules(SERVER, RESOURCE_GROUP))
+
+# MERGE IP RANGES
+# ///////////////////////////////////////////////////////////////
+def test_merge_ip_ranges_merges_overlapping_and_adjacent_entries():
+    assert merge_ip_ranges(["10.0.1.0/24", "10.0.0.0/24", "10.0.0.5", "192.168.1.5-192.168.1.9", "192.168.1.10"]) == [
+        ("10.0.0.0", "10.0.1.255"),
+        ("192.168.1.5", "192.168.1.10")
+    ]
+
+def test_merge_ip_ranges_widens_single_addresses_to_the_prefix():
+    assert merge_ip_ranges(["203.0.113.10"], 24) == [("203.0.113.0", "203.0.113.255")]
+    assert merge_ip_ranges(["203.0.113.0/30"], 24) == [("203.0.113.0", "203.0.113.3")]
+
+@pytest.mark.parametrize("value", ["not-an-ip", "10.0.0.9-10.0.0.1", "10.0.0.300"])
+def test_merge_ip_ranges_rejects_invalid_entries(value):
+    with pytest.raises(ValueError):
+        merge_ip_ranges([value])
+
+# PLAN FIREWALL CHANGES
+# ///////////////////////////////////////////////////////////////
+def test_plan_leaves_rules_without_the_owned_suffix_alone(manager):
+    existing = [make_rule("office", "1.1.1.1", "1.1.1.1"), make_rule("office-1", "2.2.2.2", "2.2.2.2"), make_rule("office-2", "3.3.3.3", "3.3.3.3")]
+
+    changes = manager.plan_firewall_changes(existing, [("10.0.0.0", "10.0.0.255")], "office")
+
+    assert changes == {"put": {"office-amt-1": ("10.0.0.0", "10.0.0.255")}, "delete": [], "unchanged": []}
+
+def test_plan_keeps_reuses_and_deletes_owned_rules(manager):
+    existing = [
+        make_rule("office-amt-1", "10.0.0.0", "10.0.0.255"),
+        make_rule("office-amt-2", "172.16.0.0", "172.16.0.255"),
+        make_rule("office-amt-3", "172.17.0.0", "172.17.0.255"),
+        make_rule("Office-AMT-extra", "9.9.9.9", "9.9.9.9")
+    ]
+
+    changes = manager.plan_firewall_changes(existing, [("10.0.0.0", "10.0.0.255"), ("192.168.0.0", "192.168.0.255")], "office")
+
+    assert changes["unchanged"] == ["office-amt-1"]
+    assert changes["put"] == {"office-amt-2": ("192.168.0.0", "192.168.0.255")}
+    assert changes["delete"] == ["office-amt-3"]
+
+def test_plan_skips_names_already_in_use(manager):
+    existing = [make_rule("office-amt-1", "10.0.0.0", "10.0.0.255"), make_rule("OFFICE-amt-2", "10.0.0.0", "10.0.0.255")]
+
+    changes = manager.plan_firewall_changes(existing, [("10.0.0.0", "10.0.0.255"), ("10.0.2.0", "10.0.2.255"), ("10.0.4.0", "10.0.4.255")], "office")
+
+    assert changes["unchanged"] == ["office-amt-1"]
+    assert changes["put"] == {"OFFICE-amt-2": ("10.0.2.0", "10.0.2.255"), "office-amt-3": ("10.0.4.0", "10.0.4.255")}
+    assert changes["delete"] == []
+
+# RECONCILE FIREWALL RULES
+# ///////////////////////////////////////////////////////////////
+def test_reconcile_only_changes_owned_rules(mock_arm, manager):
+    manager.put_firewall_rule(SERVER, RESOURCE_GROUP, "office-1", "8.8.8.8", "8.8.8.8")
+    manager.put_firewall_rule(SERVER, RESOURCE_GROUP, "office", "8.8.4.4", "8.8.4.4")
+
+    first = manager.reconcile_firewall_rules(SERVER, RESOURCE_GROUP, ["10.0.0.0/24", "10.0.1.0/24", "192.168.1.5"], "office")
+    assert sorted(first["written"]) == ["office-amt-1", "office-amt-2"]
+
+    repeat = manager.reconcile_firewall_rules(SERVER, RESOURCE_GROUP, ["10.0.0.0/24", "10.0.1.0/24", "192.168.1.5"], "office")
+    assert repeat["written"] == [] and repeat["deleted"] == []
+
+    shrunk = manager.reconcile_firewall_rules(SERVER, RESOURCE_GROUP, ["192.168.1.5"], "office")
+    assert len(shrunk["deleted"]) == 1
+    assert rule_names(manager) == sorted(["existing-0", "existing-1", "office", "office-1", shrunk["unchanged"][0]])
+
+# APPLY FIREWALL RULE TO MANY SQL SERVERS
+# ///////////////////////////////////////////////////////////////
+def test_apply_reuses_the_batched_listing(mock_arm, manager):
+    summary = manager.apply_to_servers(pattern="sql-000*", firewall_rule_name="office", ip_address="203.0.113.10")
+    stats = mock_arm.stats()
+
+    assert len(summary["succeeded"]) == 10 and summary["failed"] == []
+    assert stats.get("batched:list_firewall_rules:200") == 10
+    assert "list_firewall_rules:200" not in stats
+    assert stats.get("put_firewall_rule:201") == 10
+
+def test_apply_writes_nothing_when_a_listing_fails(mock_arm, manager):
+    mock_arm.configure(failures=[{"route": "list_firewall_rules", "match": "/sql-0001/", "status": 404}])
+
+    summary = manager.apply_to_servers(pattern="sql-000[01]", firewall_rule_name="office", ip_address="203.0.113.10")
+
+    assert summary["succeeded"] == ["sql-0000"]
+    assert summary["failed"] == ["sql-0001"]
+    assert mock_arm.stats().get("put_firewall_rule:201") == 1
@@ -0,0 +1,49 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import time
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.services.inventory import InventoryManager
+
+# COLLECT INVENTORY
+# ///////////////////////////////////////////////////////////////
+def test_collect_lists_web_apps_and_sql_servers(mock_arm, session_manager, subscription):
+    inventory = InventoryManager([subscription], session_manager)
+
+    items = inventory.collect()
+
+    assert len(items) == 500
+    assert {item["resourceType"] for item in items} == {"Web App", "SQL Server"}
+    assert inventory.failed_subscriptions == []
+
+@pytest.mark.parametrize("per_subscription", [1, 2])
+def test_collect_bounds_the_listings_of_one_subscription(mock_arm, session_manager, subscription, configurations, per_subscription):
+    configurations["inventory_options"] = {"max_workers": 8, "per_subscription_concurrency": per_subscription}
+    configurations["list_options"] = {"max_items": None, "prefetch_next_page": False}
+    mock_arm.configure(latency_ms=20.0)
+    inventory = InventoryManager([subscription], session_manager)
+
+    assert len(inventory.collect()) == 500
+    assert mock_arm.stats()["peak_in_flight"] <= per_subscription
+
+def test_collect_cancels_listings_at_the_deadline(mock_arm, session_manager, subscription, configurations):
+    # Each listing needs three pages of 300 ms, so both are reading their second page at the deadline
+    configurations["inventory_options"] = {"subscription_timeout": 0.45, "per_subscription_concurrency": 2}
+    mock_arm.configure(latency_ms=300.0)
+    inventory = InventoryManager([subscription], session_manager)
+
+    started_at = time.perf_counter()
+    items = inventory.collect()
+    elapsed = time.perf_counter() - started_at
+    time.sleep(0.3)
+    requests = mock_arm.stats().get("requests", 0)
+    time.sleep(0.6)
+
+    assert items == []
+    assert len(inventory.failed_subscriptions) == 2
+    assert elapsed < 0.9
+    # The third pages are never requested
+    assert mock_arm.stats().get("requests", 0) == requests
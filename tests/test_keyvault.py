@@ -0,0 +1,88 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from conftest import TEST_TOKEN
+from modules.services.keyvault import KeyVaultResolver
+
+# MAKE RESOLVER AND DOCUMENTS
+# The resolver reaches every vault through the mock's /kv/{vault} routes
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def resolver(mock_arm, config_manager, configurations) -> KeyVaultResolver:
+    configurations["keyvault_options"] = {"resolve_references": True, "vault_url_template": f"{mock_arm.url}/kv/{{vault}}"}
+    return KeyVaultResolver(lambda scope: TEST_TOKEN, config_manager)
+
+def make_documents() -> List[Dict[str, Any]]:
+    return [
+        {
+            "ApiKey": "@Microsoft.KeyVault(VaultName=kv-test;SecretName=api-key)",
+            "ConnectionStrings": {"Db": "@Microsoft.KeyVault(SecretUri=https://kv-test.vault.azure.net/secrets/db/v1)"},
+            "Region": "westeurope"
+        },
+        {"ApiKey": "@microsoft.keyvault(VaultName=kv-test;SecretName=api-key)"}
+    ]
+
+# PARSE REFERENCE
+# ///////////////////////////////////////////////////////////////
+def test_parse_reference_reads_both_forms(config_manager):
+    resolver = KeyVaultResolver(lambda scope: TEST_TOKEN, config_manager)
+
+    assert resolver.parse_reference("@Microsoft.KeyVault(SecretUri=https://My-Vault.vault.azure.net/secrets/db/v1)") == (
+        "my-vault", "https://my-vault.vault.azure.net/secrets/db/v1"
+    )
+    assert resolver.parse_reference(" @Microsoft.KeyVault(VaultName=my-vault; SecretName=db; SecretVersion=v2) ") == (
+        "my-vault", "https://my-vault.vault.azure.net/secrets/db/v2"
+    )
+
+@pytest.mark.parametrize("value", [
+    "plain value",
+    "@Microsoft.KeyVault(SecretUri=https://my-vault.vault.azure.net/keys/db)",
+    "@Microsoft.KeyVault(VaultName=my-vault)",
+    "@Microsoft.KeyVault(VaultName=evil.example.com/x;SecretName=db)",
+    "@Microsoft.KeyVault(SecretUri=http://my-vault.vault.azure.net/secrets/db)",
+    "@Microsoft.KeyVault(SecretUri=https://collector.example.com/secrets/db)",
+    "@Microsoft.KeyVault(SecretUri=https://my-vault.vault.azure.net.example.com/secrets/db)",
+    "@Microsoft.KeyVault(SecretUri=https://my-vault.vault.azure.net:8443/secrets/db)",
+    "@Microsoft.KeyVault(SecretUri=https://user@my-vault.vault.azure.net/secrets/db)"
+])
+def test_parse_reference_rejects_other_values(config_manager, value):
+    assert KeyVaultResolver(lambda scope: TEST_TOKEN, config_manager).parse_reference(value) is None
+
+def test_parse_reference_uses_the_vault_url_template(mock_arm, resolver):
+    assert resolver.parse_reference("@Microsoft.KeyVault(SecretUri=https://kv-test.vault.azure.net/secrets/db)") == (
+        "kv-test", f"{mock_arm.url}/kv/kv-test/secrets/db"
+    )
+
+# RESOLVE REFERENCES
+# ///////////////////////////////////////////////////////////////
+def test_resolve_fetches_each_secret_once(mock_arm, resolver):
+    documents = make_documents()
+
+    assert resolver.resolve(documents) == (3, 0)
+    assert documents[0] == {"ApiKey": "kv-test:api-key", "ConnectionStrings": {"Db": "kv-test:db"}, "Region": "westeurope"}
+    assert documents[1] == {"ApiKey": "kv-test:api-key"}
+    assert mock_arm.stats().get("get_secret:200") == 2
+
+    # Served from the cache the second time
+    assert resolver.resolve(make_documents()) == (3, 0)
+    assert mock_arm.stats().get("get_secret:200") == 2
+
+def test_reference_to_an_untrusted_address_is_never_sent_a_token(mock_arm, resolver):
+    documents = [{"ApiKey": f"@Microsoft.KeyVault(SecretUri={mock_arm.url}/kv/kv-test/secrets/api-key)"}]
+
+    assert resolver.resolve(documents) == (0, 1)
+    assert documents[0]["ApiKey"].startswith("@Microsoft.KeyVault(")
+    assert "get_secret:200" not in mock_arm.stats()
+
+def test_unresolved_reference_is_left_in_place(mock_arm, resolver):
+    mock_arm.configure(failures=[{"route": "get_secret", "match": "/secrets/db", "status": 404}])
+    documents = make_documents()
+
+    assert resolver.resolve(documents) == (2, 1)
+    assert documents[0]["ConnectionStrings"]["Db"].startswith("@Microsoft.KeyVault(")
+    assert documents[0]["ApiKey"] == "kv-test:api-key"
@@ -0,0 +1,59 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils import ListingIncompleteError, get_http_client, iterate_items, list_all_items
+
+# WEB APP LIST URL
+# ///////////////////////////////////////////////////////////////
+def web_apps_url(mock_arm: Any, subscription: Dict[str, str]) -> str:
+    return f"{mock_arm.url}/subscriptions/{subscription['subscriptionId']}/providers/Microsoft.Web/sites?api-version=2022-03-01"
+
+# LIST ALL ITEMS
+# ///////////////////////////////////////////////////////////////
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_list_all_items_reads_every_page(mock_arm, configurations, subscription, headers, prefetch):
+    items, etag, not_modified = list_all_items(web_apps_url(mock_arm, subscription), headers, client=get_http_client(configurations), prefetch=prefetch)
+
+    assert len(items) == 250
+    assert len({item["name"] for item in items}) == 250
+    assert etag and not not_modified
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_list_all_items_fails_when_a_middle_page_fails(mock_arm, configurations, subscription, headers, prefetch):
+    mock_arm.configure(failures=[{"route": "list_web_apps", "match": "$skiptoken=100"}])
+
+    items, _, not_modified = list_all_items(web_apps_url(mock_arm, subscription), headers, client=get_http_client(configurations), prefetch=prefetch)
+
+    assert items is None
+    assert not not_modified
+
+def test_list_all_items_fails_when_the_first_page_fails(mock_arm, configurations, subscription, headers):
+    mock_arm.configure(failures=[{"route": "list_web_apps", "status": 404}])
+
+    items, _, _ = list_all_items(web_apps_url(mock_arm, subscription), headers, client=get_http_client(configurations))
+
+    assert items is None
+
+# ITERATE ITEMS
+# ///////////////////////////////////////////////////////////////
+def test_iterate_items_raises_after_the_pages_read(mock_arm, configurations, subscription, headers):
+    mock_arm.configure(failures=[{"route": "list_web_apps", "match": "$skiptoken=100"}])
+    read: List[Dict[str, Any]] = []
+
+    with pytest.raises(ListingIncompleteError):
+        for item in iterate_items(web_apps_url(mock_arm, subscription), headers=headers, client=get_http_client(configurations)):
+            read.append(item)
+
+    assert len(read) == 100
+
+def test_iterate_items_stops_at_max_items_before_a_failed_page(mock_arm, configurations, subscription, headers):
+    mock_arm.configure(failures=[{"route": "list_web_apps", "match": "$skiptoken=100"}])
+
+    items = list(iterate_items(web_apps_url(mock_arm, subscription), headers=headers, client=get_http_client(configurations), max_items=50))
+
+    assert len(items) == 50
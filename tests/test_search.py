@@ -0,0 +1,56 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+from typing import Dict, Any, List
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils.search import SearchIndex
+
+NAMES: List[str] = ["prod-api", "other", "API", "my-api-west", "rapid", "a-p-i"]
+
+# MAKE INDEX
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def index() -> SearchIndex:
+    return SearchIndex([{"name": name} for name in NAMES], "name")
+
+def names(items: List[Dict[str, Any]]) -> List[str]:
+    return [item["name"] for item in items]
+
+# RANKING
+# ///////////////////////////////////////////////////////////////
+def test_matches_are_ranked_prefix_boundary_substring_subsequence(index):
+    assert names(index.search_items("api")) == ["API", "prod-api", "my-api-west", "rapid", "a-p-i"]
+
+def test_search_ignores_case_and_surrounding_spaces(index):
+    assert index.search(" Api ") == index.search("api")
+
+def test_search_without_a_match_is_empty(index):
+    assert index.search("zzz") == []
+    assert index.search("ipa") == []
+
+def test_empty_query_returns_every_item_in_order(index):
+    assert index.search("") == list(range(len(NAMES)))
+
+# NARROWING
+# ///////////////////////////////////////////////////////////////
+def test_narrowing_matches_a_fresh_search(index):
+    first = index.search("a")
+
+    assert index.search("ap", within=first) == index.search("ap")
+    assert index.search("", within=first) == first
+
+def test_narrowing_stays_within_the_earlier_result(index):
+    rapid: int = NAMES.index("rapid")
+
+    assert index.search("api", within=[rapid, NAMES.index("other")]) == [rapid]
+
+def test_narrowing_a_small_result_re_ranks_it_directly():
+    items = [{"name": f"app-{number:04d}"} for number in range(200)] + [{"name": "web-app-0001"}]
+    index = SearchIndex(items, "name")
+    first = index.search("0001")
+
+    assert len(first) < len(items) // 8
+    assert names([items[position] for position in index.search("app-0001", within=first)]) == ["app-0001", "web-app-0001"]
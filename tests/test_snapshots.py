@@ -0,0 +1,97 @@
+# IMPORT STANDARD LIBRARY MODULES
+# ///////////////////////////////////////////////////////////////
+import os
+import stat
+from typing import Dict, Any, Iterator
+
+import pytest
+
+# IMPORT LOCAL MODULES
+# ///////////////////////////////////////////////////////////////
+from modules.utils.snapshots import SnapshotStore
+
+SUBSCRIPTION_ID: str = "00000000-0000-0000-0000-000000000001"
+APP_NAME: str = "app-0000"
+SETTINGS: Dict[str, Any] = {
+    "ASPNETCORE_ENVIRONMENT": "Production",
+    "ApiEndpoint": "https://api.example.com",
+    "Logging": {"LogLevel": {"Default": "Warning"}}
+}
+
+# MAKE STORE
+# ///////////////////////////////////////////////////////////////
+@pytest.fixture
+def store(tmp_path: Any) -> Iterator[SnapshotStore]:
+    snapshot_store = SnapshotStore({"database_path": str(tmp_path / "history.sqlite3")})
+    yield snapshot_store
+    snapshot_store.close()
+
+def read_database(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+# HASHING
+# ///////////////////////////////////////////////////////////////
+def test_values_are_hashed_unless_allow_listed(store):
+    snapshot_id = store.record(SUBSCRIPTION_ID, APP_NAME, SETTINGS)
+
+    state = store.state_at(SUBSCRIPTION_ID, APP_NAME, snapshot_id)
+
+    assert state["ASPNETCORE_ENVIRONMENT"][1] == "Production"
+    assert state["Logging__LogLevel__Default"][1] == "Warning"
+    assert state["ApiEndpoint"][1] is None
+    assert b"api.example.com" not in read_database(store.database_path)
+
+def test_hidden_values_still_show_as_changed(store):
+    first = store.record(SUBSCRIPTION_ID, APP_NAME, SETTINGS)
+    second = store.record(SUBSCRIPTION_ID, APP_NAME, {**SETTINGS, "ApiEndpoint": "https://api2.example.com"})
+
+    assert store.diff(SUBSCRIPTION_ID, APP_NAME, first, second)["changed"] == {"ApiEndpoint": {"from": "<hidden>", "to": "<hidden>"}}
+
+# HASH KEY
+# ///////////////////////////////////////////////////////////////
+def test_hash_key_is_kept_in_an_owner_only_file(store):
+    store.record(SUBSCRIPTION_ID, APP_NAME, SETTINGS)
+
+    assert store.key_path == f"{store.database_path}.key"
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(store.key_path).st_mode) == 0o600
+    with open(store.key_path, "r") as file:
+        assert bytes.fromhex(file.read()) == store.hash_key
+    assert store.hash_key.hex().encode() not in read_database(store.database_path)
+
+def test_hash_key_survives_reopening(store):
+    store.record(SUBSCRIPTION_ID, APP_NAME, SETTINGS)
+    store.close()
+
+    reopened = SnapshotStore({"database_path": store.database_path})
+    reopened.record(SUBSCRIPTION_ID, APP_NAME, SETTINGS)
+
+    assert reopened.hash_key == store.hash_key
+    assert reopened.list_snapshots(SUBSCRIPTION_ID, APP_NAME)[-1]["changeCount"] == 0
+    reopened.close()
+
+# DELTA ROUND TRIP
+# ///////////////////////////////////////////////////////////////
+def test_deltas_rebuild_every_snapshot(store):
+    versions = [
+        SETTINGS,
+        {**SETTINGS, "ASPNETCORE_ENVIRONMENT": "Staging", "FeatureFlag": "on"},
+        {"ASPNETCORE_ENVIRONMENT": "Staging", "FeatureFlag": "on"}
+    ]
+    snapshot_ids = [store.record(SUBSCRIPTION_ID, APP_NAME, settings) for settings in versions]
+
+    for snapshot_id, settings in zip(snapshot_ids, versions):
+        assert set(store.state_at(SUBSCRIPTION_ID, APP_NAME, snapshot_id)) == set(store.flatten(settings))
+    assert [snapshot["changeCount"] for snapshot in store.list_snapshots(SUBSCRIPTION_ID, APP_NAME)] == [3, 2, 2]
+
+    assert store.diff(SUBSCRIPTION_ID, APP_NAME, snapshot_ids[0], snapshot_ids[2]) == {
+        "added": {"FeatureFlag": "<hidden>"},
+        "removed": {"ApiEndpoint": "<hidden>", "Logging__LogLevel__Default": "Warning"},
+        "changed": {"ASPNETCORE_ENVIRONMENT": {"from": "Production", "to": "Staging"}}
+    }
+    assert [(change["snapshotId"], change["change"]) for change in store.find_changes("Logging__*")] == [
+        (snapshot_ids[0], "added"),
+        (snapshot_ids[2], "removed")
+    ]
+    assert store.find_changes("logging__loglevel__*") == store.find_changes("Logging__*")